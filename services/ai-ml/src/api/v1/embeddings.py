@@ -1,16 +1,17 @@
 from fastapi import APIRouter, HTTPException, Request
 from typing import List
 
-from schemas.requests import EmbeddingRequest, BatchEmbeddingRequest
-from schemas.responses import EmbeddingResponse, BatchEmbeddingResponse
+from schemas.requests import EmbeddingRequest, BatchEmbeddingRequest, DocumentEmbeddingRequest
+from schemas.responses import EmbeddingResponse, BatchEmbeddingResponse, DocumentEmbeddingResponse
+from core.lazy import Lazy
 from services.embeddings.service import EmbeddingService
-from services.embeddings.rate_limiter import RateLimiter
+from services.embeddings.rate_limiter import AsyncRateLimiter
 
 
 router = APIRouter(prefix="/embeddings", tags=["Embeddings"])
 
-embedding_service = EmbeddingService()
-rate_limiter = RateLimiter()
+embedding_service = Lazy(EmbeddingService)
+rate_limiter = AsyncRateLimiter()
 
 EXPECTED_DIMENSION = 768
 MAX_BATCH_SIZE = 100
@@ -19,7 +20,7 @@ MAX_BATCH_SIZE = 100
 async def embed_text(request: Request, body: EmbeddingRequest):
 
     client_ip = request.client.host
-    rate_limiter.check(client_ip)
+    await rate_limiter.check(client_ip)
 
     if not body.text or not body.text.strip():
         raise HTTPException(
@@ -29,7 +30,7 @@ async def embed_text(request: Request, body: EmbeddingRequest):
 
     try:
         # Updated method call
-        embedding = embedding_service.get_embedding(body.text)
+        embedding = await embedding_service.get_embedding_async(body.text)
 
         if len(embedding) != EXPECTED_DIMENSION:
             raise HTTPException(
@@ -50,7 +51,7 @@ async def embed_text(request: Request, body: EmbeddingRequest):
 async def embed_batch(request: Request, body: BatchEmbeddingRequest):
 
     client_ip = request.client.host
-    rate_limiter.check(client_ip)
+    await rate_limiter.check(client_ip)
 
     if not body.texts:
         raise HTTPException(
@@ -73,7 +74,7 @@ async def embed_batch(request: Request, body: BatchEmbeddingRequest):
 
     try:
         # ✅ Use batch method directly
-        embeddings: List[List[float]] = embedding_service.get_embeddings(body.texts)
+        embeddings: List[List[float]] = await embedding_service.get_embeddings_async(body.texts)
 
         for emb in embeddings:
             if len(emb) != EXPECTED_DIMENSION:
@@ -90,4 +91,38 @@ async def embed_batch(request: Request, body: BatchEmbeddingRequest):
         )
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/embed-document", response_model=DocumentEmbeddingResponse)
+async def embed_document(request: Request, body: DocumentEmbeddingRequest):
+    """
+    Embed a long document (e.g. a full resume) by token-chunking it and
+    pooling the chunk vectors, instead of letting the model truncate at 512.
+    """
+
+    client_ip = request.client.host
+    await rate_limiter.check(client_ip)
+
+    if not body.text or not body.text.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Text cannot be empty"
+        )
+
+    try:
+        result = await embedding_service.get_document_embedding_async(
+            body.text,
+            return_chunks=body.return_chunks,
+            chunk_tokens=body.chunk_tokens,
+            overlap_tokens=body.overlap_tokens,
+        )
+
+        return DocumentEmbeddingResponse(
+            dimension=len(result["embedding"]),
+            **result
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
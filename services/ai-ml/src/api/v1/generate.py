@@ -12,11 +12,13 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from core.lazy import Lazy
 from services.llm.gemini_llm_client import GeminiLLMClient
+from services.llm.usage import llm_usage_scope
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["generate"])
-llm = GeminiLLMClient()
+llm = Lazy(GeminiLLMClient)
 
 CSV_LOG_PATH = Path(os.getenv("AIML_CSV_LOG_PATH", "/app/logs/deloitte_token_usage.csv"))
 
@@ -277,9 +279,9 @@ async def generate_deloitte_content(payload: DeloitteParseRequest) -> dict:
         )
         prompt = _DELOITTE_PROMPT.format(candidate_data=candidate_context)
 
-        llm_result = await llm.generate_json_async(prompt)
-
-        session_cost = llm.consume_session_cost()
+        with llm_usage_scope("deloitte_parse", item_id=payload.candidate_id):
+            llm_result = await llm.generate_json_async(prompt)
+            session_cost = llm.consume_session_cost()
         input_tokens = session_cost["input_tokens"]
         output_tokens = session_cost["output_tokens"]
         cost_usd = session_cost["total_cost_usd"]
@@ -2,9 +2,9 @@ from fastapi import APIRouter
 import logging
 
 from core.config import settings
-from services.embeddings.service import EmbeddingService
+from core.warmup import warmup_report
 from services.embeddings.local_client import LocalEmbeddingClient
-from services.embeddings.cache import EmbeddingCache
+from services.embeddings.redis_client import get_async_redis
 
 
 router = APIRouter()
@@ -30,34 +30,24 @@ async def health_check():
 
 @router.get("/ready")
 async def readiness_check():
-    local_status = False
+    # Models load in the startup warmup; readiness only flips once it has
+    # finished, so this handler never triggers a model load itself.
+    warmup = warmup_report()
+    local_status = LocalEmbeddingClient().loaded
     redis_status = False
-    service_status = False
 
     try:
-        LocalEmbeddingClient()
-        local_status = True
-    except Exception as e:
-        logger.error(f"Local model failed to initialize: {e}")
-
-    try:
-        cache = EmbeddingCache()
-        cache.ping()
+        await get_async_redis().ping()
         redis_status = True
     except Exception as e:
         logger.error(f"Redis connection failed: {e}")
 
-    try:
-        EmbeddingService()
-        service_status = True
-    except Exception as e:
-        logger.error(f"EmbeddingService failed to initialize: {e}")
-
-    ready = local_status and redis_status and service_status
+    ready = warmup["ready"] and local_status and redis_status
 
     return {
         "ready": ready,
         "local_model_loaded": local_status,
         "redis_connected": redis_status,
-        "embedding_service_initialized": service_status,
+        "embedding_service_initialized": warmup["ready"],
+        "warmup": warmup,
     }
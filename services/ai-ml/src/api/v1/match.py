@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from typing import List, Dict, Any
 import traceback
 
+from core.lazy import Lazy
 from services.rag.match_service import MatchService
 
 
@@ -14,7 +15,7 @@ class MatchRequest(BaseModel):
     candidates: List[Dict[str, Any]]
 
 
-match_service = MatchService()
+match_service = Lazy(MatchService)
 
 
 @router.post("")
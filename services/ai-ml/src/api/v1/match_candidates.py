@@ -4,14 +4,15 @@ from typing import List
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from core.lazy import Lazy
 from services.embeddings.service import EmbeddingService
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/match-candidates", tags=["Matching"])
 
 # Module-level singleton mirrors the pattern in embeddings.py — keeps the local
-# sentence-transformer model warm across requests.
-_embedding_service = EmbeddingService()
+# sentence-transformer model warm across requests. Built on first use.
+_embedding_service = Lazy(EmbeddingService)
 
 
 class MatchRequest(BaseModel):
@@ -29,7 +30,7 @@ class MatchResponse(BaseModel):
 @router.post("", response_model=MatchResponse)
 async def match_candidates(payload: MatchRequest):
     try:
-        embedding = _embedding_service.get_embedding(payload.job_description)
+        embedding = await _embedding_service.get_embedding_async(payload.job_description)
     except Exception as exc:
         logger.exception("jd_embedding_failed")
         raise HTTPException(status_code=500, detail=f"Embedding failed: {exc}")
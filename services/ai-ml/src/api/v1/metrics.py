@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+
+router = APIRouter()
+
+
+# ---------------------------------------------------------
+# PROMETHEUS
+# ---------------------------------------------------------
+# Per-item LLM token/cost/latency histograms are registered by
+# services.llm.usage and exported here with the default registry.
+# ---------------------------------------------------------
+
+@router.get("/metrics")
+async def metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -9,6 +9,7 @@ from schemas.resume import (
     ResumeProcessResponse,
 )
 
+from core.lazy import Lazy
 from services.embeddings.service import EmbeddingService
 from services.extractors.pdf import extract_pdf
 from services.extractors.docx import extract_docx
@@ -16,7 +17,7 @@ from services.extractors.docx import extract_docx
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-embedding_service = EmbeddingService()
+embedding_service = Lazy(EmbeddingService)
 
 
 @router.post("/process", response_model=ResumeProcessResponse)
@@ -61,7 +62,7 @@ async def process_resume(body: ResumeProcessRequest):
             os.remove(temp_path)
 
     try:
-        embedding = embedding_service.get_embedding(extracted_text)
+        embedding = await embedding_service.get_embedding_async(extracted_text)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Embedding generation failed: {str(e)}")
 
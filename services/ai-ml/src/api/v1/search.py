@@ -1,11 +1,12 @@
 from fastapi import APIRouter, HTTPException
 
 from schemas.search import SearchRequest, SearchResponse
+from core.lazy import Lazy
 from services.search.search_service import SearchService
 
 router = APIRouter()
 
-search_service = SearchService()
+search_service = Lazy(SearchService)
 
 
 @router.post("/search", response_model=SearchResponse)
@@ -1,16 +1,31 @@
 import os
+import re
 import time
+import hashlib
 import traceback
 import logging
 import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field, field_validator
 from typing import Dict, Any, List, Optional, Union
+from core.lazy import Lazy
 from services.llm.gemini_llm_client import GeminiLLMClient
+from services.llm.structure_cache import StructureCache, structure_cache_key
+from services.llm.usage import llm_usage_scope, record_llm_call
 from services.parsers import parse_cv, detect_sections_llm_first
 from services.validation import validate_structured_cv
 
-llm = GeminiLLMClient()
+llm = Lazy(GeminiLLMClient)
+structure_cache = Lazy(StructureCache)
+
+# Bump when merge/validation rules change so results from the old pipeline
+# stop being served from the structure cache.
+STRUCTURE_PIPELINE_VERSION = "1"
+
+# Packed mode: short resumes in a batch share one Gemini call
+PACK_MAX_RESUME_CHARS = int(os.getenv("STRUCTURE_PACK_MAX_RESUME_CHARS", "6000"))
+PACK_MAX_CHARS = int(os.getenv("STRUCTURE_PACK_MAX_CHARS", "18000"))
+PACK_MAX_ITEMS = int(os.getenv("STRUCTURE_PACK_MAX_ITEMS", "4"))
 
 router = APIRouter(prefix="/structure", tags=["Structured Extraction"])
 logger = logging.getLogger(__name__)
@@ -28,6 +43,7 @@ class BatchStructureItem(BaseModel):
 
 class BatchStructureRequest(BaseModel):
     resumes: List[BatchStructureItem] = Field(..., min_length=1, max_length=10)
+    pack: bool = True
 
 
 class EducationItem(BaseModel):
@@ -418,6 +434,26 @@ Resume text:
 {raw_text}"""
 
 
+# Prepended to RESUME_PROMPT_TEMPLATE when several resumes share one call. The
+# resume text is labelled by position, not resume_id, so ids never reach the model.
+_PACKED_RESUME_PREAMBLE = """The resume text at the end of this prompt contains {count} separate resumes. Each one starts with a line of the form "=== RESUME <n> ===". Treat every resume independently and never carry a field from one resume into another.
+
+Apply ALL of the instructions below to EACH resume and return ONLY one JSON object of the form
+{{"results": [{{"resume_index": <n>, "data": <the single-resume JSON object described below>}}]}}
+with exactly one entry per resume, in input order.
+
+"""
+
+# Prompt edits change this hash, which invalidates cached structuring results.
+PROMPT_VERSION = hashlib.sha256("\x00".join([
+    _PACKED_RESUME_PREAMBLE,
+    RESUME_PROMPT_TEMPLATE,
+    _SKILL_EXTRACTION_PROMPT,
+    _EDUCATION_EXTRACTION_PROMPT,
+    _EXPERIENCE_EXTRACTION_PROMPT,
+]).encode("utf-8")).hexdigest()[:16]
+
+
 async def _llm_extract_skills(section_text: str, existing: list[str] | None = None) -> list[str]:
     """Targeted Gemini call — always supplements local parser output with missing skills."""
     try:
@@ -712,19 +748,6 @@ async def _llm_primary_structure(resume_id: str, raw_text: str) -> dict:
     """
     t0 = time.time()
 
-    # Regex pass for contact fields only. sections={} skips the section detector
-    # so this call returns fast and doesn't make any LLM calls of its own.
-    regex_name: str | None = None
-    regex_email: str | None = None
-    regex_phone: str | None = None
-    try:
-        regex_result = parse_cv(raw_text, sections={})
-        regex_name = regex_result.full_name
-        regex_email = regex_result.email
-        regex_phone = regex_result.phone
-    except Exception as exc:
-        logger.warning("regex_contact_parse_failed: %s", exc)
-
     try:
         prompt = RESUME_PROMPT_TEMPLATE.format(raw_text=raw_text)
         llm_result = await llm.generate_json_async(prompt)
@@ -738,6 +761,35 @@ async def _llm_primary_structure(resume_id: str, raw_text: str) -> dict:
         )
         return await _local_structure(resume_id, raw_text)
 
+    return await _finish_llm_primary(resume_id, raw_text, llm_result, merged, t0)
+
+
+async def _finish_llm_primary(
+    resume_id: str,
+    raw_text: str,
+    llm_result: dict,
+    merged: StructuredData,
+    t0: float,
+    packed_with: int = 1,
+) -> dict:
+    """
+    Post-processing shared by the single and packed LLM-primary paths:
+    targeted retries for missing experience/education, regex contact
+    overrides, validation and cost reporting.
+    """
+    # Regex pass for contact fields only. sections={} skips the section detector
+    # so this call returns fast and doesn't make any LLM calls of its own.
+    regex_name: str | None = None
+    regex_email: str | None = None
+    regex_phone: str | None = None
+    try:
+        regex_result = parse_cv(raw_text, sections={})
+        regex_name = regex_result.full_name
+        regex_email = regex_result.email
+        regex_phone = regex_result.phone
+    except Exception as exc:
+        logger.warning("regex_contact_parse_failed: %s", exc)
+
     # Serialise the validated model to a dict ONCE here. Subsequent overrides
     # operate on this dict directly so we never re-enter StructuredData's
     # `mode="before"` validators (which drop ExperienceItem/EducationItem
@@ -817,6 +869,7 @@ async def _llm_primary_structure(resume_id: str, raw_text: str) -> dict:
         "structured_data": structured_dict,
         "_pipeline_info": {
             "llm_path": "llm_primary",
+            "packed_with": packed_with,
             "input_tokens":  cv_cost["input_tokens"],
             "output_tokens": cv_cost["output_tokens"],
             "cost_usd":      cv_cost["total_cost_usd"],
@@ -829,15 +882,154 @@ async def _llm_primary_structure(resume_id: str, raw_text: str) -> dict:
     }
 
 
+def _cache_key(raw_text: str) -> str:
+    return structure_cache_key(raw_text, STRUCTURE_PIPELINE_VERSION, PROMPT_VERSION)
+
+
+async def _cached_structure(resume_id: str, raw_text: str) -> Optional[dict]:
+    cached = await structure_cache.get(_cache_key(raw_text))
+    if cached is not None:
+        logger.info("structure_cache_hit", extra={"resume_id": resume_id})
+        cached["source_file"] = resume_id
+        cached.setdefault("_pipeline_info", {})["cache_hit"] = True
+    return cached
+
+
+async def _structure_uncached(resume_id: str, raw_text: str) -> dict:
+    with llm_usage_scope("structure", item_id=resume_id):
+        result = await _llm_primary_structure(resume_id, raw_text)
+    if result.get("_pipeline_info", {}).get("llm_path") == "llm_primary":
+        await structure_cache.set(_cache_key(raw_text), result)
+    return result
+
+
 async def _structure_one(resume_id: str, raw_text: str) -> dict:
-    return await _llm_primary_structure(resume_id, raw_text)
+    """
+    Structure a resume through the content-addressed cache. Identical text
+    (after whitespace normalisation) under the same pipeline and prompt
+    versions reuses the earlier result instead of re-paying the LLM calls.
+    Only successful LLM-primary results are cached; local fallbacks are not.
+    """
+    cached = await _cached_structure(resume_id, raw_text)
+    if cached is not None:
+        return cached
+    return await _structure_uncached(resume_id, raw_text)
+
+
+def _plan_packs(items: List[BatchStructureItem], indices: List[int]) -> List[List[int]]:
+    """
+    Group batch positions into calls: resumes up to PACK_MAX_RESUME_CHARS are
+    packed greedily (at most PACK_MAX_ITEMS and PACK_MAX_CHARS per call);
+    longer ones, and packs that end up with a single resume, go alone.
+    """
+    groups: List[List[int]] = []
+    pack: List[int] = []
+    pack_chars = 0
+
+    for i in indices:
+        size = len(items[i].raw_text)
+        if size > PACK_MAX_RESUME_CHARS or PACK_MAX_ITEMS < 2:
+            groups.append([i])
+            continue
+        if pack and (len(pack) >= PACK_MAX_ITEMS or pack_chars + size > PACK_MAX_CHARS):
+            groups.append(pack)
+            pack, pack_chars = [], 0
+        pack.append(i)
+        pack_chars += size
+
+    if pack:
+        groups.append(pack)
+    return groups
+
+
+def _packed_entry_matches(data: dict, raw_text: str) -> bool:
+    """
+    Whether a packed entry plausibly came from ``raw_text``: the extracted
+    email, and every word of the extracted name, must appear in it. Guards
+    against the model shifting or swapping ``resume_index`` values.
+    """
+    text = raw_text.lower()
+    email = data.get("email")
+    if isinstance(email, str) and email.strip() and email.strip().lower() not in text:
+        return False
+    name = data.get("full_name")
+    if isinstance(name, str) and name.strip():
+        return all(word in text for word in re.findall(r"\w+", name.lower()))
+    return True
+
+
+async def _structure_packed(items: List[BatchStructureItem]) -> list:
+    """
+    Structure several short resumes with one Gemini call, then run each
+    through the normal LLM-primary post-processing. A resume whose entry is
+    missing, names someone not in its text, or fails schema validation
+    (every resume, if the call or JSON parse fails) falls back to its own
+    per-item call. The packed call's
+    spend is split across resumes by text length.
+    """
+    t0 = time.time()
+    packed_text = "\n\n".join(
+        f"=== RESUME {n} ===\n{item.raw_text}" for n, item in enumerate(items, 1)
+    )
+    prompt = _PACKED_RESUME_PREAMBLE.format(count=len(items)) + RESUME_PROMPT_TEMPLATE.format(raw_text=packed_text)
+
+    by_index: Dict[int, dict] = {}
+    with llm_usage_scope("structure_packed", export=False) as pack_usage:
+        try:
+            response = await llm.generate_json_async(prompt)
+            for entry in response.get("results") or []:
+                if isinstance(entry, dict) and isinstance(entry.get("data"), dict) and entry["data"]:
+                    index = str(entry.get("resume_index", "")).strip()
+                    if index.isdigit():
+                        by_index[int(index)] = entry["data"]
+        except Exception as exc:
+            logger.warning("packed_structure_failed", extra={"count": len(items), "error": str(exc)})
+
+    total_chars = sum(len(item.raw_text) for item in items) or 1
+
+    async def finish(n: int, item: BatchStructureItem) -> dict:
+        llm_result = by_index.get(n)
+        if llm_result and not _packed_entry_matches(llm_result, item.raw_text):
+            logger.warning("packed_structure_item_mismatch", extra={"resume_id": item.resume_id, "resume_index": n})
+            llm_result = None
+        try:
+            merged = StructuredData(**llm_result) if llm_result else None
+        except Exception:
+            merged = None
+        if merged is None:
+            logger.info("packed_structure_item_fallback", extra={"resume_id": item.resume_id})
+            return await _structure_uncached(item.resume_id, item.raw_text)
+
+        share = len(item.raw_text) / total_chars
+        with llm_usage_scope("structure", item_id=item.resume_id):
+            record_llm_call(
+                round(pack_usage.input_tokens * share),
+                round(pack_usage.output_tokens * share),
+                pack_usage.cost_usd * share,
+                pack_usage.llm_seconds * share,
+            )
+            result = await _finish_llm_primary(
+                item.resume_id, item.raw_text, llm_result, merged, t0, packed_with=len(items),
+            )
+        await structure_cache.set(_cache_key(item.raw_text), result)
+        return result
+
+    return await asyncio.gather(
+        *(finish(n, item) for n, item in enumerate(items, 1)),
+        return_exceptions=True,
+    )
+
+
+@router.get("/cache/stats")
+async def structure_cache_stats():
+    return structure_cache.stats()
 
 
 @router.post("")
 async def structure_resume(payload: StructureRequest):
     logger.info("structuring_resume", extra={"resume_id": payload.resume_id})
     try:
-        return await _llm_primary_structure(payload.resume_id, payload.raw_text)
+        return await _structure_one(payload.resume_id, payload.raw_text)
     except Exception as e:
         error_details = traceback.format_exc()
         logger.error("structure_failed", extra={"resume_id": payload.resume_id, "error": str(e), "traceback": error_details})
@@ -849,12 +1041,28 @@ async def structure_resume_batch(payload: BatchStructureRequest):
     try:
         logger.info("batch_structuring_start", extra={"count": len(payload.resumes)})
 
-        tasks = [
-            _structure_one(r.resume_id, r.raw_text)
-            for r in payload.resumes
-        ]
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        items = payload.resumes
+        results = list(await asyncio.gather(
+            *(_cached_structure(r.resume_id, r.raw_text) for r in items)
+        ))
+        pending = [i for i, cached in enumerate(results) if cached is None]
+        groups = _plan_packs(items, pending) if payload.pack else [[i] for i in pending]
+
+        outcomes = await asyncio.gather(
+            *(
+                _structure_uncached(items[g[0]].resume_id, items[g[0]].raw_text) if len(g) == 1
+                else _structure_packed([items[i] for i in g])
+                for g in groups
+            ),
+            return_exceptions=True,
+        )
+        for group, outcome in zip(groups, outcomes):
+            if len(group) == 1:
+                results[group[0]] = outcome
+            else:
+                per_item = [outcome] * len(group) if isinstance(outcome, Exception) else outcome
+                for i, item_result in zip(group, per_item):
+                    results[i] = item_result
 
         output = []
         for i, result in enumerate(results):
@@ -868,7 +1076,7 @@ async def structure_resume_batch(payload: BatchStructureRequest):
             else:
                 output.append(result)
 
-        logger.info("batch_structuring_complete", extra={"total": len(output)})
+        logger.info("batch_structuring_complete", extra={"total": len(output), "llm_requests": len(groups)})
         return {"results": output}
 
     except Exception as e:
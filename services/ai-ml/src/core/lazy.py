@@ -0,0 +1,37 @@
+import threading
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """
+    Thread-safe deferred singleton.
+
+    Wraps a factory and builds the object on first attribute access (or an
+    explicit ``get()``), so module-level service instances no longer load
+    models or open connections at import time. Attribute access is forwarded
+    to the built object, which keeps call sites unchanged.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> T:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    object.__setattr__(self, "_instance", self._factory())
+        return self._instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self.get(), name, value)
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (name, hook, required) — required hooks must succeed for readiness
+_hooks: List[Tuple[str, Callable[[], object], bool]] = []
+
+_state: Dict = {
+    "started": False,
+    "completed": False,
+    "timings_ms": {},
+    "errors": {},
+}
+
+
+def register_warmup(name: str, hook: Callable[[], object], required: bool = True):
+    """Register a blocking initialisation step to run during startup warmup."""
+    _hooks.append((name, hook, required))
+
+
+async def run_warmup() -> Dict:
+    """
+    Run every registered hook once, in registration order, off the event loop.
+
+    Failures are recorded rather than raised so a missing optional asset
+    (e.g. the ESCO CSV) does not take the service down.
+    """
+    if _state["started"]:
+        return warmup_report()
+
+    _state["started"] = True
+
+    for name, hook, required in _hooks:
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(hook)
+        except Exception as exc:
+            _state["errors"][name] = str(exc)
+            log = logger.error if required else logger.warning
+            log(f"Warmup step {name} failed: {exc}")
+        finally:
+            _state["timings_ms"][name] = round((time.perf_counter() - start) * 1000, 2)
+
+    _state["completed"] = True
+    logger.info("warmup_completed", extra={"timings_ms": _state["timings_ms"]})
+
+    return warmup_report()
+
+
+def is_ready() -> bool:
+    if not _state["completed"]:
+        return False
+
+    required = {name for name, _, is_required in _hooks if is_required}
+    return not (required & set(_state["errors"]))
+
+
+def warmup_report() -> Dict:
+    return {
+        "started": _state["started"],
+        "completed": _state["completed"],
+        "ready": is_ready(),
+        "timings_ms": dict(_state["timings_ms"]),
+        "errors": dict(_state["errors"]),
+    }
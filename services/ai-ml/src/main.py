@@ -1,25 +1,61 @@
 # Application entry point for AI/ML microservice
 
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from core.config import settings
 from core.logging import configure_logging, RequestContextMiddleware
+from core.warmup import register_warmup, run_warmup
 from api.router import api_router
 
 
 # Initialize structured logging before anything else
 configure_logging()
 
-# Load full ESCO skills vocabulary if CSV is available.
-# CSV is downloaded at Docker build time; path can be overridden via ESCO_CSV_PATH.
-_esco_csv = os.getenv("ESCO_CSV_PATH", "/app/data/skills_en.csv")
-try:
+
+# ---------------------------------------------------------
+# STARTUP WARMUP
+# ---------------------------------------------------------
+# Heavy initialisation is deferred out of import time and run once here, in
+# the background, so /health answers immediately while /ready stays false
+# until the models and vocabularies are loaded.
+# ---------------------------------------------------------
+
+def _warm_embedding_model():
+    from services.embeddings.local_client import LocalEmbeddingClient
+    LocalEmbeddingClient().load().embed_text("warmup")
+
+
+def _warm_esco_vocabulary():
+    # Load full ESCO skills vocabulary if CSV is available.
+    # CSV is downloaded at Docker build time; path can be overridden via ESCO_CSV_PATH.
+    # If missing, the built-in 400-skill vocabulary remains active.
     from services.parsers.esco_matcher import load_esco_csv
-    load_esco_csv(_esco_csv)
-except Exception:
-    pass  # built-in 400-skill vocabulary remains active
+    load_esco_csv(os.getenv("ESCO_CSV_PATH", "/app/data/skills_en.csv"))
+
+
+def _warm_spacy():
+    from services.parsers.section_extractor import warm_nlp
+    warm_nlp()
+
+
+register_warmup("embedding_model", _warm_embedding_model)
+register_warmup("esco_vocabulary", _warm_esco_vocabulary, required=False)
+register_warmup("spacy", _warm_spacy, required=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup_task = asyncio.create_task(run_warmup())
+    yield
+    warmup_task.cancel()
+
+    from services.embeddings.redis_client import close_async_pools
+    await close_async_pools()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -28,6 +64,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
 # Attach middleware
@@ -15,3 +15,10 @@ class EmbeddingRequest(BaseModel):
 
 class BatchEmbeddingRequest(BaseModel):
     texts: List[str]
+
+
+class DocumentEmbeddingRequest(BaseModel):
+    text: str
+    return_chunks: bool = False
+    chunk_tokens: Optional[int] = None
+    overlap_tokens: Optional[int] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 
 class InferenceResponse(BaseModel):
@@ -18,4 +18,11 @@ class BatchEmbeddingResponse(BaseModel):
     dimension: int
     count: int
     embeddings: List[List[float]]
-    
\ No newline at end of file
+    
+
+class DocumentEmbeddingResponse(BaseModel):
+    dimension: int
+    embedding: List[float]
+    chunk_count: int
+    chunks: Optional[List[str]] = None
+    chunk_embeddings: Optional[List[List[float]]] = None
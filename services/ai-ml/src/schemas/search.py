@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
  
  
 class SearchMatch(BaseModel):
@@ -10,6 +10,9 @@ class SearchMatch(BaseModel):
  
 class SearchMetrics(BaseModel):
     processing_time_ms: float
+    embedding_time_ms: Optional[float] = None
+    retrieval_time_ms: Optional[float] = None
+    query_count: Optional[int] = None
  
  
 class SearchQuery(BaseModel):
@@ -17,12 +20,22 @@ class SearchQuery(BaseModel):
     query_embedding: Optional[List[float]] = None
  
  
+class SearchFilters(BaseModel):
+    status: Optional[str] = None
+    location: Optional[str] = None
+    experience_level: Optional[str] = None
+    skills: Optional[List[str]] = None
+    min_years: Optional[int] = None
+ 
+ 
 class SearchRequest(BaseModel):
     query_text: Optional[str] = None
     query_embedding: Optional[List[float]] = None
     batch: Optional[List[SearchQuery]] = None
     top_k: int = 5
     min_score: float = 0.0
+    recall: Literal["speed", "balanced", "recall"] = "balanced"
+    filters: Optional[SearchFilters] = None
  
  
 class SearchResult(BaseModel):
@@ -0,0 +1,117 @@
+"""
+Recall@k of the HNSW index against exact search.
+
+    python scripts/ann_recall_benchmark.py [--table candidates] [--k 10]
+        [--queries 50] [--ef-search 40 100 200]
+
+Query vectors are sampled from the table itself. For each ef_search value
+every query runs twice: through the HNSW index and as an exact scan (index
+scans disabled for the transaction). The report gives recall@k and p50/p95
+latency per setting, which is what the speed/balanced/recall profiles in
+``services.rag.retriever`` are tuned from.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.session import async_session_maker  # noqa: E402
+from services.rag.retriever import EF_SEARCH_PROFILES  # noqa: E402
+
+TABLES = ("candidates", "jobs", "resumes")
+
+
+async def _knn(session, table: str, vector: str, k: int):
+    start = time.perf_counter()
+    result = await session.execute(
+        text(
+            f"SELECT id FROM {table} WHERE embedding IS NOT NULL "
+            "ORDER BY embedding <=> CAST(:vec AS vector) LIMIT :k"
+        ),
+        {"vec": vector, "k": k},
+    )
+    ids = [row.id for row in result.fetchall()]
+    return ids, (time.perf_counter() - start) * 1000
+
+
+async def _sample_queries(table: str, count: int):
+    async with async_session_maker() as session:
+        result = await session.execute(
+            text(
+                f"SELECT embedding::text AS vec FROM {table} "
+                "WHERE embedding IS NOT NULL ORDER BY random() LIMIT :n"
+            ),
+            {"n": count},
+        )
+        return [row.vec for row in result.fetchall()]
+
+
+async def _exact(table: str, vector: str, k: int):
+    async with async_session_maker() as session:
+        await session.execute(text("SET LOCAL enable_indexscan = off"))
+        ids, _ = await _knn(session, table, vector, k)
+        return set(ids)
+
+
+async def _approximate(table: str, vector: str, k: int, ef_search: int):
+    async with async_session_maker() as session:
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+        return await _knn(session, table, vector, k)
+
+
+def _percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))]
+
+
+async def run_benchmark(table: str, k: int, queries: int, ef_values):
+    vectors = await _sample_queries(table, queries)
+    if not vectors:
+        raise RuntimeError(f"No embeddings found in {table}")
+
+    truth = [await _exact(table, v, k) for v in vectors]
+
+    report = {"table": table, "k": k, "queries": len(vectors), "results": []}
+
+    for ef_search in ef_values:
+        recalls = []
+        latencies = []
+        for vector, expected in zip(vectors, truth):
+            ids, elapsed_ms = await _approximate(table, vector, k, ef_search)
+            latencies.append(elapsed_ms)
+            recalls.append(len(expected.intersection(ids)) / len(expected) if expected else 1.0)
+
+        report["results"].append({
+            "ef_search": ef_search,
+            "recall_at_k": round(statistics.mean(recalls), 4),
+            "min_recall": round(min(recalls), 4),
+            "p50_ms": round(_percentile(latencies, 0.50), 2),
+            "p95_ms": round(_percentile(latencies, 0.95), 2),
+        })
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure HNSW recall@k against exact pgvector search.")
+    parser.add_argument("--table", default="candidates", choices=TABLES)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument(
+        "--ef-search",
+        type=int,
+        nargs="+",
+        default=sorted(set(EF_SEARCH_PROFILES.values())),
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.table, args.k, args.queries, args.ef_search))
+    print(json.dumps(report, indent=2))
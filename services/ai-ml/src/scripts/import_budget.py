@@ -0,0 +1,81 @@
+"""
+Import-time budget report for the AI/ML service.
+
+    python scripts/import_budget.py [module ...] [--budget-ms 3000] [--top 15]
+
+Imports each module in a fresh interpreter with ``-X importtime`` and
+prints the slowest imports by cumulative time. Exits non-zero if any
+module exceeds the budget, so heavy eager imports (models, vocabularies,
+ML frameworks) creeping back into import time are caught early.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "main",
+    "services.embeddings.service",
+    "services.rag.retriever",
+    "services.search.search_service",
+    "services.parsers",
+]
+
+
+def measure(module: str):
+    env = dict(os.environ, PYTHONPATH=SRC_ROOT)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        try:
+            rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+        except ValueError:
+            continue  # header line
+
+    return proc.returncode, proc.stderr if proc.returncode else "", rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "3000")))
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    over_budget = False
+
+    for module in args.modules:
+        returncode, error, rows = measure(module)
+
+        if returncode != 0:
+            over_budget = True
+            print(f"\n{module}: import FAILED")
+            print(error.strip().splitlines()[-1] if error.strip() else "")
+            continue
+
+        total_ms = max((r[0] for r in rows), default=0) / 1000
+        status = "OK" if total_ms <= args.budget_ms else "OVER BUDGET"
+        over_budget |= total_ms > args.budget_ms
+
+        print(f"\n{module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms) {status}")
+        for cumulative_us, self_us, name in sorted(rows, reverse=True)[: args.top]:
+            print(f"  {cumulative_us / 1000:9.1f} ms  {self_us / 1000:8.1f} ms self  {name.strip()}")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
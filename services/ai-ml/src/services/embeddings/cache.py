@@ -1,21 +1,145 @@
 import hashlib
-import json
 import os
-from typing import List, Optional, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Dict, Tuple, Union
 
+import numpy as np
 import redis
 
+from .codec import decode_embedding, encode_embedding
+from .redis_client import get_async_redis
+
 
 DEFAULT_TTL_SECONDS = 60 * 60 * 24  # 24 hours
+DEFAULT_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+DEFAULT_MEMORY_MAX_BYTES = int(os.getenv("EMBEDDING_MEMORY_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+DEFAULT_TWO_TIER = os.getenv("EMBEDDING_CACHE_TWO_TIER", "false").lower() == "true"
+
+# Rough per-entry bookkeeping cost (key string, OrderedDict node, tuple)
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+class MemoryLRU:
+    """
+    Thread-safe, byte-budgeted LRU with per-entry TTL.
+
+    Used both as the fallback store when Redis is unreachable and as the
+    optional L1 tier in front of Redis.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MEMORY_MAX_BYTES,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, count=False) is not None
+
+    @staticmethod
+    def _entry_size(value: np.ndarray) -> int:
+        return value.nbytes + _ENTRY_OVERHEAD_BYTES
+
+    def _remove(self, key: str):
+        value, _ = self._entries.pop(key)
+        self.current_bytes -= self._entry_size(value)
+
+    def get(self, key: str, count: bool = True) -> Optional[np.ndarray]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[1] <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: np.ndarray, ttl: Optional[int] = None):
+        size = self._entry_size(value)
+        if size > self.max_bytes:
+            return
+
+        expires_at = self._clock() + (self.ttl_seconds if ttl is None else ttl)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, expires_at)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
 
 
 class EmbeddingCache:
     """
     Caches embeddings using Redis.
-    Falls back to in-memory cache if Redis unavailable.
+    Falls back to a bounded in-memory LRU if Redis unavailable.
+
+    Vectors are stored as raw float32 (or float16) bytes behind a small
+    version header; legacy JSON-list entries are still decoded on read.
+    Lookups return float32 numpy arrays.
+
+    With ``two_tier=True`` the LRU also sits in front of Redis as an L1, so
+    hot texts are served without a network round trip.
     """
 
-    def __init__(self, redis_url: str | None = None):
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        dtype: str | None = None,
+        memory_max_bytes: int = DEFAULT_MEMORY_MAX_BYTES,
+        two_tier: bool | None = None,
+    ):
+        self.dtype = dtype or DEFAULT_DTYPE
+        if self.dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding cache dtype: {self.dtype}")
+
         if redis_url:
             self.redis_url = redis_url
         else:
@@ -24,16 +148,19 @@ class EmbeddingCache:
             db = os.getenv("REDIS_DB", "0")
             self.redis_url = f"redis://{host}:{port}/{db}"
 
+        self.memory_cache = MemoryLRU(max_bytes=memory_max_bytes)
+
         try:
             self.client = redis.from_url(
                 self.redis_url,
-                decode_responses=True,
+                decode_responses=False,
             )
             self.client.ping()
             self.use_redis = True
         except Exception:
             self.use_redis = False
-            self.memory_cache: Dict[str, List[float]] = {}
+
+        self.two_tier = self.use_redis and (DEFAULT_TWO_TIER if two_tier is None else two_tier)
 
     # ==========================================================
     # INTERNAL
@@ -43,23 +170,41 @@ class EmbeddingCache:
     def _hash_text(text: str) -> str:
         return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
+    @property
+    def _use_memory(self) -> bool:
+        return self.two_tier or not self.use_redis
+
+    def stats(self) -> Dict:
+        return {
+            "backend": "redis" if self.use_redis else "memory",
+            "two_tier": self.two_tier,
+            "memory": self.memory_cache.stats(),
+        }
+
     # ==========================================================
     # SINGLE GET
     # ==========================================================
 
-    def get(self, text: str) -> Optional[List[float]]:
+    def get(self, text: str) -> Optional[np.ndarray]:
         key = self._hash_text(text)
 
-        if self.use_redis:
-            try:
-                value = self.client.get(key)
-                if value is None:
-                    return None
-                return json.loads(value)
-            except Exception:
+        if self._use_memory:
+            cached = self.memory_cache.get(key)
+            if cached is not None or not self.use_redis:
+                return cached
+
+        try:
+            value = self.client.get(key)
+            if value is None:
                 return None
-        else:
-            return self.memory_cache.get(key)
+            embedding = decode_embedding(value)
+        except Exception:
+            return None
+
+        if self.two_tier:
+            self.memory_cache.set(key, embedding)
+
+        return embedding
 
     # ==========================================================
     # SET
@@ -68,45 +213,230 @@ class EmbeddingCache:
     def set(
         self,
         text: str,
-        embedding: List[float],
+        embedding: Union[List[float], np.ndarray],
         ttl: int = DEFAULT_TTL_SECONDS,
     ):
         key = self._hash_text(text)
 
+        if self._use_memory:
+            self.memory_cache.set(key, np.asarray(embedding, dtype=np.float32), ttl=ttl)
+
         if self.use_redis:
             try:
-                self.client.setex(key, ttl, json.dumps(embedding))
+                self.client.setex(key, ttl, encode_embedding(embedding, self.dtype))
+            except Exception:
+                pass
+
+    # ==========================================================
+    # BATCH SET
+    # ==========================================================
+
+    def set_many(
+        self,
+        embeddings: Dict[str, Union[List[float], np.ndarray]],
+        ttl: int = DEFAULT_TTL_SECONDS,
+    ):
+        """Write a batch of embeddings with one pipelined round trip."""
+        if not embeddings:
+            return
+
+        if self._use_memory:
+            for text, embedding in embeddings.items():
+                self.memory_cache.set(self._hash_text(text), np.asarray(embedding, dtype=np.float32), ttl=ttl)
+
+        if self.use_redis:
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                for text, embedding in embeddings.items():
+                    pipe.setex(self._hash_text(text), ttl, encode_embedding(embedding, self.dtype))
+                pipe.execute()
             except Exception:
                 pass
-        else:
-            self.memory_cache[key] = embedding
 
     # ==========================================================
     # BATCH GET
     # ==========================================================
 
-    def get_many(self, texts: List[str]) -> Dict[str, List[float]]:
+    def get_many(self, texts: List[str]) -> Dict[str, np.ndarray]:
         if not texts:
             return {}
 
-        mapping: Dict[str, List[float]] = {}
+        mapping: Dict[str, np.ndarray] = {}
+        remaining = texts
 
-        if self.use_redis:
+        if self._use_memory:
+            remaining = []
+            for text in texts:
+                cached = self.memory_cache.get(self._hash_text(text))
+                if cached is not None:
+                    mapping[text] = cached
+                else:
+                    remaining.append(text)
+
+            if not self.use_redis or not remaining:
+                return mapping
+
+        try:
+            keys = [self._hash_text(t) for t in remaining]
+            values = self.client.mget(keys)
+
+            for text, key, value in zip(remaining, keys, values):
+                if value is not None:
+                    embedding = decode_embedding(value)
+                    mapping[text] = embedding
+                    if self.two_tier:
+                        self.memory_cache.set(key, embedding)
+
+            return mapping
+        except Exception:
+            return mapping
+
+
+class AsyncEmbeddingCache:
+    """
+    Non-blocking counterpart of ``EmbeddingCache`` built on ``redis.asyncio``.
+
+    Shares the process-wide connection pool from ``redis_client``. Redis
+    availability is probed on first use; if it is unreachable the cache
+    falls back to the bounded in-memory LRU, exactly like the sync cache.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        dtype: str | None = None,
+        memory_max_bytes: int = DEFAULT_MEMORY_MAX_BYTES,
+        two_tier: bool | None = None,
+    ):
+        self.dtype = dtype or DEFAULT_DTYPE
+        if self.dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding cache dtype: {self.dtype}")
+
+        self.client = get_async_redis(redis_url)
+        self.memory_cache = MemoryLRU(max_bytes=memory_max_bytes)
+        self.use_redis: Optional[bool] = None
+        self._two_tier_requested = DEFAULT_TWO_TIER if two_tier is None else two_tier
+        self.two_tier = False
+
+    # ==========================================================
+    # INTERNAL
+    # ==========================================================
+
+    _hash_text = staticmethod(EmbeddingCache._hash_text)
+
+    async def _connect(self) -> bool:
+        if self.use_redis is None:
             try:
-                keys = [self._hash_text(t) for t in texts]
-                values = self.client.mget(keys)
+                await self.client.ping()
+                self.use_redis = True
+            except Exception:
+                self.use_redis = False
+            self.two_tier = self.use_redis and self._two_tier_requested
 
-                for text, value in zip(texts, values):
-                    if value is not None:
-                        mapping[text] = json.loads(value)
+        return self.use_redis
 
-                return mapping
+    async def ping(self) -> bool:
+        return bool(await self.client.ping())
+
+    def stats(self) -> Dict:
+        return {
+            "backend": "memory" if self.use_redis is False else "redis",
+            "two_tier": self.two_tier,
+            "memory": self.memory_cache.stats(),
+        }
+
+    # ==========================================================
+    # SINGLE GET / SET
+    # ==========================================================
+
+    async def get(self, text: str) -> Optional[np.ndarray]:
+        use_redis = await self._connect()
+        key = self._hash_text(text)
+
+        if self.two_tier or not use_redis:
+            cached = self.memory_cache.get(key)
+            if cached is not None or not use_redis:
+                return cached
+
+        try:
+            value = await self.client.get(key)
+            if value is None:
+                return None
+            embedding = decode_embedding(value)
+        except Exception:
+            return None
+
+        if self.two_tier:
+            self.memory_cache.set(key, embedding)
+
+        return embedding
+
+    async def set(
+        self,
+        text: str,
+        embedding: Union[List[float], np.ndarray],
+        ttl: int = DEFAULT_TTL_SECONDS,
+    ):
+        await self.set_many({text: embedding}, ttl=ttl)
+
+    # ==========================================================
+    # BATCH GET / SET
+    # ==========================================================
+
+    async def set_many(
+        self,
+        embeddings: Dict[str, Union[List[float], np.ndarray]],
+        ttl: int = DEFAULT_TTL_SECONDS,
+    ):
+        if not embeddings:
+            return
+
+        use_redis = await self._connect()
+
+        if self.two_tier or not use_redis:
+            for text, embedding in embeddings.items():
+                self.memory_cache.set(self._hash_text(text), np.asarray(embedding, dtype=np.float32), ttl=ttl)
+
+        if use_redis:
+            try:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    for text, embedding in embeddings.items():
+                        pipe.setex(self._hash_text(text), ttl, encode_embedding(embedding, self.dtype))
+                    await pipe.execute()
             except Exception:
-                return {}
-        else:
+                pass
+
+    async def get_many(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        if not texts:
+            return {}
+
+        use_redis = await self._connect()
+        mapping: Dict[str, np.ndarray] = {}
+        remaining = texts
+
+        if self.two_tier or not use_redis:
+            remaining = []
             for text in texts:
-                key = self._hash_text(text)
-                if key in self.memory_cache:
-                    mapping[text] = self.memory_cache[key]
+                cached = self.memory_cache.get(self._hash_text(text))
+                if cached is not None:
+                    mapping[text] = cached
+                else:
+                    remaining.append(text)
+
+            if not use_redis or not remaining:
+                return mapping
+
+        try:
+            keys = [self._hash_text(t) for t in remaining]
+            values = await self.client.mget(keys)
+
+            for text, key, value in zip(remaining, keys, values):
+                if value is not None:
+                    embedding = decode_embedding(value)
+                    mapping[text] = embedding
+                    if self.two_tier:
+                        self.memory_cache.set(key, embedding)
 
             return mapping
+        except Exception:
+            return mapping
@@ -0,0 +1,93 @@
+import os
+import re
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+DEFAULT_CHUNK_TOKENS = int(os.getenv("EMBEDDING_CHUNK_TOKENS", "480"))
+DEFAULT_CHUNK_OVERLAP = int(os.getenv("EMBEDDING_CHUNK_OVERLAP", "64"))
+DEFAULT_MAX_CHUNKS = int(os.getenv("EMBEDDING_MAX_CHUNKS", "16"))
+
+# Upper bound on characters handed to the tokenizer. Text past
+# max_chunks * chunk_tokens tokens is never embedded, so there is no point
+# tokenizing it; ~8 chars/token is a generous ceiling for English CVs.
+_CHARS_PER_TOKEN_CEILING = 8
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def _token_spans(text: str, tokenizer) -> List[tuple]:
+    """Character (start, end) span of every token in ``text``."""
+    if tokenizer is not None:
+        try:
+            encoded = tokenizer(
+                text,
+                add_special_tokens=False,
+                return_offsets_mapping=True,
+                truncation=False,
+            )
+            return [tuple(span) for span in encoded["offset_mapping"]]
+        except Exception:
+            pass
+
+    # No fast tokenizer available: approximate tokens with words.
+    return [m.span() for m in _WORD_RE.finditer(text)]
+
+
+def split_by_tokens(
+    text: str,
+    tokenizer=None,
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap_tokens: int = DEFAULT_CHUNK_OVERLAP,
+    max_chunks: int = DEFAULT_MAX_CHUNKS,
+) -> List[str]:
+    """
+    Split ``text`` into windows of at most ``chunk_tokens`` tokens that
+    overlap by ``overlap_tokens``. Chunks are slices of the original text,
+    so no detokenisation artefacts leak into the embedding input.
+    """
+    if not text or not text.strip():
+        return []
+
+    if chunk_tokens <= 0:
+        raise ValueError("chunk_tokens must be positive")
+    if not 0 <= overlap_tokens < chunk_tokens:
+        raise ValueError("overlap_tokens must be in [0, chunk_tokens)")
+
+    text = text[: max_chunks * chunk_tokens * _CHARS_PER_TOKEN_CEILING]
+    spans = _token_spans(text, tokenizer)
+
+    if len(spans) <= chunk_tokens:
+        return [text.strip()]
+
+    step = chunk_tokens - overlap_tokens
+    chunks = []
+
+    for start in range(0, len(spans), step):
+        window = spans[start: start + chunk_tokens]
+        chunk = text[window[0][0]: window[-1][1]].strip()
+        if chunk:
+            chunks.append(chunk)
+
+        if start + chunk_tokens >= len(spans) or len(chunks) >= max_chunks:
+            break
+
+    return chunks
+
+
+def pool_embeddings(
+    embeddings: Sequence[Sequence[float]],
+    weights: Optional[Sequence[float]] = None,
+) -> List[float]:
+    """Weighted mean of chunk vectors, re-normalised to unit length."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2 or matrix.shape[0] == 0:
+        raise ValueError("Cannot pool an empty set of embeddings")
+
+    pooled = np.average(matrix, axis=0, weights=weights)
+    norm = np.linalg.norm(pooled)
+    if norm > 0:
+        pooled = pooled / norm
+
+    return pooled.astype(np.float32).tolist()
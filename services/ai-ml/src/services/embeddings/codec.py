@@ -0,0 +1,62 @@
+import json
+from typing import List, Union
+
+import numpy as np
+
+
+# Binary entry layout:
+#   b"EMB"  magic
+#   1 byte  format version
+#   1 byte  dtype code ("f" = float32, "e" = float16)
+#   rest    little-endian vector payload
+#
+# Entries written before the binary codec are JSON lists and start with "[".
+MAGIC = b"EMB"
+CODEC_VERSION = 1
+HEADER_SIZE = len(MAGIC) + 2
+
+_DTYPE_CODES = {
+    "float32": b"f",
+    "float16": b"e",
+}
+_CODE_DTYPES = {
+    b"f": np.dtype("<f4"),
+    b"e": np.dtype("<f2"),
+}
+
+
+def encode_embedding(
+    embedding: Union[List[float], np.ndarray],
+    dtype: str = "float32",
+) -> bytes:
+    if dtype not in _DTYPE_CODES:
+        raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+
+    code = _DTYPE_CODES[dtype]
+    payload = np.asarray(embedding, dtype=_CODE_DTYPES[code]).tobytes()
+
+    return MAGIC + bytes([CODEC_VERSION]) + code + payload
+
+
+def decode_embedding(value: Union[bytes, str]) -> np.ndarray:
+    """
+    Decode a cached embedding into a float32 vector.
+
+    Accepts both the binary format and legacy JSON-list entries.
+    """
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+
+    if value[:len(MAGIC)] == MAGIC:
+        version = value[len(MAGIC)]
+        if version != CODEC_VERSION:
+            raise ValueError(f"Unsupported embedding codec version: {version}")
+
+        code = value[len(MAGIC) + 1: HEADER_SIZE]
+        if code not in _CODE_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype code: {code!r}")
+
+        vector = np.frombuffer(value, dtype=_CODE_DTYPES[code], offset=HEADER_SIZE)
+        return vector.astype(np.float32)
+
+    return np.asarray(json.loads(value), dtype=np.float32)
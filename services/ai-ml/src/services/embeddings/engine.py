@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 100
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_ENGINE_MAX_BATCH_SIZE", "32"))
+DEFAULT_MAX_WAIT_MS = float(os.getenv("EMBEDDING_ENGINE_MAX_WAIT_MS", "5"))
+
+
+class EmbeddingEngine:
+    """
+    Micro-batching front end for a local embedding client.
+
+    Concurrent ``embed`` calls are queued and coalesced into batches of up to
+    ``max_batch_size`` texts, waiting at most ``max_wait_ms`` after the first
+    text arrives. Each batch is encoded with ``client.embed_batch`` on a single
+    dedicated worker thread, so the model is never contended and the event
+    loop is never blocked; per-request futures are resolved as batches finish.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ):
+        self.client = client
+        self.max_batch_size = max(1, min(max_batch_size or DEFAULT_MAX_BATCH_SIZE, MAX_BATCH_SIZE))
+        self.max_wait = (DEFAULT_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-engine")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def embed(self, text: str) -> List[float]:
+        if not text or not isinstance(text, str):
+            raise ValueError("Input text must be a non-empty string")
+
+        self._ensure_started()
+        future = self._loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        return list(await asyncio.gather(*(self.embed(t) for t in texts)))
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return [(text, future) for text, future in batch if not future.cancelled()]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+
+            texts = [text for text, _ in batch]
+
+            try:
+                embeddings = await loop.run_in_executor(self._executor, self.client.embed_batch, texts)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as exc:
+                logger.error(f"Embedding batch of {len(texts)} failed: {exc}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            self.batches += 1
+            self.items += len(texts)
+
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+
+
+_shared_engine: Optional[EmbeddingEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_embedding_engine(client) -> EmbeddingEngine:
+    """Process-wide engine, so every EmbeddingService coalesces into one queue."""
+    global _shared_engine
+
+    with _shared_lock:
+        if _shared_engine is None or _shared_engine.client is not client:
+            _shared_engine = EmbeddingEngine(client)
+
+    return _shared_engine
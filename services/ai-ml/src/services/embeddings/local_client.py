@@ -1,31 +1,126 @@
-from sentence_transformers import SentenceTransformer
+from __future__ import annotations
+
+import logging
+import os
 import threading
-from typing import List
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "BAAI/bge-base-en"
 EXPECTED_DIMENSION = 768
 MAX_BATCH_SIZE = 100
 
+# torch      - PyTorch fp32 (default)
+# onnx       - ONNX Runtime, fp32 graph exported from the same weights
+# onnx-int8  - ONNX Runtime with dynamic int8 weight quantization
+BACKENDS = ("torch", "onnx", "onnx-int8")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+ONNX_MODEL_DIR = Path(os.getenv("EMBEDDING_ONNX_DIR", "/app/models/bge-base-en-onnx"))
+# optimum AutoQuantizationConfig preset: avx2, avx512, avx512_vnni or arm64
+ONNX_QUANTIZATION_CONFIG = os.getenv("EMBEDDING_ONNX_QUANTIZATION", "avx2")
+
+
+def _load_onnx_int8() -> SentenceTransformer:
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    file_name = f"onnx/model_qint8_{ONNX_QUANTIZATION_CONFIG}.onnx"
+
+    if not (ONNX_MODEL_DIR / file_name).exists():
+        logger.info(f"Exporting int8 ONNX embedding model to {ONNX_MODEL_DIR}")
+        model = SentenceTransformer(MODEL_NAME, backend="onnx")
+        model.save(str(ONNX_MODEL_DIR))
+        export_dynamic_quantized_onnx_model(model, ONNX_QUANTIZATION_CONFIG, str(ONNX_MODEL_DIR))
+
+    return SentenceTransformer(
+        str(ONNX_MODEL_DIR),
+        backend="onnx",
+        model_kwargs={"file_name": file_name},
+    )
+
+
+def load_sentence_transformer(backend: str = EMBEDDING_BACKEND) -> Tuple[SentenceTransformer, str]:
+    """
+    Load bge-base-en on the requested backend.
+
+    ONNX backends need ``sentence-transformers[onnx]`` (optimum + onnxruntime),
+    which is optional: see requirements-onnx.txt.
+    If they are unavailable or the export fails, falls back to PyTorch so the
+    service still starts. Returns the model and the backend actually used.
+    """
+    # Imported here: pulling in sentence-transformers (and torch) costs
+    # seconds, which scripts and tests that never embed should not pay.
+    from sentence_transformers import SentenceTransformer
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {BACKENDS}")
+
+    if backend != "torch":
+        try:
+            if backend == "onnx":
+                return SentenceTransformer(MODEL_NAME, backend="onnx"), backend
+            return _load_onnx_int8(), backend
+        except Exception as exc:
+            logger.warning(f"Embedding backend {backend} unavailable, falling back to torch: {exc}")
+
+    return SentenceTransformer(MODEL_NAME), "torch"
+
 
 class LocalEmbeddingClient:
     """
     Local embedding provider using BAAI/bge-base-en (768-dim).
     Singleton pattern ensures model loads only once per process.
+    The inference backend (PyTorch or ONNX Runtime) is chosen by
+    EMBEDDING_BACKEND.
+
+    Construction is cheap: the model is loaded on first use, or explicitly
+    via ``load()`` from the startup warmup.
     """
 
     _instance = None
     _lock = threading.Lock()
+    _model_lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
                     instance = super().__new__(cls)
-                    instance.model = SentenceTransformer(
-                        "BAAI/bge-base-en"
-                    )
+                    instance._model = None
+                    instance.backend = None
                     cls._instance = instance
         return cls._instance
 
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self) -> "LocalEmbeddingClient":
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model, self.backend = load_sentence_transformer(
+                        EMBEDDING_BACKEND
+                    )
+        return self
+
+    @property
+    def model(self) -> SentenceTransformer:
+        return self.load()._model
+
+    @property
+    def tokenizer(self):
+        return getattr(self.model, "tokenizer", None)
+
+    @property
+    def max_tokens(self) -> int:
+        # Room for the [CLS]/[SEP] tokens the model adds around each input
+        return int(getattr(self.model, "max_seq_length", 512)) - 2
+
     def embed_text(self, text: str) -> List[float]:
         if not text or not isinstance(text, str):
             raise ValueError("Input text must be a non-empty string")
@@ -0,0 +1,90 @@
+"""
+Parity check between the PyTorch embedding model and an alternative backend.
+
+    python -m services.embeddings.parity --backend onnx-int8 [--texts-file FILE]
+
+Encodes the same texts with both backends and reports cosine drift plus
+per-batch encode time, so a quantized model can be validated before it is
+switched on in production.
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+SAMPLE_TEXTS = [
+    "Senior Python developer with 8 years of experience building FastAPI microservices.",
+    "Chartered accountant specialising in IFRS reporting, audit and tax compliance.",
+    "Compliance officer responsible for AML/KYC reviews and MAS regulatory filings.",
+    "Data scientist: PyTorch, scikit-learn, SQL, feature engineering and A/B testing.",
+    "Registered nurse with ICU experience and BLS/ACLS certification.",
+    "Product manager who led a mobile banking app from discovery to launch.",
+    "Research associate covering Southeast Asian equities for a long-only fund.",
+    "DevOps engineer: Kubernetes, Terraform, AWS, CI/CD pipelines and observability.",
+]
+
+
+def cosine_drift(reference: Sequence[Sequence[float]], candidate: Sequence[Sequence[float]]) -> Dict[str, float]:
+    """Row-wise cosine similarity between two aligned embedding matrices."""
+    ref = np.asarray(reference, dtype=np.float32)
+    cand = np.asarray(candidate, dtype=np.float32)
+
+    if ref.shape != cand.shape:
+        raise ValueError(f"Shape mismatch: {ref.shape} vs {cand.shape}")
+
+    ref_norm = np.linalg.norm(ref, axis=1)
+    cand_norm = np.linalg.norm(cand, axis=1)
+    denom = np.where(ref_norm * cand_norm == 0, 1.0, ref_norm * cand_norm)
+    cosine = np.sum(ref * cand, axis=1) / denom
+
+    return {
+        "count": int(len(cosine)),
+        "mean_cosine": float(cosine.mean()),
+        "min_cosine": float(cosine.min()),
+        "max_drift": float(1.0 - cosine.min()),
+    }
+
+
+def run_parity_check(backend: str, texts: List[str]) -> Dict:
+    from services.embeddings.local_client import load_sentence_transformer
+
+    timings = {}
+    vectors = {}
+
+    for name in ("torch", backend):
+        model, used = load_sentence_transformer(name)
+        if used != name:
+            raise RuntimeError(f"Backend {name} could not be loaded (fell back to {used})")
+
+        model.encode(texts[:1], normalize_embeddings=True)  # warm-up
+        start = time.perf_counter()
+        vectors[name] = model.encode(texts, batch_size=32, normalize_embeddings=True)
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    report = cosine_drift(vectors["torch"], vectors[backend])
+    report.update({
+        "backend": backend,
+        "torch_encode_ms": timings["torch"],
+        f"{backend}_encode_ms": timings[backend],
+        "speedup": round(timings["torch"] / timings[backend], 2) if timings[backend] else None,
+    })
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report cosine drift of an embedding backend against PyTorch.")
+    parser.add_argument("--backend", default="onnx-int8", choices=["onnx", "onnx-int8"])
+    parser.add_argument("--texts-file", help="Optional file with one text per line")
+    args = parser.parse_args()
+
+    texts = SAMPLE_TEXTS
+    if args.texts_file:
+        with open(args.texts_file, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+
+    print(json.dumps(run_parity_check(args.backend, texts), indent=2))
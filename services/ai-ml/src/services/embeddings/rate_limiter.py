@@ -5,6 +5,8 @@ from typing import Optional
 
 import redis
 
+from .redis_client import get_async_redis
+
 
 class RateLimitExceeded(Exception):
     """Raised when rate limit is exceeded."""
@@ -66,3 +68,54 @@ class RateLimiter:
             raise RateLimitExceeded(
                 f"Rate limit exceeded ({self.max_requests} per {self.window_seconds}s)"
             )
+
+
+class AsyncRateLimiter:
+    """
+    Non-blocking counterpart of ``RateLimiter`` built on ``redis.asyncio``.
+    INCR and EXPIRE are sent in a single pipelined round trip.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        window_seconds: int = 60,
+        max_requests: int = 100,
+    ):
+        self.client = get_async_redis(redis_url)
+        self.window_seconds = window_seconds
+        self.max_requests = max_requests
+        self.use_redis: Optional[bool] = None
+
+    async def _connect(self) -> bool:
+        if self.use_redis is None:
+            try:
+                await self.client.ping()
+                self.use_redis = True
+            except Exception:
+                # If Redis unavailable, limiter disables gracefully
+                self.use_redis = False
+
+        return self.use_redis
+
+    async def check(self, client_id: str = "global"):
+        """
+        Checks if client is within rate limit.
+        Raises RateLimitExceeded if limit exceeded.
+        """
+
+        if not await self._connect():
+            return  # fail open if Redis unavailable
+
+        current_window = int(time.time() // self.window_seconds)
+        key = f"rate_limit:{client_id}:{current_window}"
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, self.window_seconds)
+            count, _ = await pipe.execute()
+
+        if count > self.max_requests:
+            raise RateLimitExceeded(
+                f"Rate limit exceeded ({self.max_requests} per {self.window_seconds}s)"
+            )
@@ -0,0 +1,48 @@
+import os
+import threading
+from typing import Dict
+
+import redis.asyncio as aioredis
+
+
+_pools: Dict[str, aioredis.ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def default_redis_url() -> str:
+    host = os.getenv("REDIS_HOST", "localhost")
+    port = os.getenv("REDIS_PORT", "6379")
+    db = os.getenv("REDIS_DB", "0")
+    return f"redis://{host}:{port}/{db}"
+
+
+def get_async_redis(redis_url: str | None = None) -> aioredis.Redis:
+    """
+    Return an async Redis client backed by a process-wide connection pool.
+
+    Every caller with the same URL shares one pool, so the embedding cache
+    and the rate limiter do not each open their own connections. Responses
+    are raw bytes; callers decode what they need.
+    """
+    url = redis_url or default_redis_url()
+
+    with _pools_lock:
+        pool = _pools.get(url)
+        if pool is None:
+            pool = aioredis.ConnectionPool.from_url(
+                url,
+                decode_responses=False,
+                max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+            )
+            _pools[url] = pool
+
+    return aioredis.Redis(connection_pool=pool)
+
+
+async def close_async_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        await pool.disconnect()
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, List
 import logging
 
-from .cache import EmbeddingCache
-from .rate_limiter import RateLimiter
+from .cache import AsyncEmbeddingCache, EmbeddingCache
+from .rate_limiter import AsyncRateLimiter, RateLimiter
+from .chunking import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_TOKENS,
+    pool_embeddings,
+    split_by_tokens,
+)
+from .engine import EmbeddingEngine, get_embedding_engine
 from .local_client import LocalEmbeddingClient
 
 logger = logging.getLogger(__name__)
@@ -18,15 +25,21 @@ class EmbeddingService:
         self,
         cache: EmbeddingCache | None = None,
         rate_limiter: RateLimiter | None = None,
+        async_cache: AsyncEmbeddingCache | None = None,
+        async_rate_limiter: AsyncRateLimiter | None = None,
+        engine: EmbeddingEngine | None = None,
     ):
         self.cache = cache or EmbeddingCache()
         self.rate_limiter = rate_limiter or RateLimiter()
+        self.async_cache = async_cache or AsyncEmbeddingCache()
+        self.async_rate_limiter = async_rate_limiter or AsyncRateLimiter()
         self.primary = LocalEmbeddingClient()
+        self.engine = engine or get_embedding_engine(self.primary)
 
     def get_embedding(self, text: str) -> List[float]:
         cached = self.cache.get(text)
-        if cached:
-            return cached
+        if cached is not None:
+            return cached.tolist()
 
         self.rate_limiter.check("embedding_service")
 
@@ -46,7 +59,7 @@ class EmbeddingService:
         results: dict[str, List[float]] = {}
 
         cached = self.cache.get_many(texts)
-        results.update(cached)
+        results.update({text: emb.tolist() for text, emb in cached.items()})
 
         missing = [t for t in texts if t not in cached]
 
@@ -55,13 +68,129 @@ class EmbeddingService:
 
             embeddings = self.primary.embed_batch(missing)
 
+            fresh: dict[str, List[float]] = {}
             for text, emb in zip(missing, embeddings):
                 self._validate_embedding(emb)
-                self.cache.set(text, emb)
-                results[text] = emb
+                fresh[text] = emb
+
+            self.cache.set_many(fresh)
+            results.update(fresh)
+
+        return [results[t] for t in texts]
+
+    # ---------- ASYNC ----------
+    # Same contract as the sync methods, but cache and rate-limit round trips
+    # go through redis.asyncio and cache misses are coalesced by the shared
+    # micro-batching engine, which runs the model off the event loop.
+
+    async def get_embedding_async(self, text: str) -> List[float]:
+        cached = await self.async_cache.get(text)
+        if cached is not None:
+            return cached.tolist()
+
+        await self.async_rate_limiter.check("embedding_service")
+
+        embedding = await self.engine.embed(text)
+
+        self._validate_embedding(embedding)
+        await self.async_cache.set(text, embedding)
+
+        return embedding
+
+    async def get_embeddings_async(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) > MAX_BATCH_SIZE:
+            raise ValueError("Batch size cannot exceed 100")
+
+        results: dict[str, List[float]] = {}
+
+        cached = await self.async_cache.get_many(texts)
+        results.update({text: emb.tolist() for text, emb in cached.items()})
+
+        missing = [t for t in texts if t not in cached]
+
+        if missing:
+            await self.async_rate_limiter.check("embedding_service")
+
+            embeddings = await self.engine.embed_many(missing)
+
+            fresh: dict[str, List[float]] = {}
+            for text, emb in zip(missing, embeddings):
+                self._validate_embedding(emb)
+                fresh[text] = emb
+
+            await self.async_cache.set_many(fresh)
+            results.update(fresh)
 
         return [results[t] for t in texts]
 
+    # ---------- DOCUMENT (CHUNKED) ----------
+    # bge-base silently truncates at 512 tokens, so long resumes are split into
+    # overlapping token windows, embedded as one batch (each chunk is cached
+    # individually) and mean-pooled into a single unit-length document vector.
+
+    def get_document_embedding(
+        self,
+        text: str,
+        return_chunks: bool = False,
+        chunk_tokens: int | None = None,
+        overlap_tokens: int | None = None,
+    ) -> Dict[str, Any]:
+        chunks = self._chunk_document(text, chunk_tokens, overlap_tokens)
+        embeddings = self.get_embeddings(chunks)
+        return self._pool_document(chunks, embeddings, return_chunks)
+
+    async def get_document_embedding_async(
+        self,
+        text: str,
+        return_chunks: bool = False,
+        chunk_tokens: int | None = None,
+        overlap_tokens: int | None = None,
+    ) -> Dict[str, Any]:
+        chunks = self._chunk_document(text, chunk_tokens, overlap_tokens)
+        embeddings = await self.get_embeddings_async(chunks)
+        return self._pool_document(chunks, embeddings, return_chunks)
+
+    def _chunk_document(
+        self,
+        text: str,
+        chunk_tokens: int | None,
+        overlap_tokens: int | None,
+    ) -> List[str]:
+        if not text or not text.strip():
+            raise ValueError("Input text must be a non-empty string")
+
+        chunk_tokens = min(chunk_tokens or DEFAULT_CHUNK_TOKENS, self.primary.max_tokens)
+        overlap_tokens = DEFAULT_CHUNK_OVERLAP if overlap_tokens is None else overlap_tokens
+
+        return split_by_tokens(
+            text,
+            tokenizer=self.primary.tokenizer,
+            chunk_tokens=chunk_tokens,
+            overlap_tokens=min(overlap_tokens, chunk_tokens - 1),
+        )
+
+    def _pool_document(
+        self,
+        chunks: List[str],
+        embeddings: List[List[float]],
+        return_chunks: bool,
+    ) -> Dict[str, Any]:
+        if len(embeddings) == 1:
+            pooled = embeddings[0]
+        else:
+            pooled = pool_embeddings(embeddings, weights=[len(c) for c in chunks])
+
+        result: Dict[str, Any] = {
+            "embedding": pooled,
+            "chunk_count": len(chunks),
+        }
+
+        if return_chunks:
+            result["chunks"] = chunks
+            result["chunk_embeddings"] = embeddings
+
+        return result
+
     # ---------- INTERNAL ----------
 
     def _validate_embedding(self, embedding: List[float]):
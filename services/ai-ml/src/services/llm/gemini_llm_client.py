@@ -1,15 +1,66 @@
 import os
 import re
 import json
+import time
 import logging
 import asyncio
-import concurrent.futures
+import threading
 from typing import Any, Dict, List
 
+import httpx
 from google import genai
+from google.genai import errors as genai_errors
+
+from .governor import RETRYABLE_STATUS_CODES, backoff_delay, estimate_tokens, get_governor
+from .usage import current_usage, record_llm_call
 
 logger = logging.getLogger(__name__)
 
+GEMINI_TIMEOUT_SECONDS = int(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+
+_GENERATION_CONFIG = {
+    "temperature": 0,
+    "max_output_tokens": 32768,
+    "response_mime_type": "application/json",
+    # thinking_budget=0 disables extended reasoning; adds 3-8s latency per call
+    # with no accuracy benefit for deterministic JSON extraction tasks
+    "thinking_config": {"thinking_budget": 0}
+}
+
+_STRICT_JSON_SUFFIX = (
+    "\n\nCRITICAL: Your previous response was not valid JSON. "
+    "Return ONLY a single valid JSON object. "
+    "No markdown, no code blocks, no explanation. "
+    "Every string value must be properly quoted. "
+    "Every array and object must be properly closed. "
+    "Do not truncate the response."
+)
+
+_clients: Dict[str, genai.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def _shared_client(api_key: str) -> genai.Client:
+    """
+    One SDK client per API key for the whole process, so every
+    GeminiLLMClient shares the same HTTP connection pools. The timeout is
+    enforced by the transport (milliseconds) instead of a watchdog thread.
+    """
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = genai.Client(
+                api_key=api_key,
+                http_options={"timeout": GEMINI_TIMEOUT_SECONDS * 1000},
+            )
+            _clients[api_key] = client
+    return client
+
+
+def _is_retryable(exc: Exception) -> bool:
+    return isinstance(exc, genai_errors.APIError) and exc.code in RETRYABLE_STATUS_CODES
+
 # Gemini 2.5 Flash standard tier — https://ai.google.dev/gemini-api/docs/pricing
 # Output rate is identical whether thinking is enabled or disabled; this path runs with
 # thinking_budget=0 (configured below) so output reflects only the JSON payload.
@@ -25,14 +76,9 @@ class GeminiLLMClient:
         if not self.api_key:
             raise RuntimeError("GEMINI_API_KEY not set")
 
-        self.client = genai.Client(api_key=self.api_key)
+        self.client = _shared_client(self.api_key)
         self.model_name = "gemini-2.5-flash"
 
-        # Accumulated since last consume_session_cost() call.
-        # Not thread-safe for concurrent batch processing — use per-call logs for accuracy there.
-        self._session_input_tokens: int = 0
-        self._session_output_tokens: int = 0
-
     def _clean_json_string(self, raw: str) -> str:
         raw = raw.strip()
 
@@ -76,28 +122,7 @@ class GeminiLLMClient:
 
         return None
 
-    def _call_gemini(self, prompt: str) -> str:
-        # ThreadPoolExecutor allows future.result(timeout=) to enforce a hard ceiling;
-        # the SDK has no native timeout parameter in this version
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(
-                self.client.models.generate_content,
-                model=self.model_name,
-                contents=prompt,
-                config={
-                    "temperature": 0,
-                    "max_output_tokens": 32768,
-                    "response_mime_type": "application/json",
-                    # thinking_budget=0 disables extended reasoning; adds 3-8s latency per call
-                    # with no accuracy benefit for deterministic JSON extraction tasks
-                    "thinking_config": {"thinking_budget": 0}
-                }
-            )
-            try:
-                response = future.result(timeout=60)
-            except concurrent.futures.TimeoutError:
-                raise RuntimeError("Gemini request timed out after 60 seconds")
-
+    def _record_response(self, response, seconds: float) -> str:
         if not response:
             raise RuntimeError("No response from Gemini")
 
@@ -111,61 +136,105 @@ class GeminiLLMClient:
         call_cost_usd = (input_tokens * _INPUT_COST_PER_TOKEN
                          + output_tokens * _OUTPUT_COST_PER_TOKEN)
 
-        self._session_input_tokens  += input_tokens
-        self._session_output_tokens += output_tokens
+        record_llm_call(input_tokens, output_tokens, call_cost_usd, seconds)
 
         logger.info("gemini_call_tokens", extra={
             "input_tokens":   input_tokens,
             "output_tokens":  output_tokens,
             "call_cost_usd":  round(call_cost_usd, 6),
+            "latency_s":      round(seconds, 3),
         })
 
         return response.text
 
-    def generate_json(self, prompt: str) -> Dict[str, Any]:
-        raw_text = self._call_gemini(prompt)
-        result = self._try_parse_json(raw_text)
-
-        if result is not None:
-            return result
+    def _call_gemini(self, prompt: str) -> str:
+        started = time.perf_counter()
+        for attempt in range(GEMINI_MAX_RETRIES + 1):
+            try:
+                response = self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=_GENERATION_CONFIG,
+                )
+                break
+            except httpx.TimeoutException:
+                raise RuntimeError(f"Gemini request timed out after {GEMINI_TIMEOUT_SECONDS} seconds")
+            except Exception as exc:
+                if not _is_retryable(exc) or attempt == GEMINI_MAX_RETRIES:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"Gemini returned {exc.code}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        return self._record_response(response, time.perf_counter() - started)
+
+    async def _call_gemini_async(self, prompt: str) -> str:
+        """
+        Native async call through the SDK's ``aio`` surface. Every attempt
+        goes through the process-wide governor (RPM/TPM pacing plus an
+        in-flight cap); 429 and 5xx responses are retried with jittered
+        exponential backoff outside the concurrency slot.
+        """
+        governor = get_governor()
+        estimated = estimate_tokens(prompt)
+        started = time.perf_counter()
 
-        logger.warning("First Gemini attempt returned invalid JSON, retrying with strict prompt")
+        for attempt in range(GEMINI_MAX_RETRIES + 1):
+            try:
+                async with governor.slot(estimated):
+                    response = await self.client.aio.models.generate_content(
+                        model=self.model_name,
+                        contents=prompt,
+                        config=_GENERATION_CONFIG,
+                    )
+                break
+            except httpx.TimeoutException:
+                raise RuntimeError(f"Gemini request timed out after {GEMINI_TIMEOUT_SECONDS} seconds")
+            except Exception as exc:
+                if not _is_retryable(exc) or attempt == GEMINI_MAX_RETRIES:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"Gemini returned {exc.code}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
 
-        strict_suffix = (
-            "\n\nCRITICAL: Your previous response was not valid JSON. "
-            "Return ONLY a single valid JSON object. "
-            "No markdown, no code blocks, no explanation. "
-            "Every string value must be properly quoted. "
-            "Every array and object must be properly closed. "
-            "Do not truncate the response."
-        )
+        usage = getattr(response, "usage_metadata", None)
+        governor.record_usage(estimated, int(getattr(usage, "total_token_count", 0) or 0))
+        return self._record_response(response, time.perf_counter() - started)
 
-        raw_text_retry = self._call_gemini(prompt + strict_suffix)
-        result = self._try_parse_json(raw_text_retry)
+    def _parse_or_none(self, raw_text: str, retried: bool) -> Dict[str, Any] | None:
+        result = self._try_parse_json(raw_text)
+        if result is None and not retried:
+            logger.warning("First Gemini attempt returned invalid JSON, retrying with strict prompt")
+        elif result is not None and retried:
+            logger.info("Retry succeeded with strict prompt")
+        elif result is None:
+            logger.error("Both Gemini attempts returned invalid JSON, returning empty fallback")
+        return result
 
+    def generate_json(self, prompt: str) -> Dict[str, Any]:
+        result = self._parse_or_none(self._call_gemini(prompt), retried=False)
         if result is not None:
-            logger.info("Retry succeeded with strict prompt")
             return result
 
-        logger.error("Both Gemini attempts returned invalid JSON, returning empty fallback")
-        return {}
+        result = self._parse_or_none(self._call_gemini(prompt + _STRICT_JSON_SUFFIX), retried=True)
+        return result if result is not None else {}
 
     def consume_session_cost(self) -> dict:
         """
-        Returns the accumulated token counts and cost since the last call, then resets.
-        Call this once per CV at the end of _local_structure() to get per-CV spend.
+        Token counts and cost recorded in the current ``llm_usage_scope`` since
+        the previous call. Scopes are per task, so concurrent resumes in a
+        batch only ever see their own calls. Outside a scope nothing is
+        attributed and zeros are returned.
         """
-        input_t  = self._session_input_tokens
-        output_t = self._session_output_tokens
-        total_cost_usd = (input_t * _INPUT_COST_PER_TOKEN
-                          + output_t * _OUTPUT_COST_PER_TOKEN)
-        self._session_input_tokens  = 0
-        self._session_output_tokens = 0
-        return {
-            "input_tokens":    input_t,
-            "output_tokens":   output_t,
-            "total_cost_usd":  round(total_cost_usd, 6),
-        }
+        usage = current_usage()
+        if usage is None:
+            return {"input_tokens": 0, "output_tokens": 0, "total_cost_usd": 0.0}
+        return usage.consume()
 
     async def generate_json_async(self, prompt: str) -> Dict[str, Any]:
-        return await asyncio.to_thread(self.generate_json, prompt)
\ No newline at end of file
+        result = self._parse_or_none(await self._call_gemini_async(prompt), retried=False)
+        if result is not None:
+            return result
+
+        result = self._parse_or_none(await self._call_gemini_async(prompt + _STRICT_JSON_SUFFIX), retried=True)
+        return result if result is not None else {}
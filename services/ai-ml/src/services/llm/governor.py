@@ -0,0 +1,119 @@
+import asyncio
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+
+
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+DEFAULT_RPM_LIMIT = int(os.getenv("GEMINI_RPM_LIMIT", "1000"))
+DEFAULT_TPM_LIMIT = int(os.getenv("GEMINI_TPM_LIMIT", "1000000"))
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt size for pacing (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """
+    Per-minute token bucket for async callers.
+
+    ``reserve`` takes tokens immediately, letting the balance go negative,
+    and returns how long the caller must wait before the tokens are
+    actually available. Since nothing awaits between the refill and the
+    debit, no lock is needed and waiters are served in arrival order.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        self._refill()
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate)
+
+    def adjust(self, amount: float):
+        """Charge (or refund, if negative) tokens after the real usage is known."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+    async def acquire(self, amount: float = 1):
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class LLMGovernor:
+    """
+    Process-wide limiter for provider calls: RPM and TPM token buckets pace
+    request starts, and a semaphore caps how many requests are in flight.
+    A limit of 0 disables that bucket.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rpm_limit: int = DEFAULT_RPM_LIMIT,
+        tpm_limit: int = DEFAULT_TPM_LIMIT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(rpm_limit, clock) if rpm_limit > 0 else None
+        self.tokens = TokenBucket(tpm_limit, clock) if tpm_limit > 0 else None
+        self.in_flight = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # asyncio primitives bind to one loop; rebuild if a new loop shows up
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int):
+        if self.requests:
+            await self.requests.acquire(1)
+        if self.tokens:
+            await self.tokens.acquire(estimated_tokens)
+
+        async with self._get_semaphore():
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        if self.tokens and actual_tokens:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+_governor: Optional[LLMGovernor] = None
+
+
+def get_governor() -> LLMGovernor:
+    global _governor
+    if _governor is None:
+        _governor = LLMGovernor()
+    return _governor
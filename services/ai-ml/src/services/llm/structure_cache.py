@@ -0,0 +1,184 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from services.embeddings.redis_client import get_async_redis
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = int(os.getenv("STRUCTURE_CACHE_TTL_SECONDS", str(60 * 60 * 24 * 30)))  # 30 days
+DEFAULT_CACHE_DIR = os.getenv("STRUCTURE_CACHE_DIR", "/tmp/structure_cache")
+# While on the disk fallback, ping Redis again at most this often
+REDIS_REPROBE_SECONDS = int(os.getenv("STRUCTURE_CACHE_REPROBE_SECONDS", "60"))
+# Expired disk entries are swept at most this often, on write
+DISK_SWEEP_SECONDS = 60 * 60
+KEY_PREFIX = "structure:v1:"
+
+
+def normalize_resume_text(raw_text: str) -> str:
+    """Whitespace-insensitive form of a resume, so re-extractions of the same file hit."""
+    return " ".join((raw_text or "").split())
+
+
+def structure_cache_key(raw_text: str, pipeline_version: str, prompt_version: str) -> str:
+    payload = f"{pipeline_version}\x00{prompt_version}\x00{normalize_resume_text(raw_text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class StructureCache:
+    """
+    Content-addressed cache of structuring results.
+
+    Entries live in Redis under ``structure:v1:<sha256>``. When Redis is
+    unreachable, writes go to one JSON file per key under ``cache_dir`` and
+    Redis misses also consult that directory, so results written during an
+    outage are still served afterwards. Disk entries honour the same TTL
+    (by mtime) and expired files are swept periodically. While on disk,
+    Redis is re-probed every ``REDIS_REPROBE_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        cache_dir: str | None = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ):
+        self.client = get_async_redis(redis_url)
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.ttl_seconds = ttl_seconds
+        self.use_redis: Optional[bool] = None
+        self._probed_at = 0.0
+        self._swept_at = 0.0
+
+        self.redis_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    # ==========================================================
+    # INTERNAL
+    # ==========================================================
+
+    async def _connect(self) -> bool:
+        if self.use_redis:
+            return True
+        if self.use_redis is False and time.monotonic() - self._probed_at < REDIS_REPROBE_SECONDS:
+            return False
+        try:
+            await self.client.ping()
+            if self.use_redis is False:
+                logger.info("Structure cache reconnected to Redis")
+            self.use_redis = True
+        except Exception:
+            self._redis_down()
+        return self.use_redis
+
+    def _redis_down(self):
+        self.use_redis = False
+        self._probed_at = time.monotonic()
+
+    def _expired(self, path: Path, now: float) -> bool:
+        return now - path.stat().st_mtime > self.ttl_seconds
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            if self._expired(path, time.time()):
+                path.unlink(missing_ok=True)
+                return None
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def _sweep_disk(self):
+        now = time.time()
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                if self._expired(path, now):
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                pass
+
+    def _write_disk(self, key: str, value: dict):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(value, default=str), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def stats(self) -> Dict:
+        lookups = self.redis_hits + self.disk_hits + self.misses
+        return {
+            "backend": "disk" if self.use_redis is False else "redis",
+            "redis_hits": self.redis_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+            "hit_rate": round((self.redis_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    # ==========================================================
+    # GET / SET
+    # ==========================================================
+
+    async def get(self, key: str) -> Optional[dict]:
+        if await self._connect():
+            try:
+                value = await self.client.get(KEY_PREFIX + key)
+                if value is not None:
+                    self.redis_hits += 1
+                    return json.loads(value)
+            except Exception as e:
+                self.errors += 1
+                self._redis_down()
+                logger.warning(f"Structure cache read failed: {e}")
+
+        try:
+            value = await asyncio.to_thread(self._read_disk, key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Structure cache disk read failed: {e}")
+            value = None
+
+        if value is not None:
+            self.disk_hits += 1
+            return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict):
+        if await self._connect():
+            try:
+                await self.client.setex(KEY_PREFIX + key, self.ttl_seconds, json.dumps(value, default=str))
+                self.writes += 1
+                return
+            except Exception as e:
+                self.errors += 1
+                self._redis_down()
+                logger.warning(f"Structure cache write failed, using disk: {e}")
+
+        try:
+            await asyncio.to_thread(self._write_disk, key, value)
+            self.writes += 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Structure cache disk write failed: {e}")
+
+        if time.monotonic() - self._swept_at >= DISK_SWEEP_SECONDS:
+            self._swept_at = time.monotonic()
+            try:
+                await asyncio.to_thread(self._sweep_disk)
+            except Exception as e:
+                logger.warning(f"Structure cache disk sweep failed: {e}")
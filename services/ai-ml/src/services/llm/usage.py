@@ -0,0 +1,128 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from prometheus_client import Histogram
+
+
+logger = logging.getLogger(__name__)
+
+LLM_TOKENS = Histogram(
+    "llm_tokens_per_item",
+    "LLM tokens spent per structured item (resume, CV profile)",
+    ["endpoint", "direction"],
+    buckets=[250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000],
+)
+
+LLM_COST = Histogram(
+    "llm_cost_usd_per_item",
+    "LLM cost in USD per structured item",
+    ["endpoint"],
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25],
+)
+
+LLM_LATENCY = Histogram(
+    "llm_latency_seconds_per_item",
+    "Time spent waiting on LLM calls per structured item",
+    ["endpoint"],
+    buckets=[0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0],
+)
+
+LLM_CALLS = Histogram(
+    "llm_calls_per_item",
+    "LLM calls made per structured item",
+    ["endpoint"],
+    buckets=[1, 2, 3, 4, 6, 8],
+)
+
+
+@dataclass
+class LLMUsage:
+    """Token, cost and latency totals for one accounting scope."""
+
+    endpoint: str
+    item_id: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    llm_seconds: float = 0.0
+    calls: int = 0
+    _consumed: dict = field(default_factory=lambda: {"input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0})
+
+    def add(self, input_tokens: int, output_tokens: int, cost_usd: float, seconds: float, calls: int = 1):
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cost_usd += cost_usd
+        self.llm_seconds += seconds
+        self.calls += calls
+
+    def consume(self) -> dict:
+        """Totals since the previous ``consume()`` in this scope."""
+        delta = {
+            "input_tokens": self.input_tokens - self._consumed["input_tokens"],
+            "output_tokens": self.output_tokens - self._consumed["output_tokens"],
+            "total_cost_usd": round(self.cost_usd - self._consumed["cost_usd"], 6),
+        }
+        self._consumed = {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": self.cost_usd,
+        }
+        return delta
+
+
+_current_usage: ContextVar[Optional[LLMUsage]] = ContextVar("llm_usage", default=None)
+
+
+def current_usage() -> Optional[LLMUsage]:
+    return _current_usage.get()
+
+
+def record_llm_call(input_tokens: int, output_tokens: int, cost_usd: float, seconds: float):
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.add(input_tokens, output_tokens, cost_usd, seconds)
+
+
+@contextmanager
+def llm_usage_scope(endpoint: str, item_id: Optional[str] = None, export: bool = True) -> Iterator[LLMUsage]:
+    """
+    Attribute every LLM call made inside the block to one item.
+
+    The scope lives in a ContextVar, and ``asyncio.gather`` runs each
+    coroutine in its own copy of the context, so concurrent resumes in one
+    batch never share totals. When a scope closes, its totals are added to
+    the enclosing scope (if any) and exported to the per-item histograms.
+    Pass ``export=False`` for scopes whose spend the caller re-attributes
+    to item scopes itself; it is then neither exported nor rolled up, so it
+    is not counted twice.
+    """
+    parent = _current_usage.get()
+    usage = LLMUsage(endpoint=endpoint, item_id=item_id)
+    token = _current_usage.set(usage)
+    started = time.perf_counter()
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+        if parent is not None and export:
+            parent.add(usage.input_tokens, usage.output_tokens, usage.cost_usd, usage.llm_seconds, usage.calls)
+        if export and usage.calls:
+            LLM_TOKENS.labels(endpoint=endpoint, direction="input").observe(usage.input_tokens)
+            LLM_TOKENS.labels(endpoint=endpoint, direction="output").observe(usage.output_tokens)
+            LLM_COST.labels(endpoint=endpoint).observe(usage.cost_usd)
+            LLM_LATENCY.labels(endpoint=endpoint).observe(usage.llm_seconds)
+            LLM_CALLS.labels(endpoint=endpoint).observe(usage.calls)
+            logger.info("llm_usage", extra={
+                "endpoint":      endpoint,
+                "item_id":       item_id,
+                "llm_calls":     usage.calls,
+                "input_tokens":  usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+                "cost_usd":      round(usage.cost_usd, 6),
+                "llm_seconds":   round(usage.llm_seconds, 3),
+                "wall_seconds":  round(time.perf_counter() - started, 3),
+            })
@@ -5,6 +5,8 @@ import logging
 from dataclasses import dataclass
 from pathlib import Path
 
+from .vocabulary_matcher import VocabularyMatcher
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -122,6 +124,10 @@ _BUILTIN_SKILLS: list[str] = [
 # Normalised lookup set — built once at module load
 _NORM_TO_CANONICAL: dict[str, str] = {}
 
+# Token trie over the same keys, grown alongside _NORM_TO_CANONICAL, so
+# match_esco_skills costs O(text) however large the ESCO vocabulary gets
+_MATCHER = VocabularyMatcher(max_tokens=5)
+
 
 def _normalise(s: str) -> str:
     return re.sub(r"[^a-z0-9\s]", " ", s.lower()).strip()
@@ -133,6 +139,7 @@ def _build_index(extra_skills: list[str] | None = None) -> None:
         key = _normalise(skill)
         if key and key not in _NORM_TO_CANONICAL:
             _NORM_TO_CANONICAL[key] = skill
+            _MATCHER.add(key, skill)
 
 
 def load_esco_csv(csv_path: str) -> None:
@@ -175,6 +182,7 @@ def load_esco_csv(csv_path: str) -> None:
                     key = _normalise(skill)
                     if key and key not in _NORM_TO_CANONICAL:
                         _NORM_TO_CANONICAL[key] = skill
+                        _MATCHER.add(key, skill)
                         loaded += 1
 
         logger.info("esco_csv_loaded", extra={"total_vocab_size": len(_NORM_TO_CANONICAL), "added": loaded, "path": csv_path})
@@ -182,33 +190,19 @@ def load_esco_csv(csv_path: str) -> None:
         logger.warning("esco_csv_load_failed: %s", exc)
 
 
-def _build_ngrams(text: str, max_n: int = 5) -> set[str]:
-    """Tokenise normalised text into all n-grams up to max_n words."""
-    words = re.split(r"[^a-z0-9]+", _normalise(text))
-    words = [w for w in words if w]
-    ngrams: set[str] = set()
-    for i in range(len(words)):
-        for n in range(1, max_n + 1):
-            if i + n <= len(words):
-                ngrams.add(" ".join(words[i : i + n]))
-    return ngrams
-
-
 def match_esco_skills(text: str) -> list[EscoMatch]:
     """
-    Scan text for vocabulary matches. Uses n-gram set intersection for efficiency.
-    Single-word entries require a word-boundary match to reduce false positives.
+    Scan text for vocabulary matches with the token trie. Entries match only
+    as whole consecutive words (the same rule as intersecting the text's
+    1–5 word n-grams with the vocabulary), in vocabulary order.
     """
     if not _NORM_TO_CANONICAL:
         _build_index()
 
-    ngrams = _build_ngrams(text)
     seen: set[str] = set()
     results: list[EscoMatch] = []
 
-    for norm_key, canonical in _NORM_TO_CANONICAL.items():
-        if norm_key not in ngrams:
-            continue
+    for canonical in _MATCHER.find_all(text):
         key = canonical.lower()
         if key not in seen:
             seen.add(key)
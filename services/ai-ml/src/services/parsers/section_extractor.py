@@ -41,6 +41,11 @@ def _get_nlp():
             _NLP = False  # sentinel so we don't retry every call
     return _NLP if _NLP else None
 
+
+def warm_nlp() -> bool:
+    """Load the spaCy pipeline ahead of the first request (startup warmup)."""
+    return _get_spacy_available() and _get_nlp() is not None
+
 _SPLIT_RE = re.compile(r"[•\*►▪;\n\t]+")
 
 # Words that indicate a phrase is a sentence fragment, not a skill name
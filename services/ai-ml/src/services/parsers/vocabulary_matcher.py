@@ -0,0 +1,83 @@
+from __future__ import annotations
+import re
+from typing import Iterable, Mapping
+
+_TOKEN_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Terminal marker inside a trie node; never collides with a token since tokens are non-empty
+_END = ""
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric word tokens; every other character is a boundary."""
+    return [t for t in _TOKEN_SPLIT_RE.split(text.lower()) if t]
+
+
+class VocabularyMatcher:
+    """
+    Token trie over a phrase vocabulary (used for the ESCO index).
+
+    A phrase matches when its tokens appear as consecutive whole words in
+    the text, which is the same boundary rule as intersecting the text's
+    word n-grams with the vocabulary. Matching walks at most ``max_tokens``
+    trie levels from each word, so cost grows with text length and not with
+    vocabulary size. Results come back in vocabulary insertion order.
+    """
+
+    def __init__(self, max_tokens: int = 5):
+        self.max_tokens = max_tokens
+        self._root: dict = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_terms(cls, terms: Iterable[str] | Mapping[str, str], max_tokens: int = 5) -> "VocabularyMatcher":
+        """
+        Build from plain terms (each maps to itself) or a ``{term: canonical}``
+        mapping such as an alias table.
+        """
+        matcher = cls(max_tokens=max_tokens)
+        items = terms.items() if isinstance(terms, Mapping) else ((t, t) for t in terms)
+        for term, value in items:
+            matcher.add(" ".join(tokenize(term)), value)
+        return matcher
+
+    def add(self, key: str, value: str) -> bool:
+        """
+        Index ``value`` under a normalised, single-space separated ``key``.
+        Keys that could never equal a word n-gram (empty, too long, or with
+        characters other than [a-z0-9] inside a token) are skipped, as is a
+        key that is already present; the first value for a key wins.
+        """
+        tokens = key.split(" ")
+        if len(tokens) > self.max_tokens or not all(_TOKEN_RE.fullmatch(t) for t in tokens):
+            return False
+
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _END in node:
+            return False
+
+        node[_END] = (self._size, value)
+        self._size += 1
+        return True
+
+    def find_all(self, text: str) -> list[str]:
+        words = tokenize(text)
+        hits: dict[int, str] = {}
+
+        for i in range(len(words)):
+            node = self._root
+            for word in words[i : i + self.max_tokens]:
+                node = node.get(word)
+                if node is None:
+                    break
+                terminal = node.get(_END)
+                if terminal is not None:
+                    hits[terminal[0]] = terminal[1]
+
+        return [hits[rank] for rank in sorted(hits)]
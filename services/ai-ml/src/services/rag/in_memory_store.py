@@ -1,51 +1,215 @@
 import numpy as np
-from typing import List, Dict
- 
- 
+from typing import Dict, List, Optional, Sequence, Union
+
+
 class InMemoryVectorStore:
     """
-    Simple in-memory vector store for RAG retrieval.
-    Suitable for small datasets (<= few thousand chunks).
+    In-memory vector store for RAG retrieval.
+
+    Embeddings are kept L2-normalised in a single contiguous float32 matrix,
+    so a search is one matmul followed by an ``argpartition`` top-k instead of
+    a Python loop over every chunk. Rows can be appended and deleted in place;
+    the matrix grows geometrically and deletes swap the last row into the hole.
+
+    A store can also wrap a read-only (e.g. memory-mapped) matrix via
+    ``from_matrix``; it is copied into private memory only on first mutation.
     """
- 
-    def __init__(self):
-        self.vectors: List[Dict] = []
- 
-    def add(self, source_file: str, text_chunk: str, embedding: List[float]):
-        self.vectors.append({
-            "source_file": source_file,
-            "text_chunk": text_chunk,
-            "embedding": np.array(embedding)
-        })
- 
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        denom = np.linalg.norm(a) * np.linalg.norm(b)
-        if denom == 0:
-            return 0.0
-        return float(np.dot(a, b) / denom)
- 
-    def search(self, query_embedding: List[float], top_k: int = 5):
-        if not self.vectors:
+
+    def __init__(self, dim: Optional[int] = None, initial_capacity: int = 1024):
+        self.dim = dim
+        self._capacity = max(int(initial_capacity), 1)
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._row_ids: Optional[List[int]] = []
+        self._id_to_row: Optional[Dict[int, int]] = {}
+        self._meta: Sequence[Dict] = []
+        self._next_id = 0
+
+        if dim is not None:
+            self._matrix = np.zeros((self._capacity, dim), dtype=np.float32)
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray, metadata: Sequence[Dict]) -> "InMemoryVectorStore":
+        """
+        Wrap an already L2-normalised ``(N, dim)`` float32 matrix without copying it.
+
+        ``metadata`` is any sequence of ``{"source_file", "text_chunk"}`` dicts
+        aligned with the matrix rows. Chunk ids are the row indices.
+        """
+        if matrix.ndim != 2:
+            raise ValueError("matrix must be two-dimensional")
+        if len(metadata) != matrix.shape[0]:
+            raise ValueError("metadata must have one entry per matrix row")
+
+        store = cls(initial_capacity=max(matrix.shape[0], 1))
+        store.dim = matrix.shape[1]
+        store._matrix = matrix
+        store._size = matrix.shape[0]
+        store._meta = metadata
+        store._row_ids = None
+        store._id_to_row = None
+        store._next_id = matrix.shape[0]
+        return store
+
+    def _materialize(self):
+        """Copy a borrowed matrix/metadata into private, mutable storage."""
+        if self._row_ids is not None:
+            return
+
+        capacity = max(self._size, 1)
+        owned = np.zeros((capacity, self.dim), dtype=np.float32)
+        owned[: self._size] = self._matrix[: self._size]
+        self._matrix = owned
+        self._capacity = capacity
+        self._meta = [dict(self._meta[row]) for row in range(self._size)]
+        self._row_ids = list(range(self._size))
+        self._id_to_row = {row: row for row in range(self._size)}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Read-only view of the live (normalised) embedding rows."""
+        if self._matrix is None:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        view = self._matrix[: self._size]
+        view.flags.writeable = False
+        return view
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _ensure_capacity(self, extra: int, dim: int):
+        if self._matrix is None:
+            self.dim = dim
+            self._capacity = max(self._capacity, extra)
+            self._matrix = np.zeros((self._capacity, dim), dtype=np.float32)
+            return
+
+        if dim != self.dim:
+            raise ValueError(f"Embedding dimension {dim} does not match store dimension {self.dim}")
+
+        needed = self._size + extra
+        if needed <= self._capacity:
+            return
+
+        new_capacity = self._capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+
+        grown = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        grown[: self._size] = self._matrix[: self._size]
+        self._matrix = grown
+        self._capacity = new_capacity
+
+    def add(self, source_file: str, text_chunk: str, embedding: List[float]) -> int:
+        return self.add_many([source_file], [text_chunk], [embedding])[0]
+
+    def add_many(
+        self,
+        source_files: Sequence[str],
+        text_chunks: Sequence[str],
+        embeddings: Union[Sequence[List[float]], np.ndarray],
+    ) -> List[int]:
+        """Append a batch of chunks and return their ids."""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+
+        count = vectors.shape[0]
+        if count == 0:
             return []
- 
-        query_vec = np.array(query_embedding)
- 
-        scored = []
- 
-        for item in self.vectors:
-            score = self._cosine_similarity(query_vec, item["embedding"])
-            scored.append((score, item))
- 
-        scored.sort(key=lambda x: x[0], reverse=True)
- 
+        if not (len(source_files) == len(text_chunks) == count):
+            raise ValueError("source_files, text_chunks and embeddings must have the same length")
+
+        self._materialize()
+        self._ensure_capacity(count, vectors.shape[1])
+        start = self._size
+        self._matrix[start: start + count] = self._normalize(vectors)
+
+        ids = list(range(self._next_id, self._next_id + count))
+        self._next_id += count
+
+        for offset, (chunk_id, source_file, text_chunk) in enumerate(zip(ids, source_files, text_chunks)):
+            self._row_ids.append(chunk_id)
+            self._id_to_row[chunk_id] = start + offset
+            self._meta.append({"source_file": source_file, "text_chunk": text_chunk})
+
+        self._size += count
+        return ids
+
+    def delete(self, chunk_id: int) -> bool:
+        """Remove a chunk by id. The last row is moved into the freed slot."""
+        self._materialize()
+        row = self._id_to_row.pop(chunk_id, None)
+        if row is None:
+            return False
+
+        last = self._size - 1
+        if row != last:
+            moved_id = self._row_ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._row_ids[row] = moved_id
+            self._meta[row] = self._meta[last]
+            self._id_to_row[moved_id] = row
+
+        self._row_ids.pop()
+        self._meta.pop()
+        self._matrix[last] = 0.0
+        self._size -= 1
+        return True
+
+    def delete_source(self, source_file: str) -> int:
+        """Remove every chunk that came from ``source_file``."""
+        self._materialize()
+        ids = [self._row_ids[row] for row, meta in enumerate(self._meta) if meta["source_file"] == source_file]
+        for chunk_id in ids:
+            self.delete(chunk_id)
+        return len(ids)
+
+    def _top_k_rows(self, scores: np.ndarray, top_k: int) -> np.ndarray:
+        if top_k >= scores.shape[1]:
+            return np.argsort(-scores, axis=1)
+
+        part = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        order = np.argsort(-part_scores, axis=1)
+        return np.take_along_axis(part, order, axis=1)
+
+    def search_batch(self, query_embeddings: Union[Sequence[List[float]], np.ndarray], top_k: int = 5) -> List[List[Dict]]:
+        """Return the top-k chunks for each row of a query matrix."""
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+
+        if self._size == 0 or top_k <= 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        if queries.shape[1] != self.dim:
+            raise ValueError(f"Query dimension {queries.shape[1]} does not match store dimension {self.dim}")
+
+        scores = self._normalize(queries) @ self._matrix[: self._size].T
+        rows = self._top_k_rows(scores, top_k)
+
         results = []
- 
-        for score, item in scored[:top_k]:
-            results.append({
-                "source_file": item["source_file"],
-                "text_chunk": item["text_chunk"],
-                "score": score
-            })
- 
+        for q, row_indices in enumerate(rows):
+            results.append([
+                {
+                    "source_file": self._meta[row]["source_file"],
+                    "text_chunk": self._meta[row]["text_chunk"],
+                    "score": float(scores[q, row])
+                }
+                for row in row_indices
+            ])
+
         return results
- 
\ No newline at end of file
+
+    def search(self, query_embedding: List[float], top_k: int = 5):
+        if self._size == 0:
+            return []
+
+        return self.search_batch([query_embedding], top_k=top_k)[0]
@@ -1,54 +1,238 @@
+import argparse
 import json
+import os
+import shutil
+from collections.abc import Sequence
 from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
 from services.rag.in_memory_store import InMemoryVectorStore
- 
- 
+
+
 EMBEDDING_BASE = Path("services/data/embeddings")
- 
- 
+SNAPSHOT_DIR = Path(os.getenv("VECTOR_SNAPSHOT_DIR", "services/data/vector_snapshot"))
+
+# Snapshot layout (all files live in one directory):
+#   manifest.json      {"version", "count", "dim", "sources"}
+#   embeddings.f32     raw little-endian float32 matrix, (count, dim), L2-normalised
+#   text.bin           UTF-8 text of every chunk, concatenated
+#   text_offsets.npy   int64 (count + 1,) byte offsets into text.bin
+#   source_index.npy   int32 (count,) index into manifest["sources"]
+SNAPSHOT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+MATRIX_FILE = "embeddings.f32"
+TEXT_FILE = "text.bin"
+OFFSETS_FILE = "text_offsets.npy"
+SOURCE_INDEX_FILE = "source_index.npy"
+
+
+class SnapshotMetadata(Sequence):
+    """
+    Row metadata backed by memory-mapped snapshot files.
+
+    Text is decoded per row on access, so opening a snapshot never
+    materialises every chunk string up front.
+    """
+
+    def __init__(self, sources, source_index: np.ndarray, text: np.ndarray, offsets: np.ndarray):
+        self._sources = sources
+        self._source_index = source_index
+        self._text = text
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._source_index)
+
+    def __getitem__(self, row: int) -> Dict:
+        if row < 0:
+            row += len(self)
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return {
+            "source_file": self._sources[int(self._source_index[row])],
+            "text_chunk": bytes(self._text[start:end]).decode("utf-8"),
+        }
+
+
+def convert_json_to_snapshot(json_dir: Path = EMBEDDING_BASE, out_dir: Path = SNAPSHOT_DIR) -> int:
+    """
+    Convert a directory of ``*.json`` chunk-embedding files into a snapshot.
+
+    Files are streamed one at a time, so peak memory is bounded by the largest
+    JSON file rather than the whole corpus. The snapshot is written to a
+    temporary directory and swapped in place once complete.
+    """
+    json_dir, out_dir = Path(json_dir), Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    sources = []
+    source_index = []
+    offsets = [0]
+    dim = None
+    total_chunks = 0
+
+    with open(tmp_dir / MATRIX_FILE, "wb") as matrix_out, open(tmp_dir / TEXT_FILE, "wb") as text_out:
+        for file in sorted(json_dir.glob("*.json")):
+            try:
+                with open(file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"Failed reading {file.name}: {e}")
+                continue
+
+            source_id = len(sources)
+            sources.append(data.get("source_file", file.name))
+
+            vectors = []
+            for chunk in data.get("chunks", []):
+                text_chunk = chunk.get("text_chunk")
+                embedding = chunk.get("embedding")
+
+                if not text_chunk or not embedding:
+                    continue
+
+                if dim is None:
+                    dim = len(embedding)
+                elif len(embedding) != dim:
+                    print(f"Skipping chunk in {file.name}: dimension {len(embedding)} != {dim}")
+                    continue
+
+                encoded = text_chunk.encode("utf-8")
+                text_out.write(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+                source_index.append(source_id)
+                vectors.append(embedding)
+
+            if vectors:
+                matrix = np.asarray(vectors, dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                matrix_out.write(np.ascontiguousarray(matrix / norms, dtype="<f4").tobytes())
+                total_chunks += len(vectors)
+
+    np.save(tmp_dir / OFFSETS_FILE, np.asarray(offsets, dtype=np.int64))
+    np.save(tmp_dir / SOURCE_INDEX_FILE, np.asarray(source_index, dtype=np.int32))
+
+    with open(tmp_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": SNAPSHOT_VERSION,
+            "count": total_chunks,
+            "dim": dim or 0,
+            "sources": sources,
+        }, f)
+
+    old_dir = out_dir.with_name(out_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if out_dir.exists():
+        out_dir.rename(old_dir)
+    tmp_dir.rename(out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    print(f"Wrote snapshot of {total_chunks} chunks from {len(sources)} files to {out_dir}.")
+
+    return total_chunks
+
+
+def load_snapshot(snapshot_dir: Path = SNAPSHOT_DIR) -> InMemoryVectorStore:
+    """
+    Open a snapshot with ``np.memmap``.
+
+    Nothing is parsed or copied: the matrix and text are mapped read-only, so
+    startup is near-instant and every uvicorn worker process shares the same
+    page-cache pages instead of holding its own copy of the store.
+    """
+    snapshot_dir = Path(snapshot_dir)
+
+    with open(snapshot_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported vector snapshot version: {manifest.get('version')}")
+
+    count, dim = int(manifest["count"]), int(manifest["dim"])
+
+    if count == 0:
+        return InMemoryVectorStore()
+
+    matrix = np.memmap(snapshot_dir / MATRIX_FILE, dtype="<f4", mode="r", shape=(count, dim))
+    offsets = np.load(snapshot_dir / OFFSETS_FILE, mmap_mode="r")
+    source_index = np.load(snapshot_dir / SOURCE_INDEX_FILE, mmap_mode="r")
+
+    if (snapshot_dir / TEXT_FILE).stat().st_size > 0:
+        text = np.memmap(snapshot_dir / TEXT_FILE, dtype=np.uint8, mode="r")
+    else:
+        text = np.zeros(0, dtype=np.uint8)
+
+    metadata = SnapshotMetadata(manifest["sources"], source_index, text, offsets)
+    store = InMemoryVectorStore.from_matrix(matrix, metadata)
+
+    print(f"Mapped {count} chunks from snapshot {snapshot_dir}.")
+
+    return store
+
+
 def load_embeddings_into_memory() -> InMemoryVectorStore:
     """
-    Load all chunk embeddings from disk into RAM vector store.
+    Load all chunk embeddings into a RAM vector store.
+
+    Uses the memory-mapped snapshot when one exists, otherwise falls back to
+    parsing the per-file JSON embeddings.
     """
- 
+
+    if (SNAPSHOT_DIR / MANIFEST_FILE).exists():
+        try:
+            return load_snapshot(SNAPSHOT_DIR)
+        except Exception as e:
+            print(f"Failed opening snapshot {SNAPSHOT_DIR}: {e}")
+
     store = InMemoryVectorStore()
- 
+
     if not EMBEDDING_BASE.exists():
         print("Embedding directory does not exist.")
         return store
- 
+
     total_files = 0
     total_chunks = 0
- 
+
     for file in EMBEDDING_BASE.glob("*.json"):
         total_files += 1
- 
+
         try:
             with open(file, "r", encoding="utf-8") as f:
                 data = json.load(f)
         except Exception as e:
             print(f"Failed reading {file.name}: {e}")
             continue
- 
+
         source_file = data.get("source_file", file.name)
-        chunks = data.get("chunks", [])
- 
-        for chunk in chunks:
-            text_chunk = chunk.get("text_chunk")
-            embedding = chunk.get("embedding")
- 
-            if not text_chunk or not embedding:
-                continue
- 
-            store.add(
-                source_file=source_file,
-                text_chunk=text_chunk,
-                embedding=embedding,
-            )
- 
-            total_chunks += 1
- 
+        chunks = [
+            chunk for chunk in data.get("chunks", [])
+            if chunk.get("text_chunk") and chunk.get("embedding")
+        ]
+
+        if not chunks:
+            continue
+
+        store.add_many(
+            source_files=[source_file] * len(chunks),
+            text_chunks=[chunk["text_chunk"] for chunk in chunks],
+            embeddings=[chunk["embedding"] for chunk in chunks],
+        )
+
+        total_chunks += len(chunks)
+
     print(f"Loaded {total_chunks} chunks from {total_files} files into RAM.")
- 
+
     return store
- 
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert JSON chunk embeddings into a memory-mapped snapshot.")
+    parser.add_argument("json_dir", nargs="?", default=str(EMBEDDING_BASE))
+    parser.add_argument("out_dir", nargs="?", default=str(SNAPSHOT_DIR))
+    args = parser.parse_args()
+
+    convert_json_to_snapshot(Path(args.json_dir), Path(args.out_dir))
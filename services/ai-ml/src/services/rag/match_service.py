@@ -33,7 +33,7 @@ class MatchService:
                         retrieved_chunks=retrieved_chunks
                     )
 
-                    result = self.llm.generate_json(prompt)
+                    result = await self.llm.generate_json_async(prompt)
 
                     job_matches.append({
                         "candidate_name": candidate.get("name") or candidate.get("full_name") or "Unknown",
@@ -1,59 +1,185 @@
+import os
 import logging
+from core.lazy import Lazy
 from services.embeddings.service import EmbeddingService
 
 logger = logging.getLogger(__name__)
 
+# hnsw.ef_search per recall profile (pgvector default is 40). Higher walks
+# more of the HNSW graph: better recall against exact search, more latency.
+EF_SEARCH_PROFILES = {
+    "speed": 40,
+    "balanced": 100,
+    "recall": 200,
+}
+MAX_EF_SEARCH = 1000
+
+# Filtered result sets up to this size may fall back to an exact (sequential)
+# scan when even MAX_EF_SEARCH leaves fewer than k rows; above it the scan
+# costs more than the missing rows are worth.
+EXACT_SCAN_MAX_ROWS = int(os.getenv("RAG_EXACT_SCAN_MAX_ROWS", "5000"))
+
+
+def ef_search_for(recall: str, k: int) -> int:
+    # ef_search below the LIMIT makes HNSW return fewer than k rows
+    ef_search = max(EF_SEARCH_PROFILES.get(recall, EF_SEARCH_PROFILES["balanced"]), k)
+    return min(ef_search, MAX_EF_SEARCH)
+
+# Shared by every retriever instance; MatchService builds one per candidate.
+_embedder = Lazy(EmbeddingService)
+
+
+def _filter_conditions(filters):
+    """
+    WHERE conditions and params for the structured filters. ``filters`` is
+    any object with optional ``status``, ``location``, ``experience_level``,
+    ``skills`` and ``min_years`` attributes (see ``schemas.search.SearchFilters``).
+    """
+    conditions = ["embedding IS NOT NULL"]
+    params = {}
+
+    if filters is not None:
+        if getattr(filters, "status", None):
+            conditions.append("status = :status")
+            params["status"] = filters.status
+
+        if getattr(filters, "location", None):
+            conditions.append("location ILIKE :location")
+            params["location"] = f"%{filters.location}%"
+
+        if getattr(filters, "experience_level", None):
+            conditions.append("experience_level = :experience_level")
+            params["experience_level"] = filters.experience_level
+
+        skills = [s.strip() for s in (getattr(filters, "skills", None) or []) if s and s.strip()]
+        if skills:
+            # Array overlap is served by the skills GIN index; skills are
+            # stored both as typed and lower-cased, so match either form.
+            conditions.append("skills && CAST(:skills AS varchar[])")
+            params["skills"] = sorted(set(skills) | {s.lower() for s in skills})
+
+        if getattr(filters, "min_years", None) is not None:
+            conditions.append("years_of_experience >= :min_years")
+            params["min_years"] = filters.min_years
+
+    return conditions, params
+
+
+def build_retrieval_query(filters=None, min_score: float = 0.0):
+    """
+    kNN SQL over candidates with every filter and the score threshold in the
+    WHERE clause, so the planner can combine them with the HNSW scan instead
+    of callers discarding rows afterwards.
+    """
+    conditions, params = _filter_conditions(filters)
+
+    if min_score > 0:
+        conditions.append("embedding <=> CAST(:query_embedding AS vector) <= :max_distance")
+        params["max_distance"] = 1.0 - min_score
+
+    sql = (
+        "SELECT id, first_name, last_name, current_title, location, "
+        "1 - (embedding <=> CAST(:query_embedding AS vector)) AS score "
+        "FROM candidates "
+        f"WHERE {' AND '.join(conditions)} "
+        "ORDER BY embedding <=> CAST(:query_embedding AS vector) "
+        "LIMIT :limit"
+    )
+    return sql, params
+
+
+def build_filtered_count_query(filters=None, cap: int = EXACT_SCAN_MAX_ROWS):
+    """Row count matching the structured filters, counting no further than ``cap + 1``."""
+    conditions, params = _filter_conditions(filters)
+    sql = (
+        "SELECT count(*) FROM ("
+        f"SELECT 1 FROM candidates WHERE {' AND '.join(conditions)} LIMIT :cap"
+        ") AS filtered"
+    )
+    params["cap"] = cap + 1
+    return sql, params
+
 
 class RAGRetriever:
 
     def __init__(self):
-        self.embedder = EmbeddingService()
+        self.embedder = _embedder
 
-    async def retrieve_top_k(self, query_text: str, k: int = 5):
+    async def retrieve_top_k(
+        self,
+        query_text: str,
+        k: int = 5,
+        recall: str = "balanced",
+        filters=None,
+        min_score: float = 0.0,
+    ):
         if not query_text or not query_text.strip():
             return []
 
         try:
-            from sqlalchemy import text as sql_text
-            from db.session import async_session_maker
-
-            query_embedding = self.embedder.get_embedding(query_text)
+            query_embedding = await self.embedder.get_embedding_async(query_text)
 
             if not query_embedding:
                 return []
 
-            embedding_str = "[" + ",".join(str(float(v)) for v in query_embedding) + "]"
-
-            sql = sql_text(
-                "SELECT id, first_name, last_name, current_title, location, "
-                "1 - (embedding <=> CAST(:query_embedding AS vector)) AS score "
-                "FROM candidates "
-                "WHERE embedding IS NOT NULL "
-                "ORDER BY embedding <=> CAST(:query_embedding AS vector) "
-                "LIMIT :limit"
+            return await self.retrieve_by_embedding(
+                query_embedding, k=k, recall=recall, filters=filters, min_score=min_score
             )
 
-            async with async_session_maker() as session:
-                result = await session.execute(
-                    sql,
-                    {
-                        "query_embedding": embedding_str,
-                        "limit": k
-                    }
-                )
-                rows = result.fetchall()
-
-            matches = []
-            for r in rows:
-                name = f"{r.first_name or ''} {r.last_name or ''}".strip()
-                matches.append({
-                    "source_file": name,
-                    "text_chunk": f"{name} - {r.current_title or ''} - {r.location or ''}".strip(" -"),
-                    "score": float(r.score)
-                })
-
-            return matches
-
         except Exception as e:
             logger.error(f"RAG retrieval error: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    async def retrieve_by_embedding(
+        self,
+        query_embedding,
+        k: int = 5,
+        recall: str = "balanced",
+        filters=None,
+        min_score: float = 0.0,
+    ):
+        from sqlalchemy import text as sql_text
+        from db.session import async_session_maker
+
+        sql, params = build_retrieval_query(filters, min_score)
+        # Only structured filters make widening worthwhile; with a score
+        # threshold alone, fewer than k rows above the cutoff is the answer
+        selective = bool(set(params) - {"max_distance"})
+        params.update({
+            "query_embedding": "[" + ",".join(str(float(v)) for v in query_embedding) + "]",
+            "limit": k,
+        })
+        sql = sql_text(sql)
+
+        async with async_session_maker() as session:
+            # HNSW applies WHERE clauses after walking ef_search neighbours,
+            # so selective filters can leave fewer than k rows. Widen the
+            # walk until k rows come back, then fall back to an exact scan
+            # if the filtered set is small enough to scan.
+            ef_search = ef_search_for(recall, k)
+            while True:
+                # SET LOCAL scopes the knob to this query's transaction
+                await session.execute(sql_text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+                rows = (await session.execute(sql, params)).fetchall()
+
+                if len(rows) >= k or not selective or ef_search >= MAX_EF_SEARCH:
+                    break
+                ef_search = min(ef_search * 2, MAX_EF_SEARCH)
+
+            if len(rows) < k and selective:
+                count_sql, count_params = build_filtered_count_query(filters)
+                filtered = (await session.execute(sql_text(count_sql), count_params)).scalar() or 0
+                if filtered <= EXACT_SCAN_MAX_ROWS:
+                    await session.execute(sql_text("SET LOCAL enable_indexscan = off"))
+                    rows = (await session.execute(sql, params)).fetchall()
+
+        matches = []
+        for r in rows:
+            name = f"{r.first_name or ''} {r.last_name or ''}".strip()
+            matches.append({
+                "source_file": name,
+                "text_chunk": f"{name} - {r.current_title or ''} - {r.location or ''}".strip(" -"),
+                "score": float(r.score)
+            })
+
+        return matches
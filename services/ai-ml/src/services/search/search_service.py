@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import time
 from typing import List
 
@@ -10,6 +12,8 @@ from schemas.search import (
 )
 from services.rag.retriever import RAGRetriever
 
+logger = logging.getLogger(__name__)
+
 MAX_BATCH_SIZE = 10
 
 
@@ -18,54 +22,103 @@ class SearchService:
     def __init__(self):
         self.retriever = RAGRetriever()
 
+    async def _embed_queries(self, queries: List[dict]) -> List:
+        """
+        One batched embedding call for every query that arrived as text;
+        queries that came with their own vector are passed through.
+        """
+        texts = list(dict.fromkeys(
+            q["query_text"] for q in queries
+            if q["query_embedding"] is None and q["query_text"] and q["query_text"].strip()
+        ))
+
+        embedded = {}
+        if texts:
+            try:
+                vectors = await self.retriever.embedder.get_embeddings_async(texts)
+                embedded = dict(zip(texts, vectors))
+            except Exception as e:
+                logger.error(f"Search embedding error: {e}")
+
+        return [
+            q["query_embedding"] if q["query_embedding"] is not None else embedded.get(q["query_text"])
+            for q in queries
+        ]
+
+    async def _retrieve(self, embedding, request: SearchRequest):
+        if not embedding:
+            return []
+
+        try:
+            return await self.retriever.retrieve_by_embedding(
+                embedding,
+                k=request.top_k,
+                recall=request.recall,
+                filters=request.filters,
+                min_score=request.min_score,
+            )
+        except Exception as e:
+            logger.error(f"RAG retrieval error: {e}")
+            return []
+
     async def search(self, request: SearchRequest) -> SearchResponse:
         start_time = time.time()
 
         queries = []
 
-        if request.query_text:
-            queries.append({"query_text": request.query_text})
+        if request.query_text or request.query_embedding:
+            queries.append({
+                "query_text": request.query_text,
+                "query_embedding": request.query_embedding,
+            })
 
         if request.batch:
             if len(request.batch) > MAX_BATCH_SIZE:
                 raise ValueError("Batch size cannot exceed 10")
             for q in request.batch:
-                queries.append({"query_text": q.query_text})
+                queries.append({
+                    "query_text": q.query_text,
+                    "query_embedding": q.query_embedding,
+                })
 
         if not queries:
             raise ValueError("No valid query provided")
 
-        results: List[SearchResult] = []
+        embeddings = await self._embed_queries(queries)
+        embedded_at = time.time()
 
-        for idx, q in enumerate(queries):
-            matches = await self.retriever.retrieve_top_k(
-                q["query_text"],
-                k=request.top_k
-            )
+        # Each kNN query checks out its own pooled connection, so the batch
+        # costs roughly one query's latency rather than N.
+        all_matches = await asyncio.gather(
+            *(self._retrieve(embedding, request) for embedding in embeddings)
+        )
+        retrieved_at = time.time()
 
-            filtered = []
-            for m in matches:
-                if m["score"] >= request.min_score:
-                    filtered.append(
-                        SearchMatch(
-                            source_file=m["source_file"],
-                            text_chunk=m["text_chunk"],
-                            score=m["score"]
-                        )
-                    )
+        results: List[SearchResult] = []
+
+        for idx, matches in enumerate(all_matches):
+            search_matches = [
+                SearchMatch(
+                    source_file=m["source_file"],
+                    text_chunk=m["text_chunk"],
+                    score=m["score"]
+                )
+                for m in matches
+            ]
 
             results.append(
                 SearchResult(
                     query_index=idx,
-                    matches=filtered
+                    matches=search_matches
                 )
             )
 
-        total_time = (time.time() - start_time) * 1000
-
         return SearchResponse(
             results=results,
             metrics=SearchMetrics(
-                processing_time_ms=total_time
+                processing_time_ms=(retrieved_at - start_time) * 1000,
+                embedding_time_ms=(embedded_at - start_time) * 1000,
+                retrieval_time_ms=(retrieved_at - embedded_at) * 1000,
+                query_count=len(queries),
             )
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from core import warmup
+from core.lazy import Lazy
+
+
+class Expensive:
+    instances = 0
+
+    def __init__(self):
+        Expensive.instances += 1
+        self.value = 42
+
+    def double(self):
+        return self.value * 2
+
+
+def test_lazy_builds_once_on_first_use():
+    Expensive.instances = 0
+    proxy = Lazy(Expensive)
+
+    assert not proxy.loaded
+    assert Expensive.instances == 0
+    assert proxy.double() == 84
+    assert proxy.value == 42
+    assert Expensive.instances == 1
+    assert proxy.get() is proxy.get()
+
+
+def test_readiness_waits_for_required_hooks(monkeypatch):
+    monkeypatch.setattr(warmup, "_hooks", [])
+    monkeypatch.setattr(warmup, "_state", {"started": False, "completed": False, "timings_ms": {}, "errors": {}})
+
+    def broken():
+        raise RuntimeError("missing csv")
+
+    warmup.register_warmup("model", lambda: None)
+    warmup.register_warmup("optional", broken, required=False)
+
+    assert not warmup.is_ready()
+
+    report = asyncio.run(warmup.run_warmup())
+
+    assert report["ready"]
+    assert set(report["timings_ms"]) == {"model", "optional"}
+    assert report["errors"] == {"optional": "missing csv"}
+
+
+def test_failed_required_hook_blocks_readiness(monkeypatch):
+    monkeypatch.setattr(warmup, "_hooks", [])
+    monkeypatch.setattr(warmup, "_state", {"started": False, "completed": False, "timings_ms": {}, "errors": {}})
+
+    def broken():
+        raise RuntimeError("no model")
+
+    warmup.register_warmup("model", broken)
+
+    assert not asyncio.run(warmup.run_warmup())["ready"]
@@ -0,0 +1,63 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from services.embeddings.engine import EmbeddingEngine
+
+
+class RecordingClient:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.threads = set()
+        self.fail = fail
+
+    def embed_batch(self, texts):
+        self.threads.add(threading.current_thread().name)
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model exploded")
+        return [[float(len(t))] for t in texts]
+
+
+def test_concurrent_requests_are_coalesced():
+    client = RecordingClient()
+    engine = EmbeddingEngine(client, max_batch_size=8, max_wait_ms=50)
+
+    async def scenario():
+        results = await asyncio.gather(*(engine.embed("x" * i) for i in range(1, 21)))
+        await engine.stop()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert results == [[float(i)] for i in range(1, 21)]
+    assert [len(b) for b in client.batches] == [8, 8, 4]
+    assert all(name.startswith("embedding-engine") for name in client.threads)
+    assert engine.stats()["items"] == 20
+
+
+def test_batch_failure_is_propagated_to_every_caller():
+    engine = EmbeddingEngine(RecordingClient(fail=True), max_wait_ms=1)
+
+    async def scenario():
+        results = await asyncio.gather(engine.embed("a"), engine.embed("b"), return_exceptions=True)
+        await engine.stop()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_empty_text_is_rejected():
+    engine = EmbeddingEngine(RecordingClient())
+
+    with pytest.raises(ValueError):
+        asyncio.run(engine.embed(""))
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from services.embeddings.cache import AsyncEmbeddingCache, EmbeddingCache, MemoryLRU
+from services.embeddings.codec import decode_embedding, encode_embedding
+
+UNREACHABLE_REDIS = "redis://127.0.0.1:1/0"
+
+
+def test_float32_round_trip_is_exact():
+    vector = np.random.default_rng(0).normal(size=768).astype(np.float32)
+
+    encoded = encode_embedding(vector)
+
+    assert len(encoded) == 5 + 768 * 4
+    np.testing.assert_array_equal(decode_embedding(encoded), vector)
+
+
+def test_float16_halves_payload():
+    vector = np.linspace(-1, 1, 768, dtype=np.float32)
+
+    encoded = encode_embedding(vector, dtype="float16")
+
+    assert len(encoded) == 5 + 768 * 2
+    decoded = decode_embedding(encoded)
+    assert decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, vector, atol=1e-3)
+
+
+def test_legacy_json_entries_still_decode():
+    legacy = json.dumps([0.1, 0.2, 0.3])
+
+    np.testing.assert_allclose(decode_embedding(legacy), [0.1, 0.2, 0.3], rtol=1e-6)
+    np.testing.assert_allclose(decode_embedding(legacy.encode()), [0.1, 0.2, 0.3], rtol=1e-6)
+
+
+def test_unknown_version_is_rejected():
+    with pytest.raises(ValueError):
+        decode_embedding(b"EMB\x09f" + b"\x00" * 4)
+
+
+def test_memory_fallback_holds_numpy_arrays():
+    cache = EmbeddingCache(redis_url=UNREACHABLE_REDIS)
+    assert not cache.use_redis
+
+    cache.set("python developer", [1.0, 2.0, 3.0])
+
+    cached = cache.get("python developer")
+    assert isinstance(cached, np.ndarray)
+    assert cached.dtype == np.float32
+    assert set(cache.get_many(["python developer", "missing"])) == {"python developer"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        return self.store.get(key)
+
+    def mget(self, keys):
+        self.calls += 1
+        return [self.store.get(k) for k in keys]
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+
+    def execute(self):
+        self.client.calls += 1
+        for key, ttl, value in self.commands:
+            self.client.setex(key, ttl, value)
+
+
+def test_lru_evicts_least_recently_used_within_byte_budget():
+    vector = np.zeros(100, dtype=np.float32)
+    entry_size = MemoryLRU._entry_size(vector)
+    lru = MemoryLRU(max_bytes=entry_size * 2)
+
+    lru.set("a", vector)
+    lru.set("b", vector)
+    assert lru.get("a") is not None
+    lru.set("c", vector)
+
+    assert lru.get("b") is None
+    assert lru.get("a") is not None
+    assert lru.current_bytes <= lru.max_bytes
+    assert lru.stats()["evictions"] == 1
+    assert lru.stats()["hits"] == 2
+    assert lru.stats()["misses"] == 1
+
+
+def test_lru_expires_entries_after_ttl():
+    clock = FakeClock()
+    lru = MemoryLRU(max_bytes=10_000, ttl_seconds=10, clock=clock)
+
+    lru.set("a", np.zeros(4, dtype=np.float32))
+    clock.now = 9
+    assert "a" in lru
+    clock.now = 10
+    assert lru.get("a") is None
+    assert len(lru) == 0
+    assert lru.current_bytes == 0
+    assert lru.stats()["expirations"] == 1
+
+
+def test_two_tier_serves_hot_texts_from_l1():
+    cache = EmbeddingCache(redis_url=UNREACHABLE_REDIS)
+    cache.client = FakeRedis()
+    cache.use_redis = True
+    cache.two_tier = True
+
+    cache.client.setex(cache._hash_text("job description"), 60, encode_embedding([1.0, 2.0]))
+
+    assert cache.get("job description") is not None
+    assert cache.get_many(["job description"])
+    assert cache.get("job description") is not None
+    assert cache.client.calls == 1
+
+
+def test_set_many_uses_one_pipelined_round_trip():
+    cache = EmbeddingCache(redis_url=UNREACHABLE_REDIS)
+    cache.client = FakeRedis()
+    cache.use_redis = True
+
+    cache.set_many({"a": [1.0], "b": [2.0], "c": [3.0]})
+
+    assert cache.client.calls == 1
+    assert len(cache.client.store) == 3
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "b", "c"}
+
+
+def test_async_cache_falls_back_to_memory():
+    async def scenario():
+        cache = AsyncEmbeddingCache(redis_url=UNREACHABLE_REDIS)
+        await cache.set_many({"a": [1.0, 2.0], "b": [3.0, 4.0]})
+        single = await cache.get("a")
+        many = await cache.get_many(["a", "b", "c"])
+        return cache, single, many
+
+    cache, single, many = asyncio.run(scenario())
+
+    assert cache.use_redis is False
+    np.testing.assert_array_equal(single, [1.0, 2.0])
+    assert set(many) == {"a", "b"}
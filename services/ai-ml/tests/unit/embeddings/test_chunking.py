@@ -0,0 +1,41 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from services.embeddings.chunking import pool_embeddings, split_by_tokens
+
+
+def test_short_text_is_a_single_chunk():
+    assert split_by_tokens("  Senior Python developer  ", chunk_tokens=10, overlap_tokens=0) == ["Senior Python developer"]
+
+
+def test_long_text_is_split_with_overlap():
+    words = [f"w{i}" for i in range(25)]
+
+    chunks = split_by_tokens(" ".join(words), chunk_tokens=10, overlap_tokens=2)
+
+    assert [c.split() for c in chunks] == [words[0:10], words[8:18], words[16:25]]
+
+
+def test_max_chunks_caps_work():
+    text = " ".join(f"w{i}" for i in range(1000))
+
+    assert len(split_by_tokens(text, chunk_tokens=10, overlap_tokens=0, max_chunks=3)) == 3
+
+
+def test_invalid_overlap_is_rejected():
+    with pytest.raises(ValueError):
+        split_by_tokens("a b c", chunk_tokens=4, overlap_tokens=4)
+
+
+def test_pooled_vector_is_unit_length_and_weighted():
+    pooled = pool_embeddings([[1.0, 0.0], [0.0, 1.0]], weights=[3, 1])
+
+    assert np.isclose(np.linalg.norm(pooled), 1.0)
+    assert pooled[0] > pooled[1]
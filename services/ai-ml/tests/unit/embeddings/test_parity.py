@@ -0,0 +1,33 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from services.embeddings.parity import cosine_drift
+
+
+def test_identical_vectors_have_no_drift():
+    vectors = np.random.default_rng(0).normal(size=(4, 8))
+
+    report = cosine_drift(vectors, vectors)
+
+    assert report["count"] == 4
+    assert report["min_cosine"] == pytest.approx(1.0, abs=1e-6)
+    assert report["max_drift"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_drift_reports_worst_row():
+    report = cosine_drift([[1.0, 0.0], [1.0, 0.0]], [[1.0, 0.0], [0.0, 1.0]])
+
+    assert report["min_cosine"] == pytest.approx(0.0)
+    assert report["mean_cosine"] == pytest.approx(0.5)
+
+
+def test_shape_mismatch_is_rejected():
+    with pytest.raises(ValueError):
+        cosine_drift([[1.0, 0.0]], [[1.0, 0.0, 0.0]])
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from google.genai import errors as genai_errors
+
+import services.llm.gemini_llm_client as gemini_module
+from services.llm.gemini_llm_client import GeminiLLMClient
+from services.llm.governor import LLMGovernor, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock)  # one token per second
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == 1.0
+    assert bucket.reserve(1) == 2.0
+
+    clock.now = 10.0
+    assert bucket.reserve(1) == 0.0
+
+
+def test_governor_caps_in_flight_calls():
+    governor = LLMGovernor(max_concurrency=2, rpm_limit=0, tpm_limit=0)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with governor.slot(10):
+            peak = max(peak, governor.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(scenario())
+
+    assert peak == 2
+    assert governor.in_flight == 0
+
+
+class FlakyModels:
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def generate_content(self, **kwargs):
+        self.calls += 1
+        if self.failures:
+            raise genai_errors.APIError(self.failures.pop(0), {"error": {"message": "busy"}})
+        usage = SimpleNamespace(prompt_token_count=10, candidates_token_count=5, total_token_count=15)
+        return SimpleNamespace(text='{"ok": true}', usage_metadata=usage)
+
+
+def _client(models) -> GeminiLLMClient:
+    client = GeminiLLMClient.__new__(GeminiLLMClient)
+    client.model_name = "test"
+    client.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    return client
+
+
+def test_async_call_retries_rate_limits(monkeypatch):
+    monkeypatch.setattr(gemini_module, "backoff_delay", lambda attempt: 0)
+    monkeypatch.setattr(gemini_module, "get_governor", lambda: LLMGovernor(2, 0, 0))
+    models = FlakyModels([429, 503])
+
+    result = asyncio.run(_client(models).generate_json_async("prompt"))
+
+    assert result == {"ok": True}
+    assert models.calls == 3
+
+
+def test_async_call_does_not_retry_client_errors(monkeypatch):
+    monkeypatch.setattr(gemini_module, "get_governor", lambda: LLMGovernor(2, 0, 0))
+    models = FlakyModels([400])
+
+    with pytest.raises(genai_errors.APIError) as exc_info:
+        asyncio.run(_client(models).generate_json_async("prompt"))
+
+    assert exc_info.value.code == 400
+
+    assert models.calls == 1
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from services.llm import structure_cache
+from services.llm.structure_cache import StructureCache, structure_cache_key
+
+UNREACHABLE_REDIS = "redis://127.0.0.1:1/0"
+
+
+def test_key_ignores_whitespace_but_not_versions():
+    text = "Jane Doe\nPython developer\n\nSkills: Python, SQL"
+    reflowed = "  Jane Doe Python   developer\r\nSkills: Python, SQL  "
+
+    key = structure_cache_key(text, "1", "abc")
+
+    assert key == structure_cache_key(reflowed, "1", "abc")
+    assert key != structure_cache_key(text, "2", "abc")
+    assert key != structure_cache_key(text, "1", "abd")
+    assert key != structure_cache_key(text + " Go", "1", "abc")
+
+
+def test_disk_fallback_round_trip_and_metrics(tmp_path):
+    cache = StructureCache(redis_url=UNREACHABLE_REDIS, cache_dir=str(tmp_path))
+    key = structure_cache_key("resume text", "1", "abc")
+    value = {"source_file": "r1", "structured_data": {"full_name": "Jane Doe"}}
+
+    async def scenario():
+        missed = await cache.get(key)
+        await cache.set(key, value)
+        return missed, await cache.get(key)
+
+    missed, hit = asyncio.run(scenario())
+
+    assert missed is None
+    assert hit == value
+    stats = cache.stats()
+    assert stats["backend"] == "disk"
+    assert (stats["disk_hits"], stats["misses"], stats["writes"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_expired_disk_entries_are_not_served(tmp_path):
+    cache = StructureCache(redis_url=UNREACHABLE_REDIS, cache_dir=str(tmp_path), ttl_seconds=60)
+    fresh = structure_cache_key("fresh resume", "1", "abc")
+    stale = structure_cache_key("stale resume", "1", "abc")
+
+    async def scenario():
+        await cache.set(stale, {"source_file": "old"})
+        old = time.time() - 3600
+        os.utime(cache._path(stale), (old, old))
+        cache._swept_at = 0.0
+        await cache.set(fresh, {"source_file": "new"})
+        return await cache.get(stale), await cache.get(fresh)
+
+    stale_hit, fresh_hit = asyncio.run(scenario())
+
+    assert stale_hit is None
+    assert fresh_hit == {"source_file": "new"}
+    assert not cache._path(stale).exists()
+
+
+def test_redis_is_reprobed_after_an_outage(tmp_path, monkeypatch):
+    cache = StructureCache(redis_url=UNREACHABLE_REDIS, cache_dir=str(tmp_path))
+    pings = []
+
+    async def ping():
+        pings.append(1)
+        if len(pings) == 1:
+            raise ConnectionError("down")
+        return True
+
+    monkeypatch.setattr(cache.client, "ping", ping)
+    monkeypatch.setattr(structure_cache, "REDIS_REPROBE_SECONDS", 0)
+
+    async def scenario():
+        return await cache._connect(), await cache._connect()
+
+    assert asyncio.run(scenario()) == (False, True)
+    assert cache.stats()["backend"] == "redis"
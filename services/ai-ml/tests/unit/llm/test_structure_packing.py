@@ -0,0 +1,116 @@
+import asyncio
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+import api.v1.structure as structure
+from api.v1.structure import BatchStructureItem, _plan_packs
+
+
+def _item(resume_id: str, chars: int) -> BatchStructureItem:
+    return BatchStructureItem(resume_id=resume_id, raw_text="x" * chars)
+
+
+def test_short_resumes_are_packed_and_long_ones_go_alone(monkeypatch):
+    monkeypatch.setattr(structure, "PACK_MAX_RESUME_CHARS", 1000)
+    monkeypatch.setattr(structure, "PACK_MAX_CHARS", 2500)
+    monkeypatch.setattr(structure, "PACK_MAX_ITEMS", 3)
+    items = [_item("a", 800), _item("b", 5000), _item("c", 800), _item("d", 800), _item("e", 300)]
+
+    groups = _plan_packs(items, [0, 1, 2, 3, 4])
+
+    assert groups == [[1], [0, 2, 3], [4]]
+
+
+class FakeLLM:
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    async def generate_json_async(self, prompt):
+        self.prompts.append(prompt)
+        return self.response
+
+    def consume_session_cost(self):
+        return {"input_tokens": 0, "output_tokens": 0, "total_cost_usd": 0.0}
+
+
+class FakeCache:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value):
+        self.store[key] = value
+
+
+def _run_packed(monkeypatch, response):
+    llm = FakeLLM(response)
+    fallbacks = []
+
+    async def fake_uncached(resume_id, raw_text):
+        fallbacks.append(resume_id)
+        return {"source_file": resume_id, "structured_data": {}, "_pipeline_info": {"llm_path": "llm_primary"}}
+
+    monkeypatch.setattr(structure, "llm", llm)
+    monkeypatch.setattr(structure, "structure_cache", FakeCache())
+    monkeypatch.setattr(structure, "_structure_uncached", fake_uncached)
+
+    items = [
+        BatchStructureItem(resume_id="r1", raw_text="Jane Doe\njane@example.com\nPython developer"),
+        BatchStructureItem(resume_id="r2", raw_text="John Roe\njohn@example.com\nJava developer"),
+    ]
+    results = asyncio.run(structure._structure_packed(items))
+    return llm, fallbacks, results
+
+
+def test_packed_response_is_split_per_resume(monkeypatch):
+    llm, fallbacks, results = _run_packed(monkeypatch, {"results": [
+        {"resume_index": 2, "data": {"full_name": "John Roe", "skills": ["Java"]}},
+        {"resume_index": "1", "data": {"full_name": "Jane Doe", "skills": ["Python"]}},
+    ]})
+
+    assert len(llm.prompts) == 1
+    assert "=== RESUME 2 ===" in llm.prompts[0]
+    assert fallbacks == []
+    assert [r["source_file"] for r in results] == ["r1", "r2"]
+    assert all(r["_pipeline_info"]["packed_with"] == 2 for r in results)
+
+
+def test_missing_entries_fall_back_to_per_item_calls(monkeypatch):
+    _, fallbacks, results = _run_packed(monkeypatch, {"results": [
+        {"resume_index": 1, "data": {"full_name": "Jane Doe", "skills": ["Python"]}},
+    ]})
+
+    assert fallbacks == ["r2"]
+    assert results[0]["_pipeline_info"]["packed_with"] == 2
+
+
+def test_unparseable_pack_falls_back_for_every_resume(monkeypatch):
+    _, fallbacks, _ = _run_packed(monkeypatch, {})
+
+    assert fallbacks == ["r1", "r2"]
+
+
+def test_swapped_entries_fall_back_instead_of_crossing_resumes(monkeypatch):
+    _, fallbacks, results = _run_packed(monkeypatch, {"results": [
+        {"resume_index": 1, "data": {"full_name": "John Roe", "email": "john@example.com", "skills": ["Java"]}},
+        {"resume_index": 2, "data": {"full_name": "Jane Doe", "skills": ["Python"]}},
+    ]})
+
+    assert fallbacks == ["r1", "r2"]
+    assert [r["source_file"] for r in results] == ["r1", "r2"]
+
+
+def test_packed_entry_matches_checks_name_and_email():
+    raw_text = "DOE, Jane\nJane.Doe@Example.com\nPython developer"
+
+    assert structure._packed_entry_matches({"full_name": "Jane Doe", "email": "jane.doe@example.com"}, raw_text)
+    assert structure._packed_entry_matches({"skills": ["Python"]}, raw_text)
+    assert not structure._packed_entry_matches({"full_name": "John Roe"}, raw_text)
+    assert not structure._packed_entry_matches({"full_name": "Jane Doe", "email": "john@example.com"}, raw_text)
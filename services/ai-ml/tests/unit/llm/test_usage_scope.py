@@ -0,0 +1,51 @@
+import asyncio
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from services.llm.usage import LLM_CALLS, current_usage, llm_usage_scope, record_llm_call
+
+
+def test_concurrent_scopes_do_not_share_totals():
+    async def structure(resume_id, calls):
+        with llm_usage_scope("test_structure", item_id=resume_id) as usage:
+            for _ in range(calls):
+                await asyncio.sleep(0)
+                record_llm_call(100, 10, 0.001, 0.5)
+            return resume_id, usage.calls, usage.consume()
+
+    async def scenario():
+        with llm_usage_scope("test_batch") as batch:
+            results = await asyncio.gather(structure("a", 1), structure("b", 3))
+        return batch, results
+
+    batch, results = asyncio.run(scenario())
+
+    assert results[0] == ("a", 1, {"input_tokens": 100, "output_tokens": 10, "total_cost_usd": 0.001})
+    assert results[1] == ("b", 3, {"input_tokens": 300, "output_tokens": 30, "total_cost_usd": 0.003})
+    assert (batch.calls, batch.input_tokens, batch.llm_seconds) == (4, 400, 2.0)
+    assert current_usage() is None
+
+
+def test_consume_returns_delta_and_scope_exports_histogram():
+    before = LLM_CALLS.labels(endpoint="test_delta")._sum.get()
+
+    with llm_usage_scope("test_delta") as usage:
+        record_llm_call(50, 5, 0.002, 1.0)
+        assert usage.consume()["input_tokens"] == 50
+        record_llm_call(20, 2, 0.001, 1.0)
+        assert usage.consume() == {"input_tokens": 20, "output_tokens": 2, "total_cost_usd": 0.001}
+
+    assert LLM_CALLS.labels(endpoint="test_delta")._sum.get() - before == 2
+
+
+def test_calls_outside_a_scope_are_not_attributed():
+    record_llm_call(100, 10, 0.001, 0.5)
+
+    with llm_usage_scope("test_outside") as usage:
+        pass
+
+    assert usage.calls == 0
@@ -0,0 +1,63 @@
+import os
+import re
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from services.parsers import esco_matcher
+from services.parsers.vocabulary_matcher import VocabularyMatcher
+
+
+SAMPLE_TEXT = """
+Senior SAP ABAP developer. 8 yrs of S/4HANA, SAP Fiori & SAPUI5, plus some
+Node.js, C++ and C#. Built CI/CD with GitHub Actions, Docker and k8s;
+machine-learning side projects in Python (PyTorch, scikit-learn).
+Spring Boot microservices on AWS Lambda; REST APIs; PostgreSQL / Redis.
+"""
+
+
+def _ngram_scan(text, vocabulary, max_n=5):
+    # Previous implementation: intersect every 1..max_n word n-gram with the vocabulary
+    words = [w for w in re.split(r"[^a-z0-9]+", esco_matcher._normalise(text)) if w]
+    ngrams = {" ".join(words[i:i + n]) for i in range(len(words)) for n in range(1, max_n + 1) if i + n <= len(words)}
+    seen, results = set(), []
+    for key, canonical in vocabulary.items():
+        if key in ngrams and canonical.lower() not in seen:
+            seen.add(canonical.lower())
+            results.append(canonical)
+    return results
+
+
+def test_esco_matches_equal_ngram_scan():
+    expected = _ngram_scan(SAMPLE_TEXT, esco_matcher._NORM_TO_CANONICAL)
+
+    assert expected
+    assert [m.value for m in esco_matcher.match_esco_skills(SAMPLE_TEXT)] == expected
+
+
+def test_requires_whole_consecutive_words():
+    matcher = VocabularyMatcher.from_terms(["Java", "Spring Boot", "C++"])
+
+    assert matcher.find_all("JavaScript and Spring-boot") == ["Spring Boot"]
+    assert matcher.find_all("spring and boot, java") == ["Java"]
+    assert matcher.find_all("c++ / c") == ["C++"]
+
+
+def test_results_follow_insertion_order_and_first_key_wins():
+    matcher = VocabularyMatcher()
+    matcher.add("docker", "Docker")
+    matcher.add("k8s", "Kubernetes")
+    assert matcher.add("docker", "Docker Engine") is False
+
+    assert matcher.find_all("k8s then docker then k8s") == ["Docker", "Kubernetes"]
+
+
+def test_skips_keys_that_cannot_match():
+    matcher = VocabularyMatcher(max_tokens=2)
+
+    assert matcher.add("one two three", "x") is False
+    assert matcher.add("node.js", "Node.js") is False
+    assert matcher.add("", "empty") is False
+    assert len(matcher) == 0
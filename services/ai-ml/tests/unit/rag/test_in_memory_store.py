@@ -0,0 +1,76 @@
+import os
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from services.rag.in_memory_store import InMemoryVectorStore
+
+
+def _brute_force(vectors, query, top_k):
+    scores = []
+    for i, v in enumerate(vectors):
+        denom = np.linalg.norm(v) * np.linalg.norm(query)
+        scores.append((0.0 if denom == 0 else float(np.dot(v, query) / denom), i))
+    scores.sort(key=lambda x: x[0], reverse=True)
+    return [i for _, i in scores[:top_k]]
+
+
+def test_search_matches_brute_force():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 16))
+    store = InMemoryVectorStore(initial_capacity=8)
+    for i, v in enumerate(vectors):
+        store.add(f"file_{i}", f"chunk {i}", v.tolist())
+
+    query = rng.normal(size=16)
+    results = store.search(query.tolist(), top_k=5)
+
+    assert [r["text_chunk"] for r in results] == [
+        f"chunk {i}" for i in _brute_force(vectors, query, 5)
+    ]
+    assert results[0]["score"] >= results[-1]["score"]
+
+
+def test_search_batch_returns_one_list_per_query():
+    store = InMemoryVectorStore()
+    store.add_many(["a", "b", "c"], ["x", "y", "z"], np.eye(3))
+
+    results = store.search_batch(np.eye(3)[::-1], top_k=2)
+
+    assert len(results) == 3
+    assert [r[0]["source_file"] for r in results] == ["c", "b", "a"]
+    assert all(len(r) == 2 for r in results)
+
+
+def test_delete_moves_last_row_and_keeps_ids_valid():
+    store = InMemoryVectorStore()
+    ids = store.add_many(["a", "b", "c"], ["x", "y", "z"], np.eye(3))
+
+    assert store.delete(ids[0])
+    assert not store.delete(ids[0])
+    assert len(store) == 2
+
+    assert store.search([0, 0, 1], top_k=1)[0]["source_file"] == "c"
+    assert store.delete(ids[2])
+    assert [r["source_file"] for r in store.search([0, 1, 0], top_k=5)] == ["b"]
+
+
+def test_delete_source_and_empty_search():
+    store = InMemoryVectorStore()
+    store.add_many(["a", "a", "b"], ["x", "y", "z"], np.eye(3))
+
+    assert store.delete_source("a") == 2
+    assert store.delete_source("b") == 1
+    assert store.search([1, 0, 0]) == []
+
+
+def test_zero_vectors_score_zero():
+    store = InMemoryVectorStore()
+    store.add("a", "x", [0.0, 0.0])
+
+    assert store.search([1.0, 0.0])[0]["score"] == 0.0
+    assert store.search([0.0, 0.0])[0]["score"] == 0.0
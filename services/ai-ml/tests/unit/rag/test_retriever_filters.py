@@ -0,0 +1,153 @@
+import asyncio
+import os
+import sys
+import types
+from collections import namedtuple
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from schemas.search import SearchFilters
+from services.rag.retriever import (
+    EXACT_SCAN_MAX_ROWS,
+    MAX_EF_SEARCH,
+    RAGRetriever,
+    build_filtered_count_query,
+    build_retrieval_query,
+)
+
+
+Row = namedtuple("Row", "id first_name last_name current_title location score")
+
+
+def test_no_filters_is_plain_knn():
+    sql, params = build_retrieval_query()
+
+    assert "WHERE embedding IS NOT NULL ORDER BY" in sql
+    assert params == {}
+
+
+def test_filters_and_threshold_go_into_where_clause():
+    filters = SearchFilters(
+        status="active",
+        location="Berlin",
+        experience_level="senior",
+        skills=["Python", " ", "AWS"],
+        min_years=5,
+    )
+
+    sql, params = build_retrieval_query(filters, min_score=0.6)
+
+    for clause in (
+        "status = :status",
+        "location ILIKE :location",
+        "experience_level = :experience_level",
+        "skills && CAST(:skills AS varchar[])",
+        "years_of_experience >= :min_years",
+        "<= :max_distance",
+    ):
+        assert clause in sql
+
+    assert params["location"] == "%Berlin%"
+    assert params["skills"] == ["AWS", "Python", "aws", "python"]
+    assert abs(params["max_distance"] - 0.4) < 1e-9
+
+
+class _FakeSession:
+    """Returns ``rows_per_ef(ef_search)`` rows, or everything once index scans are off."""
+
+    def __init__(self, rows_per_ef, total_rows, filtered_rows=None):
+        self.rows_per_ef = rows_per_ef
+        self.total_rows = total_rows
+        self.filtered_rows = total_rows if filtered_rows is None else filtered_rows
+        self.ef_search = None
+        self.exact = False
+        self.ef_history = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        if sql.startswith("SET LOCAL hnsw.ef_search"):
+            self.ef_search = int(sql.rsplit("=", 1)[1])
+            self.ef_history.append(self.ef_search)
+            return None
+        if sql.startswith("SET LOCAL enable_indexscan"):
+            self.exact = True
+            return None
+        if sql.startswith("SELECT count(*)"):
+            return types.SimpleNamespace(scalar=lambda: min(self.filtered_rows, params["cap"]))
+
+        count = self.total_rows if self.exact else self.rows_per_ef(self.ef_search)
+        rows = [Row(i, "Jane", str(i), "Engineer", "Berlin", 0.9) for i in range(min(count, params["limit"]))]
+        return types.SimpleNamespace(fetchall=lambda: rows)
+
+
+def _retrieve(monkeypatch, session, **kwargs):
+    fake_db = types.ModuleType("db.session")
+    fake_db.async_session_maker = lambda: session
+    monkeypatch.setitem(sys.modules, "db.session", fake_db)
+    return asyncio.run(RAGRetriever().retrieve_by_embedding([0.1, 0.2], **kwargs))
+
+
+def test_selective_filter_widens_ef_search_until_k_rows(monkeypatch):
+    session = _FakeSession(rows_per_ef=lambda ef: ef // 40, total_rows=100)
+
+    matches = _retrieve(monkeypatch, session, k=5, filters=SearchFilters(status="active"))
+
+    assert len(matches) == 5
+    assert session.ef_history == [100, 200]
+    assert not session.exact
+
+
+def test_falls_back_to_exact_scan_when_widening_is_not_enough(monkeypatch):
+    session = _FakeSession(rows_per_ef=lambda ef: 1, total_rows=3)
+
+    matches = _retrieve(monkeypatch, session, k=5, filters=SearchFilters(min_years=10))
+
+    assert session.ef_history[-1] == MAX_EF_SEARCH
+    assert session.exact
+    assert len(matches) == 3
+
+
+def test_unfiltered_query_does_not_widen(monkeypatch):
+    session = _FakeSession(rows_per_ef=lambda ef: 2, total_rows=2)
+
+    matches = _retrieve(monkeypatch, session, k=5)
+
+    assert session.ef_history == [100]
+    assert not session.exact
+    assert len(matches) == 2
+
+
+def test_score_threshold_alone_does_not_widen_or_scan(monkeypatch):
+    session = _FakeSession(rows_per_ef=lambda ef: 2, total_rows=50)
+
+    matches = _retrieve(monkeypatch, session, k=5, min_score=0.7)
+
+    assert session.ef_history == [100]
+    assert not session.exact
+    assert len(matches) == 2
+
+
+def test_skips_exact_scan_when_filtered_set_is_large(monkeypatch):
+    session = _FakeSession(rows_per_ef=lambda ef: 1, total_rows=5, filtered_rows=EXACT_SCAN_MAX_ROWS * 10)
+
+    matches = _retrieve(monkeypatch, session, k=5, filters=SearchFilters(status="active"), min_score=0.9)
+
+    assert session.ef_history[-1] == MAX_EF_SEARCH
+    assert not session.exact
+    assert len(matches) == 1
+
+
+def test_filtered_count_query_is_capped():
+    sql, params = build_filtered_count_query(SearchFilters(status="active"), cap=100)
+
+    assert "status = :status" in sql
+    assert "<=>" not in sql
+    assert params == {"status": "active", "cap": 101}
@@ -0,0 +1,72 @@
+import asyncio
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from schemas.search import SearchQuery, SearchRequest
+from services.search.search_service import SearchService
+
+
+class _FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    async def get_embeddings_async(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class _FakeRetriever:
+    def __init__(self, delay=0.05):
+        self.embedder = _FakeEmbedder()
+        self.delay = delay
+        self.seen = []
+
+    async def retrieve_by_embedding(self, embedding, k=5, **kwargs):
+        self.seen.append(embedding)
+        await asyncio.sleep(self.delay)
+        return [{"source_file": f"cand-{embedding[0]:.0f}", "text_chunk": "", "score": 0.9}]
+
+
+def _service(retriever):
+    service = SearchService.__new__(SearchService)
+    service.retriever = retriever
+    return service
+
+
+def test_batch_embeds_once_and_retrieves_concurrently():
+    retriever = _FakeRetriever(delay=0.05)
+    request = SearchRequest(
+        query_text="python",
+        batch=[SearchQuery(query_text=q) for q in ("golang", "python", "rust engineer", "sql")],
+    )
+
+    start = time.perf_counter()
+    response = asyncio.run(_service(retriever).search(request))
+    elapsed = time.perf_counter() - start
+
+    assert retriever.embedder.calls == [["python", "golang", "rust engineer", "sql"]]
+    assert [r.query_index for r in response.results] == [0, 1, 2, 3, 4]
+    assert response.results[3].matches[0].source_file == "cand-13"
+    assert elapsed < 5 * 0.05
+
+    metrics = response.metrics
+    assert metrics.query_count == 5
+    assert metrics.retrieval_time_ms >= 50
+    assert metrics.processing_time_ms >= metrics.embedding_time_ms + metrics.retrieval_time_ms - 1
+
+
+def test_precomputed_embeddings_skip_the_embedder():
+    retriever = _FakeRetriever(delay=0)
+    request = SearchRequest(batch=[SearchQuery(query_embedding=[7.0, 0.0]), SearchQuery(query_text="  ")])
+
+    response = asyncio.run(_service(retriever).search(request))
+
+    assert retriever.embedder.calls == []
+    assert retriever.seen == [[7.0, 0.0]]
+    assert response.results[0].matches[0].source_file == "cand-7"
+    assert response.results[1].matches == []
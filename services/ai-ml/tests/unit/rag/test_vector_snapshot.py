@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(__file__, "../../../../.."))
+SRC_ROOT = os.path.join(PROJECT_ROOT, "ai-ml", "src")
+sys.path.insert(0, SRC_ROOT)
+
+from services.rag.load_vector_store import convert_json_to_snapshot, load_snapshot
+
+
+def _write_embeddings(json_dir):
+    json_dir.mkdir()
+    (json_dir / "a.json").write_text(json.dumps({
+        "source_file": "a.pdf",
+        "chunks": [
+            {"text_chunk": "python developer", "embedding": [1.0, 0.0, 0.0]},
+            {"text_chunk": "", "embedding": [0.0, 1.0, 0.0]},
+        ],
+    }), encoding="utf-8")
+    (json_dir / "b.json").write_text(json.dumps({
+        "source_file": "b.docx",
+        "chunks": [
+            {"text_chunk": "café manager", "embedding": [0.0, 2.0, 0.0]},
+            {"text_chunk": "accountant", "embedding": [0.0, 0.0, 3.0]},
+        ],
+    }), encoding="utf-8")
+
+
+def test_snapshot_round_trip(tmp_path):
+    _write_embeddings(tmp_path / "json")
+
+    count = convert_json_to_snapshot(tmp_path / "json", tmp_path / "snapshot")
+    store = load_snapshot(tmp_path / "snapshot")
+
+    assert count == 3
+    assert len(store) == 3
+    assert isinstance(store.matrix.base, np.memmap) or isinstance(store.matrix, np.memmap)
+
+    top = store.search([0.0, 1.0, 0.0], top_k=1)[0]
+    assert top == {"source_file": "b.docx", "text_chunk": "café manager", "score": 1.0}
+
+
+def test_snapshot_store_copies_on_write(tmp_path):
+    _write_embeddings(tmp_path / "json")
+    convert_json_to_snapshot(tmp_path / "json", tmp_path / "snapshot")
+    store = load_snapshot(tmp_path / "snapshot")
+
+    assert store.delete(0)
+    store.add("c.pdf", "auditor", [1.0, 1.0, 0.0])
+
+    assert [r["source_file"] for r in store.search([1.0, 0.0, 0.0], top_k=3)][0] == "c.pdf"
+    assert len(load_snapshot(tmp_path / "snapshot")) == 3
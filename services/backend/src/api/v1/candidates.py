@@ -643,12 +643,10 @@ async def match_candidate_to_requests(
     id: UUID,
     session: AsyncSession = Depends(get_db_session),
 ):
-    from src.services.ai_client import AIClient
+    from src.services.match_cache import cached_rag_match
     from src.db.models import StaffingRequest
     from sqlalchemy.orm import undefer as sa_undefer
 
-    ai_client = AIClient()
-
     candidate_result = await session.execute(
         select(Candidate)
         .options(sa_undefer(Candidate.resume_text))
@@ -694,7 +692,7 @@ async def match_candidate_to_requests(
     results = []
     for req in requests:
         try:
-            ai_result = await ai_client.rag_match(
+            ai_result = await cached_rag_match(
                 job_description=req.job_description,
                 structured_cv=cv,
             )
@@ -182,6 +182,9 @@ async def update_job(id: UUID, update_data: JobUpdate, repo: BaseRepository[Job]
     db_data = update_data.to_db_dict()
     if not db_data:
         raise HTTPException(status_code=400, detail="No valid fields to update")
+    if "description" in db_data:
+        # Recomputed from the new description on the next match
+        db_data["embedding"] = None
     updated = await repo.update(id, **db_data)
     await invalidate_jobs_cache()
     return updated
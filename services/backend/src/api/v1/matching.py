@@ -1,20 +1,30 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
 import asyncio
 
 import structlog
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import select, or_, func
+from sqlalchemy import select, or_, func, update
+from sqlalchemy.orm import undefer
 
 from src.db.session import async_session_maker
-from src.db.models import Candidate, ParsedResume, Job
+from src.db.models import Candidate, ParsedResume, Job, Resume
+from src.db.vector_index import ef_search_for, set_ef_search
 from src.services.ai_client import AIClient
+from src.services.match_cache import cached_rag_match
 
 logger = structlog.get_logger()
 router = APIRouter()
 ai_client = AIClient()
 
+# Job-to-candidates sends top_k * SHORTLIST_FACTOR resumes to the LLM, picked
+# from the top_k * SHORTLIST_FACTOR * SHORTLIST_POOL_FACTOR nearest by vector.
+SHORTLIST_FACTOR = 2
+SHORTLIST_POOL_FACTOR = 3
+SHORTLIST_SKILL_WEIGHT = 0.3
+
 
 class MatchByIdRequest(BaseModel):
     job_id: str = Field(...)
@@ -178,154 +188,159 @@ async def _get_job_title(session, job_id: str) -> Optional[str]:
     return None
 
 
-async def _find_best_parsed_resume(session, candidate) -> Optional[dict]:
-    if candidate.email:
-        result = await session.execute(
-            select(ParsedResume).where(ParsedResume.email == candidate.email)
-        )
-        pr = result.scalar_one_or_none()
-        if pr:
-            if pr.json_data and isinstance(pr.json_data, dict) and _cv_has_good_data(pr.json_data):
-                return pr.json_data
-            cv = _build_cv_from_parsed_resume(pr)
-            if _cv_has_good_data(cv):
-                return cv
-
-    if candidate.first_name and candidate.last_name:
-        result = await session.execute(
-            select(ParsedResume).where(
-                func.lower(ParsedResume.first_name) == candidate.first_name.lower(),
-                func.lower(ParsedResume.last_name) == candidate.last_name.lower(),
-            )
-        )
-        pr = result.scalar_one_or_none()
-        if pr:
-            if pr.json_data and isinstance(pr.json_data, dict) and _cv_has_good_data(pr.json_data):
-                return pr.json_data
-            cv = _build_cv_from_parsed_resume(pr)
-            if _cv_has_good_data(cv):
-                return cv
-
-    if candidate.first_name:
-        result = await session.execute(
-            select(ParsedResume).where(
-                func.lower(ParsedResume.first_name) == candidate.first_name.lower()
-            )
-        )
-        prs = result.scalars().all()
-        for pr in prs:
-            if pr.json_data and isinstance(pr.json_data, dict) and _cv_has_good_data(pr.json_data):
-                return pr.json_data
-            cv = _build_cv_from_parsed_resume(pr)
-            if _cv_has_good_data(cv):
-                return cv
-
-    return None
-
-
-async def _get_structured_cv_for_parsed_resume(pr) -> dict:
+def _good_cv_from_parsed_resume(pr) -> Optional[dict]:
     if pr.json_data and isinstance(pr.json_data, dict) and _cv_has_good_data(pr.json_data):
         return pr.json_data
     cv = _build_cv_from_parsed_resume(pr)
     if _cv_has_good_data(cv):
         return cv
+    return None
+
+
+async def _get_structured_cv_for_parsed_resume(pr) -> dict:
+    cv = _good_cv_from_parsed_resume(pr)
+    if cv:
+        return cv
     if pr.json_data and isinstance(pr.json_data, dict):
         return pr.json_data
+    return _build_cv_from_parsed_resume(pr)
+
+
+def _full_name(row) -> str:
+    return f"{row.first_name or ''} {row.last_name or ''}".strip()
+
+
+def _cv_from_candidate(candidate, linked_resumes) -> dict:
+    """
+    Best CV for a Candidate row: a linked parsed resume (by email, then full
+    name, then first name), else the candidate's own json_data or columns.
+    """
+    first = (candidate.first_name or "").lower()
+    last = (candidate.last_name or "").lower()
+
+    by_email = [pr for pr in linked_resumes if candidate.email and pr.email == candidate.email]
+    by_first = [pr for pr in linked_resumes if first and (pr.first_name or "").lower() == first]
+    by_full = [pr for pr in by_first if last and (pr.last_name or "").lower() == last]
+
+    for group in (by_email, by_full, by_first):
+        for pr in group:
+            cv = _good_cv_from_parsed_resume(pr)
+            if cv:
+                return cv
+
+    if candidate.json_data and isinstance(candidate.json_data, dict) and _cv_has_good_data(candidate.json_data):
+        return candidate.json_data
+
+    cv = _build_cv_from_candidate(candidate)
+    if _cv_has_good_data(cv):
+        return cv
+
+    if candidate.json_data and isinstance(candidate.json_data, dict):
+        return candidate.json_data
     return cv
 
 
-async def _get_structured_cv_by_id(session, candidate_id: str) -> dict:
-    try:
-        uid = UUID(candidate_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid candidate ID")
+async def _resolve_structured_cvs(session, candidate_ids: List[str]) -> Dict[str, dict]:
+    """
+    Resolve many candidate IDs to structured CVs in at most three queries.
 
-    result = await session.execute(
-        select(ParsedResume).where(ParsedResume.id == uid)
+    An ID may be a ParsedResume id, a Resume id or a Candidate id, tried in
+    that order. Returns ``{id: {"structured_cv": ..., "candidate_name": ...}}``;
+    malformed IDs and IDs without usable resume data are left out.
+    """
+    uids: Dict[str, UUID] = {}
+    for cid in candidate_ids:
+        try:
+            uids[cid] = UUID(cid)
+        except (ValueError, TypeError, AttributeError):
+            continue
+
+    if not uids:
+        return {}
+
+    id_list = list(set(uids.values()))
+
+    pr_result = await session.execute(
+        select(ParsedResume).where(
+            or_(ParsedResume.id.in_(id_list), ParsedResume.resume_id.in_(id_list))
+        )
     )
-    parsed = result.scalar_one_or_none()
-    if parsed:
-        cv = await _get_structured_cv_for_parsed_resume(parsed)
-        if _cv_has_good_data(cv):
-            return cv
-
-    result2 = await session.execute(
-        select(ParsedResume).where(ParsedResume.resume_id == uid)
+    by_pr_id: Dict[UUID, Any] = {}
+    by_resume_id: Dict[UUID, Any] = {}
+    for pr in pr_result.scalars().all():
+        by_pr_id[pr.id] = pr
+        by_resume_id.setdefault(pr.resume_id, pr)
+
+    candidate_result = await session.execute(
+        select(Candidate)
+        .options(undefer(Candidate.resume_text))
+        .where(Candidate.id.in_(id_list))
     )
-    parsed2 = result2.scalar_one_or_none()
-    if parsed2:
-        cv = await _get_structured_cv_for_parsed_resume(parsed2)
-        if _cv_has_good_data(cv):
-            return cv
-
-    candidate = await session.get(Candidate, uid)
-    if candidate:
-        pr_cv = await _find_best_parsed_resume(session, candidate)
-        if pr_cv and _cv_has_good_data(pr_cv):
-            return pr_cv
-
-        if candidate.json_data and isinstance(candidate.json_data, dict) and _cv_has_good_data(candidate.json_data):
-            return candidate.json_data
-
-        cv = _build_cv_from_candidate(candidate)
-        if _cv_has_good_data(cv):
-            return cv
-
-        if candidate.json_data and isinstance(candidate.json_data, dict):
-            return candidate.json_data
-        return cv
+    candidates = {c.id: c for c in candidate_result.scalars().all()}
+
+    resolved: Dict[UUID, Optional[dict]] = {}
+    needs_lookup = []
+    for uid in id_list:
+        cv = None
+        for pr in (by_pr_id.get(uid), by_resume_id.get(uid)):
+            if pr is not None and cv is None:
+                cv = await _get_structured_cv_for_parsed_resume(pr)
+                if not _cv_has_good_data(cv):
+                    cv = None
+        resolved[uid] = cv
+        if cv is None and uid in candidates:
+            needs_lookup.append(candidates[uid])
+
+    if needs_lookup:
+        emails = {c.email for c in needs_lookup if c.email}
+        first_names = {c.first_name.lower() for c in needs_lookup if c.first_name}
+        conditions = []
+        if emails:
+            conditions.append(ParsedResume.email.in_(emails))
+        if first_names:
+            conditions.append(func.lower(ParsedResume.first_name).in_(first_names))
 
-    all_pr = await session.execute(select(ParsedResume).limit(50))
-    for pr in all_pr.scalars().all():
-        pr_name = f"{pr.first_name or ''} {pr.last_name or ''}".strip().lower()
-        if not pr_name:
-            continue
-        c_check = await session.get(Candidate, uid)
-        if not c_check:
+        linked_resumes = []
+        if conditions:
+            linked_result = await session.execute(select(ParsedResume).where(or_(*conditions)))
+            linked_resumes = list(linked_result.scalars().all())
+
+        for candidate in needs_lookup:
+            resolved[candidate.id] = _cv_from_candidate(candidate, linked_resumes)
+
+    results: Dict[str, dict] = {}
+    for cid, uid in uids.items():
+        cv = resolved.get(uid)
+        if cv is None:
             continue
-        c_name = f"{c_check.first_name or ''} {c_check.last_name or ''}".strip().lower()
-        if c_name and pr_name and (c_name in pr_name or pr_name in c_name):
-            cv = await _get_structured_cv_for_parsed_resume(pr)
-            if _cv_has_good_data(cv):
-                return cv
 
-    raise HTTPException(
-        status_code=422,
-        detail="No structured resume data found for this candidate"
-    )
+        name = None
+        for row in (by_pr_id.get(uid), by_resume_id.get(uid), candidates.get(uid)):
+            if row is not None and _full_name(row):
+                name = _full_name(row)
+                break
+
+        results[cid] = {
+            "structured_cv": cv,
+            "candidate_name": name or (cv.get("full_name") or "").strip() or None,
+        }
+
+    return results
 
 
-async def _get_name_by_id(session, candidate_id: str) -> Optional[str]:
+async def _resolve_structured_cv(session, candidate_id: str) -> Tuple[dict, Optional[str]]:
     try:
-        uid = UUID(candidate_id)
+        UUID(candidate_id)
     except ValueError:
-        return None
-
-    result = await session.execute(
-        select(ParsedResume).where(ParsedResume.id == uid)
-    )
-    parsed = result.scalar_one_or_none()
-    if parsed:
-        name = f"{parsed.first_name or ''} {parsed.last_name or ''}".strip()
-        if name:
-            return name
-
-    result2 = await session.execute(
-        select(ParsedResume).where(ParsedResume.resume_id == uid)
-    )
-    parsed2 = result2.scalar_one_or_none()
-    if parsed2:
-        name = f"{parsed2.first_name or ''} {parsed2.last_name or ''}".strip()
-        if name:
-            return name
-
-    candidate = await session.get(Candidate, uid)
-    if candidate:
-        name = f"{candidate.first_name or ''} {candidate.last_name or ''}".strip()
-        if name:
-            return name
+        raise HTTPException(status_code=400, detail="Invalid candidate ID")
 
-    return None
+    resolved = (await _resolve_structured_cvs(session, [candidate_id])).get(candidate_id)
+    if resolved is None:
+        raise HTTPException(
+            status_code=422,
+            detail="No structured resume data found for this candidate"
+        )
+    return resolved["structured_cv"], resolved["candidate_name"]
 
 
 async def _get_all_open_jobs(session, limit: int = 50):
@@ -340,73 +355,138 @@ async def _get_all_open_jobs(session, limit: int = 50):
     return list(result.scalars().all())
 
 
-async def _get_all_parsed_resumes(session, limit: int = 50):
+def _job_keyword_conditions(job) -> list:
+    conditions = []
+
+    if job.required_skills or job.preferred_skills:
+        skills_to_match = (job.required_skills or []) + (job.preferred_skills or [])
+        skills_lower = [s.lower().strip() for s in skills_to_match if s]
+        if skills_lower:
+            conditions.append(
+                func.lower(func.array_to_string(ParsedResume.skills, ',', '')).op('~*')(
+                    '|'.join(skills_lower)
+                )
+            )
+
+    if job.title:
+        title_words = [w.lower() for w in job.title.split() if len(w) >= 3]
+        for word in title_words:
+            conditions.append(
+                func.lower(ParsedResume.current_title).contains(word)
+            )
+
+    return conditions
+
+
+async def _find_parsed_resumes_for_job(session, job, limit: int = 20):
+    """Keyword prefilter on skills and title; no keyword hits means no candidates."""
+    conditions = _job_keyword_conditions(job)
+    if not conditions:
+        return []
+
     result = await session.execute(
-        select(ParsedResume).limit(limit)
+        select(ParsedResume)
+        .where(or_(*conditions))
+        .limit(limit)
     )
     return list(result.scalars().all())
 
 
-async def _find_parsed_resumes_for_job(session, job, limit: int = 20):
-    search_terms = []
-    if job.required_skills:
-        search_terms.extend([s.lower().strip() for s in job.required_skills])
-    if job.preferred_skills:
-        search_terms.extend([s.lower().strip() for s in job.preferred_skills])
-    if job.title:
-        search_terms.extend([w.lower() for w in job.title.split() if len(w) >= 3])
+async def _get_job_embedding(session, job) -> Optional[List[float]]:
+    """Stored job embedding, computed from the description and saved on first use."""
+    stored = (await session.execute(
+        select(Job.embedding).where(Job.id == job.id)
+    )).scalar_one_or_none()
+    if stored is not None:
+        return list(stored)
 
-    if search_terms:
-        conditions = []
+    try:
+        embedding = await ai_client.get_document_embedding(job.description)
+    except Exception as exc:
+        logger.warning("job_embedding_failed", job_id=str(job.id), error=str(exc))
+        return None
 
-        if job.required_skills or job.preferred_skills:
-            skills_to_match = (job.required_skills or []) + (job.preferred_skills or [])
-            skills_lower = [s.lower().strip() for s in skills_to_match if s]
-            if skills_lower:
-                conditions.append(
-                    func.lower(func.array_to_string(ParsedResume.skills, ',', '')).op('~*')(
-                        '|'.join(skills_lower)
-                    )
-                )
+    if not embedding:
+        return None
+
+    await session.execute(
+        update(Job).where(Job.id == job.id).values(embedding=embedding)
+    )
+    await session.commit()
+    return embedding
+
+
+def _skill_overlap(job_skills: set, pr) -> float:
+    if not job_skills:
+        return 0.0
+    skills = pr.skills
+    if not skills and isinstance(pr.json_data, dict):
+        skills = pr.json_data.get("skills")
+    resume_skills = {s.lower().strip() for s in (skills or []) if isinstance(s, str)}
+    return len(job_skills & resume_skills) / len(job_skills)
 
-        if job.title:
-            title_words = [w.lower() for w in job.title.split() if len(w) >= 3]
-            for word in title_words:
-                conditions.append(
-                    func.lower(ParsedResume.current_title).contains(word)
-                )
 
+async def _shortlist_parsed_resumes_for_job(
+    session,
+    job,
+    job_embedding: List[float],
+    limit: int,
+    keyword_filter: bool = False,
+):
+    """
+    Top ``limit`` parsed resumes for a job by vector similarity of their
+    resume embedding to the job's, blended with required/preferred skill
+    overlap. Only this shortlist is sent to the LLM.
+    """
+    distance = Resume.embedding.cosine_distance(job_embedding)
+    pool_size = limit * SHORTLIST_POOL_FACTOR
+    await set_ef_search(session, ef_search_for("balanced", pool_size))
+
+    query = (
+        select(ParsedResume, (1 - distance).label("similarity"))
+        .join(Resume, Resume.id == ParsedResume.resume_id)
+        .where(Resume.embedding.isnot(None))
+    )
+    if keyword_filter:
+        conditions = _job_keyword_conditions(job)
         if conditions:
-            query = (
-                select(ParsedResume)
-                .where(or_(*conditions))
-                .limit(limit)
-            )
-            result = await session.execute(query)
-            parsed_resumes = list(result.scalars().all())
+            query = query.where(or_(*conditions))
+
+    result = await session.execute(query.order_by(distance).limit(pool_size))
+    rows = result.all()
 
-            if parsed_resumes:
-                return parsed_resumes
+    job_skills = {
+        s.lower().strip()
+        for s in (job.required_skills or []) + (job.preferred_skills or [])
+        if s and s.strip()
+    }
+    skill_weight = SHORTLIST_SKILL_WEIGHT if job_skills else 0.0
 
-    fallback_query = select(ParsedResume).limit(limit)
-    fallback_result = await session.execute(fallback_query)
-    return list(fallback_result.scalars().all())
+    scored = [
+        ((1 - skill_weight) * float(similarity) + skill_weight * _skill_overlap(job_skills, pr), pr)
+        for pr, similarity in rows
+    ]
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [pr for _, pr in scored[:limit]]
 
 
 async def _process_single_candidate_match(
-    session,
+    resolved: Optional[dict],
     cid: str,
     job_description: str,
     job_id: str,
     job_title: Optional[str]
 ) -> MatchResultResponse:
     try:
-        structured_cv = await _get_structured_cv_by_id(session, cid)
-        candidate_name = await _get_name_by_id(session, cid)
-        if not candidate_name:
-            candidate_name = (structured_cv.get("full_name") or "").strip() or None
+        if resolved is None:
+            raise HTTPException(
+                status_code=422,
+                detail="No structured resume data found for this candidate"
+            )
+        structured_cv = resolved["structured_cv"]
+        candidate_name = resolved["candidate_name"]
 
-        ai_result = await ai_client.rag_match(
+        ai_result = await cached_rag_match(
             job_description=job_description,
             structured_cv=structured_cv,
         )
@@ -448,7 +528,7 @@ async def _process_single_job_match(
     candidate_name: Optional[str]
 ) -> MatchResultResponse:
     try:
-        ai_result = await ai_client.rag_match(
+        ai_result = await cached_rag_match(
             job_description=job.description,
             structured_cv=structured_cv,
         )
@@ -492,7 +572,7 @@ async def _process_single_resume_match(
         if not structured_cv or not _cv_has_good_data(structured_cv):
             return None
 
-        ai_result = await ai_client.rag_match(
+        ai_result = await cached_rag_match(
             job_description=job.description,
             structured_cv=structured_cv,
         )
@@ -537,13 +617,9 @@ async def match_candidate_to_job(request: MatchByIdRequest):
         async with async_session_maker() as session:
             job_description = await _get_job_description(session, request.job_id)
             job_title = await _get_job_title(session, request.job_id)
-            structured_cv = await _get_structured_cv_by_id(session, request.candidate_id)
-            candidate_name = await _get_name_by_id(session, request.candidate_id)
+            structured_cv, candidate_name = await _resolve_structured_cv(session, request.candidate_id)
 
-        if not candidate_name:
-            candidate_name = (structured_cv.get("full_name") or "").strip() or None
-
-        ai_result = await ai_client.rag_match(
+        ai_result = await cached_rag_match(
             job_description=job_description,
             structured_cv=structured_cv,
         )
@@ -570,7 +646,7 @@ async def match_candidate_to_job(request: MatchByIdRequest):
 @router.post("/raw")
 async def match_raw(request: RawMatchRequest):
     try:
-        result = await ai_client.rag_match(
+        result = await cached_rag_match(
             job_description=request.job_description,
             structured_cv=request.structured_cv,
         )
@@ -580,24 +656,68 @@ async def match_raw(request: RawMatchRequest):
         raise HTTPException(status_code=500, detail=f"Match failed: {str(e)}")
 
 
+def _match_event(event: str, payload: BaseModel) -> str:
+    return f"event: {event}\ndata: {payload.model_dump_json()}\n\n"
+
+
+def _match_event_stream(coros, summarize) -> StreamingResponse:
+    """
+    Server-Sent Events over the same per-item fan-out the JSON endpoints
+    gather: one ``result`` event per match as it finishes, then a ``summary``
+    event built by ``summarize`` from every result.
+    """
+    async def events() -> AsyncIterator[str]:
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        results = []
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                if result is None:
+                    continue
+                results.append(result)
+                yield _match_event("result", result)
+            yield _match_event("summary", summarize(results))
+        finally:
+            # Client went away mid-stream: don't keep paying for LLM calls
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _rank_results(results, min_score: Optional[int], top_k: Optional[int]) -> List[MatchResultResponse]:
+    ranked = sorted((r for r in results if r is not None), key=lambda r: r.match_score, reverse=True)
+    if min_score and min_score > 0:
+        ranked = [r for r in ranked if r.match_score >= min_score]
+    return ranked[:(top_k or 10)]
+
+
+async def _bulk_match_tasks(request: BulkMatchRequest) -> list:
+    async with async_session_maker() as session:
+        job_description = await _get_job_description(session, request.job_id)
+        job_title = await _get_job_title(session, request.job_id)
+        resolved = await _resolve_structured_cvs(session, request.candidate_ids)
+
+    return [
+        _process_single_candidate_match(
+            resolved=resolved.get(cid),
+            cid=cid,
+            job_description=job_description,
+            job_id=request.job_id,
+            job_title=job_title
+        )
+        for cid in request.candidate_ids
+    ]
+
+
 @router.post("/bulk", response_model=BulkMatchResponse)
 async def match_bulk(request: BulkMatchRequest):
     try:
-        async with async_session_maker() as session:
-            job_description = await _get_job_description(session, request.job_id)
-            job_title = await _get_job_title(session, request.job_id)
-
-        async def process_candidate_with_own_session(cid: str) -> MatchResultResponse:
-            async with async_session_maker() as session:
-                return await _process_single_candidate_match(
-                    session=session,
-                    cid=cid,
-                    job_description=job_description,
-                    job_id=request.job_id,
-                    job_title=job_title
-                )
-
-        tasks = [process_candidate_with_own_session(cid) for cid in request.candidate_ids]
+        tasks = await _bulk_match_tasks(request)
         results = await asyncio.gather(*tasks, return_exceptions=False)
 
         return BulkMatchResponse(
@@ -613,61 +733,77 @@ async def match_bulk(request: BulkMatchRequest):
         raise HTTPException(status_code=500, detail=f"Bulk match failed: {str(e)}")
 
 
-@router.post("/job-to-candidates", response_model=JobToCandidatesResponse)
-async def match_job_to_candidates(request: JobToCandidatesRequest):
+@router.post("/bulk/stream")
+async def stream_match_bulk(request: BulkMatchRequest):
     try:
-        async with async_session_maker() as session:
-            job = await session.get(Job, UUID(request.job_id))
-            if not job:
-                raise HTTPException(status_code=404, detail=f"Job {request.job_id} not found")
-            if not job.description:
-                raise HTTPException(status_code=422, detail="Job has no description")
-
-            if request.match_all_candidates:
-                parsed_resumes = await _get_all_parsed_resumes(
-                    session, limit=(request.top_k or 10) * 5
-                )
-            else:
-                parsed_resumes = await _find_parsed_resumes_for_job(
-                    session, job, limit=(request.top_k or 10) * 3
-                )
-
-            if not parsed_resumes:
-                return JobToCandidatesResponse(
-                    job_id=request.job_id,
-                    job_title=job.title,
-                    total_candidates_evaluated=0,
-                    total_matches=0,
-                    results=[],
-                )
+        tasks = await _bulk_match_tasks(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("bulk_match_failed", error=str(e))
+        raise HTTPException(status_code=500, detail=f"Bulk match failed: {str(e)}")
 
-        async def process_resume_with_own_session(pr):
-            async with async_session_maker() as session:
-                return await _process_single_resume_match(
-                    pr=pr,
-                    job=job,
-                    job_id=request.job_id
-                )
+    return _match_event_stream(
+        tasks,
+        lambda results: BulkMatchResponse(
+            job_id=request.job_id,
+            total=len(results),
+            results=sorted(results, key=lambda r: r.match_score, reverse=True),
+        ),
+    )
 
-        tasks = [process_resume_with_own_session(pr) for pr in parsed_resumes]
-        all_results = await asyncio.gather(*tasks, return_exceptions=False)
 
-        results = [r for r in all_results if r is not None]
-        results.sort(key=lambda r: r.match_score, reverse=True)
+async def _plan_job_to_candidates(request: JobToCandidatesRequest):
+    async with async_session_maker() as session:
+        job = await session.get(Job, UUID(request.job_id))
+        if not job:
+            raise HTTPException(status_code=404, detail=f"Job {request.job_id} not found")
+        if not job.description:
+            raise HTTPException(status_code=422, detail="Job has no description")
+
+        parsed_resumes = []
+        job_embedding = await _get_job_embedding(session, job)
+        if job_embedding:
+            parsed_resumes = await _shortlist_parsed_resumes_for_job(
+                session,
+                job,
+                job_embedding,
+                limit=(request.top_k or 10) * SHORTLIST_FACTOR,
+                keyword_filter=not request.match_all_candidates,
+            )
 
-        if request.min_score and request.min_score > 0:
-            results = [r for r in results if r.match_score >= request.min_score]
+        # Without a vector shortlist only keyword hits are worth an LLM call,
+        # never arbitrary rows
+        if not parsed_resumes:
+            parsed_resumes = await _find_parsed_resumes_for_job(
+                session, job, limit=(request.top_k or 10) * 3
+            )
 
-        results = results[:(request.top_k or 10)]
+    tasks = [
+        _process_single_resume_match(pr=pr, job=job, job_id=request.job_id)
+        for pr in parsed_resumes
+    ]
 
+    def summarize(results) -> JobToCandidatesResponse:
+        ranked = _rank_results(results, request.min_score, request.top_k)
         return JobToCandidatesResponse(
             job_id=request.job_id,
             job_title=job.title,
             total_candidates_evaluated=len(parsed_resumes),
-            total_matches=len(results),
-            results=results,
+            total_matches=len(ranked),
+            results=ranked,
         )
 
+    return tasks, summarize
+
+
+@router.post("/job-to-candidates", response_model=JobToCandidatesResponse)
+async def match_job_to_candidates(request: JobToCandidatesRequest):
+    try:
+        tasks, summarize = await _plan_job_to_candidates(request)
+        all_results = await asyncio.gather(*tasks, return_exceptions=False)
+        return summarize(all_results)
+
     except HTTPException:
         raise
     except Exception as e:
@@ -675,66 +811,85 @@ async def match_job_to_candidates(request: JobToCandidatesRequest):
         raise HTTPException(status_code=500, detail=f"Job-to-candidates matching failed: {str(e)}")
 
 
-@router.post("/candidate-to-jobs", response_model=CandidateToJobsResponse)
-async def match_candidate_to_multiple_jobs(request: CandidateToJobsRequest):
+@router.post("/job-to-candidates/stream")
+async def stream_job_to_candidates(request: JobToCandidatesRequest):
     try:
-        async with async_session_maker() as session:
-            structured_cv = await _get_structured_cv_by_id(session, request.candidate_id)
-            candidate_name = await _get_name_by_id(session, request.candidate_id)
-            if not candidate_name:
-                candidate_name = (structured_cv.get("full_name") or "").strip() or None
-
-            if request.job_ids and len(request.job_ids) > 0:
-                jobs = []
-                for jid in request.job_ids:
-                    try:
-                        job = await session.get(Job, UUID(jid))
-                        if job and job.description:
-                            jobs.append(job)
-                    except Exception:
-                        logger.warning("invalid_job_id_skipped", job_id=jid)
-                        continue
-            else:
-                jobs = await _get_all_open_jobs(session, limit=(request.top_k or 10) * 5)
-
-            if not jobs:
-                return CandidateToJobsResponse(
-                    candidate_id=request.candidate_id,
-                    candidate_name=candidate_name,
-                    total_jobs_evaluated=0,
-                    total_matches=0,
-                    results=[],
-                )
+        tasks, summarize = await _plan_job_to_candidates(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("job_to_candidates_failed", error=str(e), job_id=request.job_id)
+        raise HTTPException(status_code=500, detail=f"Job-to-candidates matching failed: {str(e)}")
+
+    return _match_event_stream(tasks, summarize)
 
-            tasks = [
-                _process_single_job_match(
-                    job=job,
-                    structured_cv=structured_cv,
-                    candidate_id=request.candidate_id,
-                    candidate_name=candidate_name
+
+async def _plan_candidate_to_jobs(request: CandidateToJobsRequest):
+    async with async_session_maker() as session:
+        structured_cv, candidate_name = await _resolve_structured_cv(session, request.candidate_id)
+
+        if request.job_ids and len(request.job_ids) > 0:
+            job_uids = []
+            for jid in request.job_ids:
+                try:
+                    job_uids.append(UUID(jid))
+                except ValueError:
+                    logger.warning("invalid_job_id_skipped", job_id=jid)
+            jobs_by_id = {}
+            if job_uids:
+                job_result = await session.execute(
+                    select(Job).where(Job.id.in_(job_uids), Job.description.isnot(None))
                 )
-                for job in jobs
-            ]
+                jobs_by_id = {job.id: job for job in job_result.scalars().all()}
+            jobs = [jobs_by_id[uid] for uid in dict.fromkeys(job_uids) if uid in jobs_by_id]
+        else:
+            jobs = await _get_all_open_jobs(session, limit=(request.top_k or 10) * 5)
+
+    tasks = [
+        _process_single_job_match(
+            job=job,
+            structured_cv=structured_cv,
+            candidate_id=request.candidate_id,
+            candidate_name=candidate_name
+        )
+        for job in jobs
+    ]
 
-            results = await asyncio.gather(*tasks, return_exceptions=False)
-            results = list(results)
-            results.sort(key=lambda r: r.match_score, reverse=True)
+    def summarize(results) -> CandidateToJobsResponse:
+        ranked = _rank_results(results, request.min_score, request.top_k)
+        return CandidateToJobsResponse(
+            candidate_id=request.candidate_id,
+            candidate_name=candidate_name,
+            total_jobs_evaluated=len(jobs),
+            total_matches=len(ranked),
+            results=ranked,
+        )
 
-            if request.min_score and request.min_score > 0:
-                results = [r for r in results if r.match_score >= request.min_score]
+    return tasks, summarize
 
-            results = results[:(request.top_k or 10)]
 
-            return CandidateToJobsResponse(
-                candidate_id=request.candidate_id,
-                candidate_name=candidate_name,
-                total_jobs_evaluated=len(jobs),
-                total_matches=len(results),
-                results=results,
-            )
+@router.post("/candidate-to-jobs", response_model=CandidateToJobsResponse)
+async def match_candidate_to_multiple_jobs(request: CandidateToJobsRequest):
+    try:
+        tasks, summarize = await _plan_candidate_to_jobs(request)
+        results = await asyncio.gather(*tasks, return_exceptions=False)
+        return summarize(results)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("candidate_to_jobs_failed", error=str(e), candidate_id=request.candidate_id)
+        raise HTTPException(status_code=500, detail=f"Candidate-to-jobs matching failed: {str(e)}")
+
 
+@router.post("/candidate-to-jobs/stream")
+async def stream_candidate_to_jobs(request: CandidateToJobsRequest):
+    try:
+        tasks, summarize = await _plan_candidate_to_jobs(request)
     except HTTPException:
         raise
     except Exception as e:
         logger.error("candidate_to_jobs_failed", error=str(e), candidate_id=request.candidate_id)
-        raise HTTPException(status_code=500, detail=f"Candidate-to-jobs matching failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Candidate-to-jobs matching failed: {str(e)}")
+
+    return _match_event_stream(tasks, summarize)
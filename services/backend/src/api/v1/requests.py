@@ -9,11 +9,15 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, s
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select, and_, or_, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
+from src.core.config import settings
 from src.db.session import get_db_session, async_session_maker
 from src.db.models import StaffingRequest, RequestCandidate, RequestAuditLog, Candidate, ParsedResume
+from src.db.vector_index import ef_search_for, set_ef_search
 from src.core.redis import get_redis_pool
 from src.services.ai_client import AIClient
+from src.services.match_cache import cached_rag_match
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -29,6 +33,8 @@ VALID_TRANSITIONS = {
 MATCH_CACHE_TTL = 86400
 MATCH_LOCK_TTL = 600
 CV_CACHE_TTL = 3600
+# LLM rerank scores this many vector-search candidates per requested match
+RERANK_POOL_FACTOR = 5
 
 
 class RequestCreate(BaseModel):
@@ -79,6 +85,7 @@ class AutoMatchRequest(BaseModel):
     min_score: int = Field(default=0, ge=0, le=100)
     auto_propose: bool = Field(default=False)
     force_refresh: bool = Field(default=False)
+    rerank: bool = Field(default=False)
 
 
 class SkillsComparison(BaseModel):
@@ -347,7 +354,7 @@ async def _match_single_candidate(
             "experience": structured_cv.get("experience", [])[:3],
             "education": structured_cv.get("education", [])[:2],
         }
-        ai_result = await ai_client.rag_match(
+        ai_result = await cached_rag_match(
             job_description=job_description,
             structured_cv=trimmed_cv,
         )
@@ -383,6 +390,26 @@ async def _match_single_candidate(
         return None
 
 
+def _auto_match_response(
+    request_id: str,
+    request_number: str,
+    request_title: str,
+    job_description: str,
+    evaluated: int,
+    matches: List[CandidateMatchResult],
+) -> AutoMatchResponse:
+    return AutoMatchResponse(
+        request_id=request_id,
+        request_number=request_number,
+        request_title=request_title,
+        job_description_preview=job_description[:200] + "..." if len(job_description) > 200 else job_description,
+        total_candidates_evaluated=evaluated,
+        total_matches=len(matches),
+        auto_proposed=False,
+        matches=matches,
+    )
+
+
 async def _run_matching_background(
     request_id: str,
     job_description: str,
@@ -392,88 +419,74 @@ async def _run_matching_background(
     min_score: int,
     candidate_ids: List[str],
 ):
+    """
+    LLM-score candidates for a request with at most ``ai_match_concurrency``
+    calls in flight. After every finished candidate the top-k so far is
+    written to ``hr_app:match_progress:{id}`` for the status endpoint.
+    """
     cache_key = f"hr_app:match_result:{request_id}"
     lock_key = f"hr_app:match_lock:{request_id}"
+    progress_key = f"hr_app:match_progress:{request_id}"
     try:
         redis = await get_redis_pool()
         await redis.setex(lock_key, MATCH_LOCK_TTL, "processing")
         async with async_session_maker() as session:
+            # resume_text is the structured-CV fallback and is read after the
+            # session closes, so it must be loaded up front
             result = await session.execute(
-                select(Candidate).where(Candidate.id.in_([UUID(cid) for cid in candidate_ids]))
+                select(Candidate)
+                .options(undefer(Candidate.resume_text))
+                .where(Candidate.id.in_([UUID(cid) for cid in candidate_ids]))
             )
             candidates = result.scalars().all()
-        final_matches = []
-        for candidate in candidates:
-            try:
-                structured_cv = await _get_structured_cv_cached(candidate)
-                trimmed_cv = {
-                    "full_name": structured_cv.get("full_name") or f"{candidate.first_name} {candidate.last_name}".strip(),
-                    "current_title": structured_cv.get("current_title") or candidate.current_title or "",
-                    "current_company": structured_cv.get("current_company") or candidate.current_company or "",
-                    "location": structured_cv.get("location") or candidate.location or "",
-                    "skills": (structured_cv.get("skills") or candidate.skills or [])[:20],
-                    "summary": (structured_cv.get("summary") or "")[:500],
-                    "experience": structured_cv.get("experience", [])[:3],
-                    "education": structured_cv.get("education", [])[:2],
-                }
-                ai_result = await ai_client.rag_match(
-                    job_description=job_description,
-                    structured_cv=trimmed_cv,
-                )
-                skills_comparison = _build_skills_comparison(
-                    job_description=job_description,
-                    candidate_skills=candidate.skills or [],
-                    structured_data=structured_cv,
-                )
-                clean_email = candidate.email
-                if clean_email and ("@placeholder.com" in clean_email or "@noemail.vaspp.com" in clean_email or clean_email.startswith("unknown_")):
-                    clean_email = None
-                final_matches.append(
-                    CandidateMatchResult(
-                        candidate_id=str(candidate.id),
-                        first_name=candidate.first_name,
-                        last_name=candidate.last_name,
-                        email=clean_email,
-                        current_title=candidate.current_title,
-                        current_company=candidate.current_company,
-                        location=candidate.location,
-                        years_of_experience=candidate.years_of_experience,
-                        match_score=ai_result.get("match_score", 0),
-                        reasoning=ai_result.get("reasoning", ""),
-                        strengths=ai_result.get("strengths", []),
-                        gaps=ai_result.get("gaps", []),
-                        recommendations=ai_result.get("recommendations", []),
-                        skills_comparison=skills_comparison,
-                        hourly_rate=float(candidate.hourly_rate) if candidate.hourly_rate else None,
-                        availability=candidate.availability,
+
+        semaphore = asyncio.Semaphore(settings.ai_match_concurrency)
+
+        async def _bounded_match(candidate: Candidate) -> Optional[CandidateMatchResult]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        _match_single_candidate(candidate, job_description, request_id),
+                        timeout=settings.ai_match_timeout,
                     )
-                )
-            except Exception as e:
-                logger.error("single_candidate_match_failed", candidate_id=str(candidate.id), error=str(e))
-                continue
-        final_matches.sort(key=lambda x: x.match_score, reverse=True)
-        if min_score > 0:
-            final_matches = [m for m in final_matches if m.match_score >= min_score]
-        final_matches = final_matches[:top_k]
-        response = AutoMatchResponse(
-            request_id=request_id,
-            request_number=request_number,
-            request_title=request_title,
-            job_description_preview=job_description[:200] + "..." if len(job_description) > 200 else job_description,
-            total_candidates_evaluated=len(candidates),
-            total_matches=len(final_matches),
-            auto_proposed=False,
-            matches=final_matches,
+                except asyncio.TimeoutError:
+                    logger.warning("candidate_match_timeout", request_id=request_id, candidate_id=str(candidate.id))
+                    return None
+
+        final_matches: List[CandidateMatchResult] = []
+        completed = 0
+        for next_match in asyncio.as_completed([_bounded_match(c) for c in candidates]):
+            match = await next_match
+            completed += 1
+            if match is not None and match.match_score >= min_score:
+                final_matches.append(match)
+                final_matches.sort(key=lambda x: x.match_score, reverse=True)
+                del final_matches[top_k:]
+            partial = _auto_match_response(
+                request_id, request_number, request_title, job_description, completed, final_matches,
+            )
+            try:
+                await redis.setex(progress_key, MATCH_LOCK_TTL, json.dumps({
+                    "completed": completed,
+                    "total": len(candidates),
+                    "result": partial.model_dump(),
+                }, default=str))
+                await redis.expire(lock_key, MATCH_LOCK_TTL)
+            except Exception:
+                pass
+
+        response = _auto_match_response(
+            request_id, request_number, request_title, job_description, len(candidates), final_matches,
         )
         redis = await get_redis_pool()
         await redis.setex(cache_key, MATCH_CACHE_TTL, json.dumps(response.model_dump(), default=str))
-        await redis.delete(lock_key)
+        await redis.delete(lock_key, progress_key)
         logger.info("matching_complete", request_id=request_id, total_matches=len(final_matches))
     except Exception as e:
         logger.error("background_matching_failed", request_id=request_id, error=str(e))
         try:
             redis = await get_redis_pool()
-            await redis.delete(lock_key)
+            await redis.delete(lock_key, progress_key)
             error_data = {"error": str(e), "request_id": request_id}
             await redis.setex(f"hr_app:match_error:{request_id}", 300, json.dumps(error_data))
         except Exception:
@@ -868,6 +881,8 @@ async def auto_match_candidates(
         raise HTTPException(status_code=404, detail="Request not found")
     if not req.job_description or not req.job_description.strip():
         raise HTTPException(status_code=422, detail="Request has no job description to match against")
+    if data.rerank and data.auto_propose:
+        raise HTTPException(status_code=422, detail="auto_propose is not supported with rerank")
     cache_key = f"hr_app:match_result:{request_id}"
     if not data.force_refresh:
         try:
@@ -896,6 +911,8 @@ async def auto_match_candidates(
         logger.error("ai_match_empty_embedding", request_id=str(request_id))
         raise HTTPException(status_code=502, detail="Matching service returned no embedding")
     vec_literal = "[" + ",".join(f"{float(x):.8f}" for x in jd_embedding) + "]"
+    pool_size = data.top_k * RERANK_POOL_FACTOR if data.rerank else data.top_k
+    await set_ef_search(session, ef_search_for("balanced", pool_size))
     sim_rows = (await session.execute(
         text(
             """
@@ -906,7 +923,7 @@ async def auto_match_candidates(
             LIMIT :top_k
             """
         ),
-        {"jd_vec": vec_literal, "top_k": data.top_k},
+        {"jd_vec": vec_literal, "top_k": pool_size},
     )).fetchall()
     total_evaluated = (await session.execute(
         text(
@@ -915,6 +932,36 @@ async def auto_match_candidates(
         )
     )).scalar() or 0
     similarity_by_id = {str(row.id): float(row.similarity) for row in sim_rows}
+    if data.rerank and similarity_by_id:
+        lock_key = f"hr_app:match_lock:{request_id}"
+        try:
+            redis = await get_redis_pool()
+            if not await redis.set(lock_key, "processing", ex=MATCH_LOCK_TTL, nx=True):
+                return MatchStatusResponse(
+                    status="processing",
+                    request_id=str(request_id),
+                    message="Matching in progress...",
+                    result=None,
+                )
+            await redis.delete(cache_key, f"hr_app:match_error:{request_id}")
+        except Exception:
+            pass
+        background_tasks.add_task(
+            _run_matching_background,
+            str(request_id),
+            req.job_description,
+            req.request_number,
+            req.request_title,
+            data.top_k,
+            data.min_score,
+            list(similarity_by_id.keys()),
+        )
+        return MatchStatusResponse(
+            status="processing",
+            request_id=str(request_id),
+            message=f"Scoring {len(similarity_by_id)} candidates",
+            result=None,
+        )
     candidate_ids = [UUID(cid) for cid in similarity_by_id.keys()]
     candidates: List[Candidate] = []
     if candidate_ids:
@@ -1030,6 +1077,15 @@ async def get_match_status(request_id: UUID):
             )
         is_processing = await redis.get(lock_key)
         if is_processing:
+            progress = await redis.get(f"hr_app:match_progress:{request_id}")
+            if progress:
+                progress_data = json.loads(progress)
+                return MatchStatusResponse(
+                    status="processing",
+                    request_id=str(request_id),
+                    message=f"Matched {progress_data['completed']}/{progress_data['total']} candidates",
+                    result=AutoMatchResponse(**progress_data["result"]),
+                )
             return MatchStatusResponse(
                 status="processing",
                 request_id=str(request_id),
@@ -1,21 +1,29 @@
+import asyncio
 import hashlib
 import json
-from typing import List, Optional
+import re
+from typing import List, Optional, Tuple
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
-from sqlalchemy import select, or_, func, and_
+from sqlalchemy import select, or_, func, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.redis import get_redis_pool
-from src.db.session import get_db_session
-from src.db.models import Candidate, ParsedResume
+from src.db.session import async_session_maker, get_db_session
+from src.db.models import Candidate, ParsedResume, Resume
+from src.db.search import SEARCH_CONFIG, SEARCH_RANK_WEIGHTS, search_vector
+from src.db.vector_index import ef_search_for, set_ef_search
+from src.services.ai_client import AIClient
 
 logger = structlog.get_logger()
 router = APIRouter()
+ai_client = AIClient()
 
 SEARCH_CACHE_TTL = 120
+RRF_K = 60
+HYBRID_CANDIDATE_MULTIPLIER = 3
 
 
 class SearchRequest(BaseModel):
@@ -27,6 +35,8 @@ class SearchRequest(BaseModel):
     availability: Optional[str] = Field(default=None)
     location: Optional[str] = Field(default=None)
     skills: Optional[List[str]] = Field(default=None)
+    mode: str = Field(default="lexical", pattern="^(lexical|hybrid)$")
+    recall: str = Field(default="balanced", pattern="^(speed|balanced|recall)$")
 
 
 class CandidateResult(BaseModel):
@@ -67,63 +77,335 @@ def _parse_skills(raw) -> List[str]:
     return []
 
 
-def _score_text_match(row_data: dict, query_words: List[str]) -> float:
-    if not query_words:
-        return 0.0
-
-    skills_list = [s.lower() for s in (row_data.get("skills") or [])]
-    skills_text = " ".join(skills_list)
-    title_text = (row_data.get("current_title") or "").lower()
-    company_text = (row_data.get("current_company") or "").lower()
-    summary_text = (row_data.get("summary") or "").lower()
-    location_text = (row_data.get("location") or "").lower()
-    first_name = (row_data.get("first_name") or "").lower()
-    last_name = (row_data.get("last_name") or "").lower()
-    name_text = f"{first_name} {last_name}".strip()
-
-    total_score = 0.0
-    matched_words = 0
-
-    for word in query_words:
-        w = word.lower()
-        word_score = 0.0
-
-        if any(s == w for s in skills_list):
-            word_score += 0.50
-        elif any(s.startswith(w) or w in s for s in skills_list):
-            word_score += 0.35
-        elif w in skills_text:
-            word_score += 0.20
-
-        if w in title_text:
-            word_score += 0.25
-
-        if w in name_text:
-            word_score += 0.20
-
-        if w in company_text:
-            word_score += 0.10
-
-        if w in location_text:
-            word_score += 0.10
-
-        if w in summary_text and word_score == 0:
-            word_score += 0.05
-
-        if word_score > 0:
-            matched_words += 1
-
-        total_score += min(word_score, 1.0)
-
-    base_score = total_score / len(query_words)
-    coverage = matched_words / len(query_words)
-    final = base_score * (0.5 + 0.5 * coverage)
-    return round(min(final, 1.0), 4)
+def _query_terms(text: str) -> List[str]:
+    # tsquery syntax characters are dropped; only word characters survive
+    return [t for t in re.findall(r"\w+", (text or "").lower()) if t]
+
+
+def _prefix_tsquery(terms: List[str], operator: str = " | ", weight: str = "") -> str:
+    # Prefix-match real words ("develop" -> "developer"); one- and two-letter
+    # terms like "c" or "r" must match exactly or they hit half the table.
+    parts = []
+    for t in terms:
+        flags = ("*" if len(t) >= 3 else "") + weight
+        parts.append(f"{t}:{flags}" if flags else t)
+    return operator.join(parts)
+
+
+def _to_tsquery(query: str):
+    return func.to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query)
+
+
+def _skills_tsquery(skills: List[str]) -> Optional[str]:
+    """AND of skill phrases, each restricted to the skills (A) section of the vector."""
+    phrases = []
+    for skill in skills:
+        terms = _query_terms(skill)
+        if terms:
+            phrases.append(f"({_prefix_tsquery(terms, ' <-> ', 'A')})")
+    return " & ".join(phrases) or None
+
+
+def _name_expr(model):
+    # Must match the expression of the idx_<table>_name_trgm indexes exactly,
+    # so the separators are inlined rather than bound as parameters.
+    empty = literal_column("''")
+    return func.coalesce(model.first_name, empty).op("||")(literal_column("' '")).op("||")(
+        func.coalesce(model.last_name, empty)
+    )
+
+
+def _text_match(model, ts_query, query_text: str):
+    """
+    (predicate, score) for a free-text query against ``model``.
+
+    The predicate is served by the search_vector GIN index plus the name
+    trigram index; the score is ts_rank over the weighted vector, topped up
+    by fuzzy name similarity so misspelt names still rank.
+    """
+    name = _name_expr(model)
+    name_similarity = func.word_similarity(query_text, name)
+    fuzzy_name = name.op("%>")(query_text)
+
+    if ts_query is None:
+        return fuzzy_name, func.least(name_similarity, 1.0)
+
+    rank = func.ts_rank(
+        literal_column(f"'{SEARCH_RANK_WEIGHTS}'::float4[]"),
+        search_vector(model),
+        ts_query,
+        32,
+    )
+    predicate = or_(search_vector(model).op("@@")(ts_query), fuzzy_name)
+    return predicate, func.least(rank + 0.25 * name_similarity, 1.0)
+
+
+def _candidate_filters(request: SearchRequest, skills_query) -> list:
+    filters = []
+    if request.experience_level:
+        filters.append(Candidate.experience_level == request.experience_level)
+    if request.availability:
+        filters.append(Candidate.availability == request.availability)
+    if request.location:
+        filters.append(Candidate.location.ilike(f"%{request.location}%"))
+    if skills_query is not None:
+        filters.append(search_vector(Candidate).op("@@")(skills_query))
+    if request.status:
+        filters.append(Candidate.status == request.status)
+    return filters
+
+
+def _parsed_filters(request: SearchRequest, skills_query) -> list:
+    filters = []
+    if request.location:
+        filters.append(ParsedResume.location.ilike(f"%{request.location}%"))
+    if skills_query is not None:
+        filters.append(search_vector(ParsedResume).op("@@")(skills_query))
+    if request.status:
+        filters.append(ParsedResume.candidate_status == request.status)
+    return filters
+
+
+_CANDIDATE_COLUMNS = (
+    Candidate.id,
+    Candidate.first_name,
+    Candidate.last_name,
+    Candidate.email,
+    Candidate.phone,
+    Candidate.current_title,
+    Candidate.current_company,
+    Candidate.location,
+    Candidate.skills,
+    Candidate.years_of_experience,
+    Candidate.experience_level,
+    Candidate.availability,
+    Candidate.hourly_rate,
+    Candidate.status,
+)
+
+_PARSED_COLUMNS = (
+    ParsedResume.id,
+    ParsedResume.resume_id,
+    ParsedResume.first_name,
+    ParsedResume.last_name,
+    ParsedResume.email,
+    ParsedResume.phone,
+    ParsedResume.current_title,
+    ParsedResume.current_company,
+    ParsedResume.location,
+    ParsedResume.skills,
+    ParsedResume.years_of_experience,
+    ParsedResume.summary,
+    ParsedResume.json_data,
+    ParsedResume.candidate_status,
+)
+
+
+def _candidate_result(c) -> dict:
+    cid = str(c["id"])
+    return {
+        "id": cid,
+        "resume_id": None,
+        "first_name": c["first_name"],
+        "last_name": c["last_name"],
+        "email": c["email"],
+        "phone": c["phone"],
+        "skills": _parse_skills(c["skills"]),
+        "current_title": c["current_title"],
+        "current_company": c["current_company"],
+        "location": c["location"],
+        "years_of_experience": c["years_of_experience"],
+        "summary": None,
+        "experience_level": c["experience_level"],
+        "availability": c["availability"],
+        "hourly_rate": float(c["hourly_rate"]) if c["hourly_rate"] else None,
+        "candidate_status": c["status"],
+        "score": round(float(c["score"] or 0.0), 4),
+    }
+
+
+def _parsed_result(pr) -> dict:
+    jd = pr["json_data"] or {}
+    return {
+        "id": str(pr["id"]),
+        "resume_id": str(pr["resume_id"]) if pr["resume_id"] else None,
+        "first_name": pr["first_name"],
+        "last_name": pr["last_name"],
+        "email": pr["email"] or jd.get("email"),
+        "phone": pr["phone"] or jd.get("phone"),
+        "skills": _parse_skills(pr["skills"]) or _parse_skills(jd.get("skills")),
+        "current_title": pr["current_title"] or jd.get("current_title"),
+        "current_company": pr["current_company"] or jd.get("current_company"),
+        "location": pr["location"] or jd.get("location"),
+        "years_of_experience": pr["years_of_experience"],
+        "summary": pr["summary"] or jd.get("summary") or "",
+        "experience_level": None,
+        "availability": None,
+        "hourly_rate": None,
+        "candidate_status": pr["candidate_status"],
+        "score": round(float(pr["score"] or 0.0), 4),
+    }
+
+
+def _identity(result: dict) -> Tuple[str, Optional[Tuple[str, str]]]:
+    email = (result.get("email") or "").strip().lower()
+    first = (result.get("first_name") or "").strip().lower()
+    last = (result.get("last_name") or "").strip().lower()
+    return email, (first, last) if first and last else None
+
+
+def _drop_duplicate_resumes(results: List[dict]) -> List[dict]:
+    """
+    Keep every candidate, plus the parsed resumes (``resume_id`` set) that are
+    not already a candidate or an earlier resume, matched on email or full name.
+    """
+    seen_emails = set()
+    seen_names = set()
+    for result in results:
+        if result["resume_id"] is None:
+            email, name = _identity(result)
+            if email:
+                seen_emails.add(email)
+            if name:
+                seen_names.add(name)
+
+    kept = []
+    for result in results:
+        if result["resume_id"] is not None:
+            email, name = _identity(result)
+            if (email and email in seen_emails) or (name and name in seen_names):
+                continue
+            if email:
+                seen_emails.add(email)
+            if name:
+                seen_names.add(name)
+        kept.append(result)
+
+    return kept
+
+
+def _merge_results(candidates, parsed_resumes) -> List[dict]:
+    results = [_candidate_result(c) for c in candidates]
+    results += [_parsed_result(pr) for pr in parsed_resumes]
+    results = _drop_duplicate_resumes(results)
+    results.sort(key=lambda x: x["score"], reverse=True)
+    return results
+
+
+def _skills_query(request: SearchRequest):
+    skills_tsquery = _skills_tsquery(request.skills or [])
+    return _to_tsquery(skills_tsquery) if skills_tsquery else None
+
+
+async def _lexical_search(session: AsyncSession, request: SearchRequest, limit: int) -> List[dict]:
+    terms = _query_terms(request.query_text)
+    query_text = request.query_text.strip().lower()
+    ts_query = _to_tsquery(_prefix_tsquery(terms)) if terms else None
+    skills_query = _skills_query(request)
+
+    candidate_match, candidate_score = _text_match(Candidate, ts_query, query_text)
+    candidate_query = (
+        select(*_CANDIDATE_COLUMNS, candidate_score.label("score"))
+        .where(candidate_match, *_candidate_filters(request, skills_query))
+        .order_by(candidate_score.desc())
+        .limit(limit)
+    )
+
+    # Parsed resumes that duplicate a candidate are dropped when merging, so
+    # over-fetch to still fill the limit.
+    parsed_match, parsed_score = _text_match(ParsedResume, ts_query, query_text)
+    parsed_query = (
+        select(*_PARSED_COLUMNS, parsed_score.label("score"))
+        .where(parsed_match, *_parsed_filters(request, skills_query))
+        .order_by(parsed_score.desc())
+        .limit(limit * 2)
+    )
+
+    candidates = (await session.execute(candidate_query)).mappings().all()
+    parsed_resumes = (await session.execute(parsed_query)).mappings().all()
+    return _merge_results(candidates, parsed_resumes)
+
+
+async def _semantic_search(session: AsyncSession, request: SearchRequest, limit: int) -> List[dict]:
+    query_embedding = await ai_client.get_embeddings(request.query_text)
+    if not query_embedding:
+        return []
+
+    skills_query = _skills_query(request)
+    await set_ef_search(session, ef_search_for(request.recall, limit * 2))
+
+    candidate_distance = Candidate.embedding.cosine_distance(query_embedding)
+    candidate_query = (
+        select(*_CANDIDATE_COLUMNS, (1 - candidate_distance).label("score"))
+        .where(Candidate.embedding.is_not(None), *_candidate_filters(request, skills_query))
+        .order_by(candidate_distance)
+        .limit(limit)
+    )
+
+    # Parsed resumes carry no vector of their own; rank them by their resume's.
+    resume_distance = Resume.embedding.cosine_distance(query_embedding)
+    parsed_query = (
+        select(*_PARSED_COLUMNS, (1 - resume_distance).label("score"))
+        .join(Resume, Resume.id == ParsedResume.resume_id)
+        .where(Resume.embedding.is_not(None), *_parsed_filters(request, skills_query))
+        .order_by(resume_distance)
+        .limit(limit * 2)
+    )
+
+    candidates = (await session.execute(candidate_query)).mappings().all()
+    parsed_resumes = (await session.execute(parsed_query)).mappings().all()
+    return _merge_results(candidates, parsed_resumes)
+
+
+async def _run_arm(search, request: SearchRequest, limit: int) -> List[dict]:
+    # AsyncSession is not safe for concurrent use, so each arm gets its own.
+    async with async_session_maker() as session:
+        return await search(session, request, limit)
+
+
+def _reciprocal_rank_fusion(rankings: List[List[dict]], k: int = RRF_K) -> List[dict]:
+    """
+    Fuse ranked lists by summing 1 / (k + rank) per result. Scores are scaled
+    by the best attainable sum so a result ranked first everywhere scores 1.0.
+    """
+    fused = {}
+    totals = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused.setdefault(item["id"], item)
+            totals[item["id"]] = totals.get(item["id"], 0.0) + 1.0 / (k + rank)
+
+    best = len(rankings) / (k + 1)
+    results = []
+    for result_id, item in fused.items():
+        results.append({**item, "score": round(totals[result_id] / best, 4)})
+
+    results.sort(key=lambda x: x["score"], reverse=True)
+    return _drop_duplicate_resumes(results)
+
+
+async def _hybrid_search(request: SearchRequest) -> List[dict]:
+    # Each arm over-fetches so results just outside one arm's top_k can
+    # still be lifted by the other.
+    limit = request.top_k * HYBRID_CANDIDATE_MULTIPLIER
+    lexical, semantic = await asyncio.gather(
+        _run_arm(_lexical_search, request, limit),
+        _run_arm(_semantic_search, request, limit),
+        return_exceptions=True,
+    )
+
+    if isinstance(lexical, Exception):
+        raise lexical
+    if isinstance(semantic, Exception):
+        logger.warning("hybrid_search_semantic_failed", error=str(semantic))
+        return lexical
+
+    return _reciprocal_rank_fusion([lexical, semantic])
 
 
 def _build_cache_key(request: SearchRequest) -> str:
-    raw = f"{request.query_text}|{request.top_k}|{request.min_score}|{request.status}|{request.experience_level}|{request.availability}|{request.location}|{sorted(request.skills or [])}"
-    return f"hr_app:search:v4:{hashlib.md5(raw.encode()).hexdigest()}"
+    raw = f"{request.query_text}|{request.top_k}|{request.min_score}|{request.status}|{request.experience_level}|{request.availability}|{request.location}|{sorted(request.skills or [])}|{request.mode}|{request.recall}"
+    return f"hr_app:search:v6:{hashlib.md5(raw.encode()).hexdigest()}"
 
 
 @router.post("", response_model=SearchResponse)
@@ -142,247 +424,12 @@ async def search_candidates(
         except Exception:
             pass
 
-        query_words = [
-            w.strip().lower()
-            for w in request.query_text.split()
-            if len(w.strip()) >= 1
-        ]
-        if not query_words:
-            query_words = [request.query_text.strip().lower()]
-
-        results_map = {}
+        if request.mode == "hybrid":
+            ranked = await _hybrid_search(request)
+        else:
+            ranked = await _lexical_search(session, request, request.top_k)
 
-        candidate_filters = []
-        parsed_filters = []
-
-        if request.experience_level:
-            candidate_filters.append(
-                Candidate.experience_level == request.experience_level
-            )
-
-        if request.availability:
-            candidate_filters.append(
-                Candidate.availability == request.availability
-            )
-
-        if request.location:
-            candidate_filters.append(
-                Candidate.location.ilike(f"%{request.location}%")
-            )
-            parsed_filters.append(
-                ParsedResume.location.ilike(f"%{request.location}%")
-            )
-
-        if request.skills:
-            for skill in request.skills:
-                candidate_filters.append(
-                    func.lower(
-                        func.array_to_string(Candidate.skills, " ")
-                    ).contains(skill.lower())
-                )
-                parsed_filters.append(
-                    func.lower(
-                        func.array_to_string(ParsedResume.skills, " ")
-                    ).contains(skill.lower())
-                )
-
-        text_conditions_candidate = []
-        text_conditions_parsed = []
-
-        for word in query_words:
-            w = f"%{word}%"
-            text_conditions_candidate.extend([
-                Candidate.first_name.ilike(w),
-                Candidate.last_name.ilike(w),
-                func.concat(
-                    Candidate.first_name, " ", Candidate.last_name
-                ).ilike(w),
-                Candidate.current_title.ilike(w),
-                Candidate.current_company.ilike(w),
-                Candidate.location.ilike(w),
-                Candidate.email.ilike(w),
-                func.lower(
-                    func.array_to_string(Candidate.skills, " ")
-                ).contains(word.lower()),
-            ])
-
-            text_conditions_parsed.extend([
-                ParsedResume.first_name.ilike(w),
-                ParsedResume.last_name.ilike(w),
-                func.concat(
-                    ParsedResume.first_name, " ", ParsedResume.last_name
-                ).ilike(w),
-                ParsedResume.current_title.ilike(w),
-                ParsedResume.current_company.ilike(w),
-                ParsedResume.location.ilike(w),
-                ParsedResume.summary.ilike(w),
-                func.lower(
-                    func.array_to_string(ParsedResume.skills, " ")
-                ).contains(word.lower()),
-            ])
-
-        candidate_query = select(
-            Candidate.id,
-            Candidate.first_name,
-            Candidate.last_name,
-            Candidate.email,
-            Candidate.phone,
-            Candidate.current_title,
-            Candidate.current_company,
-            Candidate.location,
-            Candidate.skills,
-            Candidate.years_of_experience,
-            Candidate.experience_level,
-            Candidate.availability,
-            Candidate.hourly_rate,
-            Candidate.status,
-        ).where(or_(*text_conditions_candidate))
-
-        if candidate_filters:
-            candidate_query = candidate_query.where(and_(*candidate_filters))
-        if request.status:
-            candidate_query = candidate_query.where(
-                Candidate.status == request.status
-            )
-        candidate_query = candidate_query.limit(request.top_k * 5)
-
-        parsed_query = select(
-            ParsedResume.id,
-            ParsedResume.resume_id,
-            ParsedResume.first_name,
-            ParsedResume.last_name,
-            ParsedResume.email,
-            ParsedResume.phone,
-            ParsedResume.current_title,
-            ParsedResume.current_company,
-            ParsedResume.location,
-            ParsedResume.skills,
-            ParsedResume.years_of_experience,
-            ParsedResume.summary,
-            ParsedResume.json_data,
-            ParsedResume.candidate_status,
-        ).where(or_(*text_conditions_parsed))
-
-        if parsed_filters:
-            parsed_query = parsed_query.where(and_(*parsed_filters))
-        if request.status:
-            parsed_query = parsed_query.where(
-                ParsedResume.candidate_status == request.status
-            )
-        parsed_query = parsed_query.limit(request.top_k * 5)
-
-        candidate_result = await session.execute(candidate_query)
-        candidates = candidate_result.mappings().all()
-
-        parsed_result = await session.execute(parsed_query)
-        parsed_resumes = parsed_result.mappings().all()
-
-        for c in candidates:
-            cid = str(c["id"])
-            skills = _parse_skills(c["skills"])
-            row_data = {
-                "first_name": c["first_name"],
-                "last_name": c["last_name"],
-                "current_title": c["current_title"],
-                "current_company": c["current_company"],
-                "location": c["location"],
-                "skills": skills,
-                "summary": "",
-            }
-            score = _score_text_match(row_data, query_words)
-            results_map[cid] = {
-                "id": cid,
-                "resume_id": None,
-                "first_name": c["first_name"],
-                "last_name": c["last_name"],
-                "email": c["email"],
-                "phone": c["phone"],
-                "skills": skills,
-                "current_title": c["current_title"],
-                "current_company": c["current_company"],
-                "location": c["location"],
-                "years_of_experience": c["years_of_experience"],
-                "summary": None,
-                "experience_level": c["experience_level"],
-                "availability": c["availability"],
-                "hourly_rate": float(c["hourly_rate"]) if c["hourly_rate"] else None,
-                "candidate_status": c["status"],
-                "score": score,
-            }
-
-        seen_emails = {
-            (v.get("email") or "").strip().lower()
-            for v in results_map.values()
-            if v.get("email")
-        }
-        seen_names = {
-            (
-                (v.get("first_name") or "").strip().lower(),
-                (v.get("last_name") or "").strip().lower(),
-            )
-            for v in results_map.values()
-            if v.get("first_name") and v.get("last_name")
-        }
-
-        for pr in parsed_resumes:
-            pr_email = (pr["email"] or "").strip().lower()
-            pr_first = (pr["first_name"] or "").strip().lower()
-            pr_last = (pr["last_name"] or "").strip().lower()
-
-            if pr_email and pr_email in seen_emails:
-                continue
-            if pr_first and pr_last and (pr_first, pr_last) in seen_names:
-                continue
-
-            pid = str(pr["id"])
-            jd = pr["json_data"] or {}
-            skills = _parse_skills(pr["skills"]) or _parse_skills(
-                jd.get("skills")
-            )
-            title = pr["current_title"] or jd.get("current_title")
-            company = pr["current_company"] or jd.get("current_company")
-            location = pr["location"] or jd.get("location")
-            summary = pr["summary"] or jd.get("summary") or ""
-
-            row_data = {
-                "first_name": pr["first_name"],
-                "last_name": pr["last_name"],
-                "current_title": title,
-                "current_company": company,
-                "location": location,
-                "skills": skills,
-                "summary": summary,
-            }
-            score = _score_text_match(row_data, query_words)
-
-            results_map[pid] = {
-                "id": pid,
-                "resume_id": str(pr["resume_id"]) if pr["resume_id"] else None,
-                "first_name": pr["first_name"],
-                "last_name": pr["last_name"],
-                "email": pr["email"] or jd.get("email"),
-                "phone": pr["phone"] or jd.get("phone"),
-                "skills": skills,
-                "current_title": title,
-                "current_company": company,
-                "location": location,
-                "years_of_experience": pr["years_of_experience"],
-                "summary": summary,
-                "experience_level": None,
-                "availability": None,
-                "hourly_rate": None,
-                "candidate_status": pr["candidate_status"],
-                "score": score,
-            }
-
-            if pr_email:
-                seen_emails.add(pr_email)
-            if pr_first and pr_last:
-                seen_names.add((pr_first, pr_last))
-
-        results = [CandidateResult(**data) for data in results_map.values()]
-        results.sort(key=lambda x: x.score, reverse=True)
-        results = results[:request.top_k]
+        results = [CandidateResult(**data) for data in ranked[:request.top_k]]
 
         response = SearchResponse(
             query=request.query_text,
@@ -406,4 +453,4 @@ async def search_candidates(
         raise
     except Exception as e:
         logger.error("search_failed", error=str(e))
-        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
@@ -18,6 +18,8 @@ class Settings(BaseSettings):
     ai_service_timeout: int = Field(default=30)
     ai_service_max_retries: int = Field(default=3)
     ai_service_circuit_breaker_threshold: int = Field(default=5)
+    ai_match_concurrency: int = Field(default=5)
+    ai_match_timeout: int = Field(default=90)
 
     database_host: str = Field(default="localhost")
     database_port: int = Field(default=5432)
@@ -5,11 +5,20 @@ from uuid import UUID
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import ARRAY, Boolean, Date, DateTime, Enum, ForeignKey, Integer, Numeric, String, Text, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship, deferred
+from sqlalchemy.orm import Mapped, mapped_column, relationship, deferred, validates
 from src.db.base import BaseModel
+from src.db.search import attach_search_schema
 from src.models.enums import CandidateStatus, UserRole
 
 
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Digits-only form of a phone number, used for duplicate detection."""
+    if not phone:
+        return None
+    digits = "".join(c for c in phone if c.isdigit())
+    return digits or None
+
+
 class User(BaseModel):
     __tablename__ = "users"
 
@@ -31,6 +40,7 @@ class Candidate(BaseModel):
     last_name: Mapped[str] = mapped_column(String(100), nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     phone: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    phone_normalized: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     current_title: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     current_company: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     years_of_experience: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -81,8 +91,21 @@ class Candidate(BaseModel):
         Index("idx_candidates_current_title", "current_title"),
         Index("idx_candidates_name", "first_name", "last_name"),
         Index("idx_candidates_skills_gin", "skills", postgresql_using="gin"),
+        Index("idx_candidates_phone_normalized", "phone_normalized"),
+        Index(
+            "idx_candidates_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
     )
 
+    @validates("phone")
+    def _sync_phone_normalized(self, key, value):
+        self.phone_normalized = normalize_phone(value)
+        return value
+
     def to_dict(self):
         d = super().to_dict()
         email = d.get("email")
@@ -154,6 +177,13 @@ class Job(BaseModel):
         Index("idx_jobs_employment_type", "employment_type"),
         Index("idx_jobs_created_at", "created_at"),
         Index("idx_jobs_status_type", "status", "employment_type"),
+        Index(
+            "idx_jobs_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
     )
 
 
@@ -172,6 +202,20 @@ class MatchResult(BaseModel):
     )
 
 
+class MatchVerdict(BaseModel):
+    """LLM match verdict keyed by content hashes; see src/services/match_cache.py."""
+
+    __tablename__ = "match_verdicts"
+
+    jd_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    cv_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    result: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("jd_hash", "cv_hash", name="uq_match_verdicts_content_hash"),
+    )
+
+
 class Resume(BaseModel):
     __tablename__ = "resumes"
 
@@ -185,6 +229,13 @@ class Resume(BaseModel):
     __table_args__ = (
         Index("idx_resumes_created_at", "created_at"),
         Index("idx_resumes_file_hash", "file_hash"),
+        Index(
+            "idx_resumes_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
     )
 
 
@@ -305,4 +356,10 @@ class PasswordResetToken(BaseModel):
     __table_args__ = (
         Index("idx_password_reset_tokens_token", "token"),
         Index("idx_password_reset_tokens_email", "email"),
-    )
\ No newline at end of file
+    )
+
+
+# search_vector is unmapped and trigger-maintained (see src/db/search.py), so
+# create_all builds it through after_create hooks on both tables
+attach_search_schema(Candidate.__table__)
+attach_search_schema(ParsedResume.__table__)
@@ -0,0 +1,118 @@
+"""
+Full-text search schema for candidates and parsed resumes.
+
+Both tables carry a weighted ``search_vector`` kept current by a BEFORE
+INSERT/UPDATE trigger, so raw-SQL writes are covered as well as ORM ones:
+
+    A  skills
+    B  first/last name, current title
+    C  current company, location
+    D  summary, email
+
+Names and locations additionally get pg_trgm GIN indexes for fuzzy name
+lookups and ``ILIKE '%...%'`` location filters.
+
+The column is deliberately not mapped on the ORM models: it is only ever
+written by the trigger, and a mapped (even deferred) column would be loaded
+by ``BaseModel.to_dict()``. Queries reference it through ``search_vector()``.
+Because ``create_all`` cannot see it, ``attach_search_schema()`` hooks the
+same statements onto each table's ``after_create`` event.
+"""
+
+from sqlalchemy import DDL, Table, event, literal_column, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+SEARCH_CONFIG = "simple"
+
+# ts_rank weights in {D, C, B, A} order
+SEARCH_RANK_WEIGHTS = "{0.1, 0.2, 0.5, 1.0}"
+
+_CANDIDATES_TRIGGER_FN = """
+CREATE OR REPLACE FUNCTION candidates_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(array_to_string(NEW.skills, ' '), '')), 'A') ||
+        setweight(to_tsvector('simple', concat_ws(' ', NEW.first_name, NEW.last_name, NEW.current_title)), 'B') ||
+        setweight(to_tsvector('simple', concat_ws(' ', NEW.current_company, NEW.location)), 'C') ||
+        setweight(to_tsvector('simple', concat_ws(' ', NEW.json_data->>'summary', NEW.email)), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+_PARSED_RESUMES_TRIGGER_FN = """
+CREATE OR REPLACE FUNCTION parsed_resumes_search_vector_update() RETURNS trigger AS $$
+DECLARE
+    skills_text TEXT;
+BEGIN
+    skills_text := array_to_string(NEW.skills, ' ');
+    IF coalesce(skills_text, '') = '' AND jsonb_typeof(NEW.json_data->'skills') = 'array' THEN
+        SELECT string_agg(value, ' ') INTO skills_text
+        FROM jsonb_array_elements_text(NEW.json_data->'skills');
+    END IF;
+
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(skills_text, '')), 'A') ||
+        setweight(to_tsvector('simple', concat_ws(' ',
+            NEW.first_name, NEW.last_name,
+            coalesce(NEW.current_title, NEW.json_data->>'current_title'))), 'B') ||
+        setweight(to_tsvector('simple', concat_ws(' ',
+            coalesce(NEW.current_company, NEW.json_data->>'current_company'),
+            coalesce(NEW.location, NEW.json_data->>'location'))), 'C') ||
+        setweight(to_tsvector('simple', concat_ws(' ',
+            coalesce(NEW.summary, NEW.json_data->>'summary'), NEW.email)), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def search_vector(model):
+    """The trigger-maintained ``search_vector`` column of ``model``'s table."""
+    return literal_column(f"{model.__tablename__}.search_vector", type_=TSVECTOR)
+
+
+def _table_statements(table: str, trigger_fn: str) -> list:
+    name_expr = "(coalesce(first_name, '') || ' ' || coalesce(last_name, ''))"
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector TSVECTOR",
+        trigger_fn,
+        f"DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table}",
+        f"CREATE TRIGGER {table}_search_vector_trigger "
+        f"BEFORE INSERT OR UPDATE ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()",
+        # Backfill: a no-op update fires the trigger for rows written before it existed
+        f"UPDATE {table} SET first_name = first_name WHERE search_vector IS NULL",
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_search_vector "
+        f"ON {table} USING gin (search_vector)",
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_name_trgm "
+        f"ON {table} USING gin ({name_expr} gin_trgm_ops)",
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_location_trgm "
+        f"ON {table} USING gin (location gin_trgm_ops)",
+    ]
+
+
+_TRIGGER_FNS = {
+    "candidates": _CANDIDATES_TRIGGER_FN,
+    "parsed_resumes": _PARSED_RESUMES_TRIGGER_FN,
+}
+
+SEARCH_SCHEMA_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    *(statement for table, fn in _TRIGGER_FNS.items() for statement in _table_statements(table, fn)),
+]
+
+
+def attach_search_schema(table: Table) -> None:
+    """Build ``table``'s search column, trigger and indexes whenever metadata creates it."""
+    statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm", *_table_statements(table.name, _TRIGGER_FNS[table.name])]
+    for statement in statements:
+        # DDL applies %-formatting to the statement text
+        event.listen(table, "after_create", DDL(statement.replace("%", "%%")))
+
+
+async def ensure_search_schema(conn: AsyncConnection) -> None:
+    """Create or refresh the search columns, triggers and indexes. Idempotent."""
+    for statement in SEARCH_SCHEMA_STATEMENTS:
+        await conn.execute(text(statement))
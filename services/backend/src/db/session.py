@@ -7,6 +7,9 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 import structlog
 
+from src.db.search import ensure_search_schema
+from src.db.vector_index import ensure_vector_indexes
+
 logger = structlog.get_logger()
 
 
@@ -80,6 +83,17 @@ async def warm_db_pool() -> None:
     logger.info("database_pool_warmed")
 
 
+_vector_index_task: asyncio.Task | None = None
+
+
+async def _build_vector_indexes() -> None:
+    try:
+        await ensure_vector_indexes(engine)
+        logger.info("vector_indexes_ready")
+    except Exception as e:
+        logger.warning("vector_index_init_failed", error=str(e))
+
+
 async def init_db_connection() -> None:
     try:
         async with engine.begin() as conn:
@@ -97,8 +111,48 @@ async def init_db_connection() -> None:
                 await conn.execute(
                     text("ALTER TABLE candidates ADD COLUMN IF NOT EXISTS contract_end_date VARCHAR(20)")
                 )
+                await conn.execute(
+                    text("ALTER TABLE candidates ADD COLUMN IF NOT EXISTS phone_normalized VARCHAR(50)")
+                )
+                await conn.execute(
+                    text(
+                        "UPDATE candidates "
+                        "SET phone_normalized = NULLIF(regexp_replace(phone, '[^0-9]', '', 'g'), '') "
+                        "WHERE phone IS NOT NULL AND phone_normalized IS NULL"
+                    )
+                )
+                await conn.execute(
+                    text(
+                        "CREATE INDEX IF NOT EXISTS idx_candidates_phone_normalized "
+                        "ON candidates (phone_normalized)"
+                    )
+                )
             except Exception:
                 pass
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    text(
+                        "CREATE TABLE IF NOT EXISTS match_verdicts ("
+                        "id UUID PRIMARY KEY, "
+                        "jd_hash VARCHAR(64) NOT NULL, "
+                        "cv_hash VARCHAR(64) NOT NULL, "
+                        "result JSONB NOT NULL, "
+                        "created_at TIMESTAMPTZ NOT NULL DEFAULT now(), "
+                        "updated_at TIMESTAMPTZ NOT NULL DEFAULT now(), "
+                        "CONSTRAINT uq_match_verdicts_content_hash UNIQUE (jd_hash, cv_hash))"
+                    )
+                )
+        except Exception as e:
+            logger.warning("match_verdicts_init_failed", error=str(e))
+        try:
+            async with engine.begin() as conn:
+                await ensure_search_schema(conn)
+        except Exception as e:
+            logger.warning("search_schema_init_failed", error=str(e))
+        # A first build over populated tables can take minutes; serve meanwhile
+        global _vector_index_task
+        _vector_index_task = asyncio.create_task(_build_vector_indexes())
         await warm_db_pool()
         logger.info("database_connection_initialized")
     except Exception as e:
@@ -107,6 +161,8 @@ async def init_db_connection() -> None:
 
 
 async def close_db_connection() -> None:
+    if _vector_index_task is not None and not _vector_index_task.done():
+        _vector_index_task.cancel()
     await engine.dispose()
     logger.info("database_connection_closed")
 
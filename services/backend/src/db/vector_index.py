@@ -0,0 +1,78 @@
+"""
+HNSW indexes for the pgvector ``embedding`` columns.
+
+Every semantic query orders by cosine distance (``<=>``), so the indexes are
+built with ``vector_cosine_ops``. Recall is traded against latency per query
+through ``hnsw.ef_search``: the size of the candidate list the index walks.
+It must be at least the LIMIT of the query, or HNSW returns fewer rows.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+# Client-side timeout (seconds) for one index build; the pool's asyncpg
+# command_timeout of 30s would cancel a build over a populated table
+HNSW_BUILD_TIMEOUT = 6 * 60 * 60
+
+VECTOR_TABLES = ("candidates", "jobs", "resumes")
+
+# hnsw.ef_search per recall profile; pgvector's own default is 40
+EF_SEARCH_PROFILES = {
+    "speed": 40,
+    "balanced": 100,
+    "recall": 200,
+}
+MAX_EF_SEARCH = 1000
+
+def _index_name(table: str) -> str:
+    return f"idx_{table}_embedding_hnsw"
+
+
+VECTOR_INDEX_STATEMENTS = [
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {_index_name(table)} "
+    f"ON {table} USING hnsw (embedding vector_cosine_ops) "
+    f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})"
+    for table in VECTOR_TABLES
+]
+
+
+async def ensure_vector_indexes(engine: AsyncEngine) -> None:
+    """
+    Build any missing HNSW index without blocking writes. Idempotent.
+
+    CONCURRENTLY cannot run inside a transaction, so the statements go
+    through the asyncpg connection directly on an autocommit connection,
+    with statement_timeout lifted and an explicit client-side timeout.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        await driver.execute("SET statement_timeout = 0")
+        try:
+            for table, statement in zip(VECTOR_TABLES, VECTOR_INDEX_STATEMENTS):
+                name = _index_name(table)
+                # An interrupted concurrent build leaves an INVALID index
+                # that IF NOT EXISTS would otherwise keep forever
+                invalid = await driver.fetchval(
+                    "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)", name
+                )
+                if invalid:
+                    await driver.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}", timeout=HNSW_BUILD_TIMEOUT)
+                await driver.execute(statement, timeout=HNSW_BUILD_TIMEOUT)
+        finally:
+            await driver.execute("RESET statement_timeout")
+
+
+def ef_search_for(recall: str, limit: int) -> int:
+    ef_search = max(EF_SEARCH_PROFILES.get(recall, EF_SEARCH_PROFILES["balanced"]), limit)
+    return min(ef_search, MAX_EF_SEARCH)
+
+
+async def set_ef_search(session: AsyncSession, ef_search: int) -> None:
+    """Scope ``hnsw.ef_search`` to the session's current transaction."""
+    # SET does not accept bind parameters; the value is always an int here.
+    await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
@@ -5,6 +5,8 @@ from src.core.config import settings
 
 logger = structlog.get_logger()
 
+MATCH_PARSE_FAILED = "Failed to parse match result"
+
 _client: Optional[httpx.AsyncClient] = None
 
 
@@ -69,6 +71,11 @@ class AIClient:
         res = await self._request("POST", "/embeddings/embed", {"text": text})
         return res.get("embedding", [])
 
+    async def get_document_embedding(self, text: str) -> List[float]:
+        """Chunked + pooled embedding for long texts such as full resumes."""
+        res = await self._request("POST", "/embeddings/embed-document", {"text": text})
+        return res.get("embedding", [])
+
     async def get_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
         res = await self._request("POST", "/embeddings/embed-batch", {"texts": texts})
         return res.get("embeddings", [])
@@ -131,7 +138,7 @@ class AIClient:
 
         return {
             "match_score": 0,
-            "reasoning": "Failed to parse match result",
+            "reasoning": MATCH_PARSE_FAILED,
             "strengths": [],
             "gaps": [],
             "recommendations": []
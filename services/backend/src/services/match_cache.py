@@ -0,0 +1,120 @@
+# src/services/match_cache.py
+"""
+Memoized LLM match verdicts keyed by content hash.
+
+A verdict depends only on the job description and the structured CV sent to
+the model, so it is keyed on a hash of each. Redis serves hot lookups and
+``match_verdicts`` rows are the durable fallback, so re-running a match where
+neither side changed costs no LLM call. Only real verdicts are stored: a call
+that errored or returned no numeric score is retried on the next request.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.core.cache import cache
+from src.db.models import MatchVerdict
+from src.db.session import async_session_maker
+from src.services.ai_client import MATCH_PARSE_FAILED, AIClient
+
+logger = structlog.get_logger()
+ai_client = AIClient()
+
+# Bump when the match prompt or model changes so old verdicts are not reused.
+MATCH_CACHE_VERSION = "v1"
+
+# Reasoning the ai-ml service returns in place of a verdict when the LLM call fails
+_MATCH_ERROR_PREFIX = "Match processing error"
+
+
+def content_hash(value: Any) -> str:
+    """Stable SHA-256 of a string or JSON-serializable value."""
+    if isinstance(value, str):
+        payload = value.strip()
+    else:
+        payload = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{MATCH_CACHE_VERSION}:{payload}".encode("utf-8")).hexdigest()
+
+
+def is_cacheable_verdict(verdict: Dict[str, Any]) -> bool:
+    """A verdict carries a real numeric score and no error reasoning."""
+    score = verdict.get("match_score")
+    if isinstance(score, bool) or not isinstance(score, (int, float)):
+        return False
+    reasoning = verdict.get("reasoning") or ""
+    return reasoning != MATCH_PARSE_FAILED and not reasoning.startswith(_MATCH_ERROR_PREFIX)
+
+
+async def _load_persisted(jd_hash: str, cv_hash: str) -> Optional[Dict[str, Any]]:
+    try:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(MatchVerdict.result).where(
+                    MatchVerdict.jd_hash == jd_hash,
+                    MatchVerdict.cv_hash == cv_hash,
+                )
+            )
+            return result.scalar_one_or_none()
+    except Exception as e:
+        logger.warning("match_cache_db_read_failed", error=str(e))
+        return None
+
+
+async def _persist(jd_hash: str, cv_hash: str, verdict: Dict[str, Any]) -> None:
+    try:
+        async with async_session_maker() as session:
+            stmt = insert(MatchVerdict).values(id=uuid4(), jd_hash=jd_hash, cv_hash=cv_hash, result=verdict)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_match_verdicts_content_hash",
+                set_={"result": stmt.excluded.result, "updated_at": func.now()},
+            )
+            await session.execute(stmt)
+            await session.commit()
+    except Exception as e:
+        logger.warning("match_cache_db_write_failed", error=str(e))
+
+
+async def get_cached_match(job_description: str, structured_cv: dict) -> Optional[Dict[str, Any]]:
+    jd_hash = content_hash(job_description)
+    cv_hash = content_hash(structured_cv)
+
+    verdict = await cache.get_match(cv_hash, jd_hash)
+    if verdict is not None and is_cacheable_verdict(verdict):
+        return verdict
+
+    verdict = await _load_persisted(jd_hash, cv_hash)
+    if verdict is not None:
+        await cache.set_match(cv_hash, jd_hash, verdict)
+    return verdict
+
+
+async def cached_rag_match(job_description: str, structured_cv: dict) -> Dict[str, Any]:
+    """``ai_client.rag_match`` behind the content-hash cache."""
+    jd_hash = content_hash(job_description)
+    cv_hash = content_hash(structured_cv)
+
+    verdict = await get_cached_match(job_description, structured_cv)
+    if verdict is not None:
+        logger.debug("match_cache_hit", jd_hash=jd_hash[:12], cv_hash=cv_hash[:12])
+        return dict(verdict)
+
+    verdict = await ai_client.rag_match(
+        job_description=job_description,
+        structured_cv=structured_cv,
+    )
+
+    # Never memoize a failed call, or one transient provider error would pin
+    # the candidate's score until the job description or CV changes
+    if not is_cacheable_verdict(verdict):
+        logger.info("match_cache_skip_failed_verdict", jd_hash=jd_hash[:12], cv_hash=cv_hash[:12])
+        return verdict
+
+    await cache.set_match(cv_hash, jd_hash, verdict)
+    await _persist(jd_hash, cv_hash, verdict)
+    return verdict
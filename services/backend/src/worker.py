@@ -8,10 +8,10 @@ from typing import Any, Dict, List, Optional
 from uuid import UUID
 import structlog
 from arq.connections import RedisSettings
-from sqlalchemy import select, func
+from sqlalchemy import and_, case, func, or_, select
 from src.core.config import settings
 from src.db.session import async_session_maker
-from src.db.models import Resume, ParsedResume, Candidate, MatchResult, CandidateCV, StaffingRequest, RequestAuditLog
+from src.db.models import Resume, ParsedResume, Candidate, MatchResult, CandidateCV, StaffingRequest, RequestAuditLog, normalize_phone
 from src.services.ai_client import AIClient
 
 def _clean_value(value):
@@ -99,12 +99,6 @@ def calculate_years_experience(experience_list: List[Dict[str, Any]]) -> Optiona
     return years
 
 
-def _normalize_phone(phone: str) -> str:
-    if not phone:
-        return ""
-    return "".join(c for c in phone if c.isdigit())
-
-
 def _extract_name_from_raw_text(raw_text: str) -> tuple:
     if not raw_text:
         return "Unknown", ""
@@ -138,49 +132,42 @@ def _resolve_name(structured_data: dict, raw_text: str) -> tuple:
 
 async def _find_existing_candidate(session, structured_data: dict, first_name: str, last_name: str, generated_email: str) -> Optional[Candidate]:
     candidate_email = structured_data.get("email")
-    candidate_phone = _normalize_phone(structured_data.get("phone") or "")
+    candidate_phone = normalize_phone(structured_data.get("phone"))
+    has_name = bool(first_name and first_name != "Unknown" and last_name)
 
+    # Every dedup signal goes into one indexed query; the CASE ranks a row by
+    # its strongest match so precedence is email > phone > name > generated email.
+    rules = []
     if candidate_email:
-        result = await session.execute(
-            select(Candidate).where(Candidate.email == candidate_email)
-        )
-        found = result.scalar_one_or_none()
-        if found:
-            logger.info("candidate_matched_by_email", email=candidate_email)
-            return found
-
+        rules.append(("email", Candidate.email == candidate_email))
     if candidate_phone and len(candidate_phone) >= 7:
-        all_candidates = await session.execute(
-            select(Candidate).where(Candidate.phone.is_not(None))
-        )
-        for candidate in all_candidates.scalars().all():
-            if candidate.phone:
-                normalized = _normalize_phone(candidate.phone)
-                if normalized and normalized == candidate_phone:
-                    logger.info("candidate_matched_by_phone", phone=candidate_phone)
-                    return candidate
-
-    if first_name and first_name != "Unknown" and last_name:
-        result = await session.execute(
-            select(Candidate).where(
-                Candidate.first_name == first_name,
-                Candidate.last_name == last_name
-            )
-        )
-        found = result.scalar_one_or_none()
-        if found:
-            logger.info("candidate_matched_by_name", first_name=first_name, last_name=last_name)
-            return found
+        rules.append(("phone", Candidate.phone_normalized == candidate_phone))
+    if has_name:
+        rules.append(("name", and_(Candidate.first_name == first_name, Candidate.last_name == last_name)))
+    rules.append(("generated_email", Candidate.email == generated_email))
 
+    rank = case(*[(clause, i) for i, (_, clause) in enumerate(rules)])
     result = await session.execute(
-        select(Candidate).where(Candidate.email == generated_email)
+        select(Candidate, rank.label("match_rank"))
+        .where(or_(*[clause for _, clause in rules]))
+        .order_by(rank)
+        .limit(1)
     )
-    found = result.scalar_one_or_none()
-    if found:
-        logger.info("candidate_matched_by_generated_email", email=generated_email)
-        return found
+    row = result.first()
+    if row is None:
+        return None
 
-    return None
+    found, match_rank = row
+    matched_by = rules[match_rank][0]
+    if matched_by == "email":
+        logger.info("candidate_matched_by_email", email=candidate_email)
+    elif matched_by == "phone":
+        logger.info("candidate_matched_by_phone", phone=candidate_phone)
+    elif matched_by == "name":
+        logger.info("candidate_matched_by_name", first_name=first_name, last_name=last_name)
+    else:
+        logger.info("candidate_matched_by_generated_email", email=generated_email)
+    return found
 
 
 async def _link_cv_to_candidate(session, candidate: Candidate, resume: Resume) -> None:
@@ -402,7 +389,7 @@ async def _process_single_resume(item: dict) -> dict:
             if not raw_text:
                 return {"resume_id": resume_id, "success": False, "error": "No text extracted"}
 
-            embedding = await ai_client.get_embeddings(raw_text)
+            embedding = await ai_client.get_document_embedding(raw_text)
 
             return {
                 "resume_id": resume_id,
@@ -0,0 +1,33 @@
+from src.services.ai_client import MATCH_PARSE_FAILED
+from src.services.match_cache import content_hash, is_cacheable_verdict
+
+
+def test_content_hash_ignores_key_order() -> None:
+    """Test structured CVs hash the same regardless of key order."""
+    first = {"full_name": "Jane Doe", "skills": ["python", "sql"], "location": "Berlin"}
+    second = {"location": "Berlin", "skills": ["python", "sql"], "full_name": "Jane Doe"}
+    assert content_hash(first) == content_hash(second)
+
+
+def test_content_hash_changes_with_content() -> None:
+    """Test any change to the CV or job description yields a new key."""
+    cv = {"full_name": "Jane Doe", "skills": ["python"]}
+    assert content_hash(cv) != content_hash({**cv, "skills": ["python", "go"]})
+    assert content_hash("Senior Python engineer") != content_hash("Junior Python engineer")
+
+
+def test_content_hash_strips_job_description_whitespace() -> None:
+    """Test surrounding whitespace in a job description does not bust the cache."""
+    assert content_hash("  Backend engineer\n") == content_hash("Backend engineer")
+    assert len(content_hash("Backend engineer")) == 64
+
+
+def test_failed_verdicts_are_not_cacheable() -> None:
+    """Test provider errors, parse failures and empty verdicts are never memoized."""
+    assert is_cacheable_verdict({"match_score": 72, "reasoning": "Strong Python background"})
+    assert is_cacheable_verdict({"match_score": 0.0, "reasoning": "No overlap"})
+    assert not is_cacheable_verdict({})
+    assert not is_cacheable_verdict({"match_score": "85"})
+    assert not is_cacheable_verdict({"match_score": True})
+    assert not is_cacheable_verdict({"match_score": 0, "reasoning": "Match processing error: 429 RESOURCE_EXHAUSTED"})
+    assert not is_cacheable_verdict({"match_score": 0, "reasoning": MATCH_PARSE_FAILED})
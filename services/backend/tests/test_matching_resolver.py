@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from src.api.v1.matching import _cv_from_candidate
+
+_PARSED_FIELDS = (
+    "first_name", "last_name", "email", "phone", "current_title", "current_company",
+    "skills", "location", "years_of_experience", "summary", "education", "experience",
+    "projects", "certifications", "linkedin_url", "github", "portfolio", "json_data",
+)
+
+
+def _parsed_resume(**fields) -> SimpleNamespace:
+    return SimpleNamespace(**{name: fields.get(name) for name in _PARSED_FIELDS})
+
+
+def _candidate(**fields) -> SimpleNamespace:
+    base = {
+        "first_name": "Jane", "last_name": "Doe", "email": "jane@example.com",
+        "phone": None, "current_title": "Engineer", "current_company": None,
+        "skills": ["python"], "location": None, "years_of_experience": None,
+        "resume_text": None, "linkedin_url": None, "json_data": None,
+    }
+    base.update(fields)
+    return SimpleNamespace(**base)
+
+
+def test_linked_resume_precedence_is_email_then_full_name_then_first_name() -> None:
+    """Test the bulk resolver keeps the per-candidate lookup order."""
+    first_only = _parsed_resume(first_name="jane", last_name="Smith", summary="first name")
+    full_name = _parsed_resume(first_name="Jane", last_name="doe", summary="full name")
+    by_email = _parsed_resume(email="jane@example.com", summary="email")
+
+    assert _cv_from_candidate(_candidate(), [first_only, full_name])["summary"] == "full name"
+    assert _cv_from_candidate(_candidate(), [first_only, full_name, by_email])["summary"] == "email"
+    assert _cv_from_candidate(_candidate(last_name="Roe"), [first_only])["summary"] == "first name"
+
+
+def test_falls_back_to_candidate_columns_without_linked_resume() -> None:
+    """Test a candidate with no usable parsed resume still yields a CV."""
+    cv = _cv_from_candidate(_candidate(), [_parsed_resume(first_name="Jane")])
+
+    assert cv["full_name"] == "Jane Doe"
+    assert cv["skills"] == ["python"]
@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+from src.api.v1.matching import BulkMatchResponse, MatchResultResponse, _match_event_stream, _rank_results
+
+
+def _result(candidate_id: str, score: int) -> MatchResultResponse:
+    return MatchResultResponse(job_id="job", candidate_id=candidate_id, match_score=score)
+
+
+async def _delayed(result, delay: float):
+    await asyncio.sleep(delay)
+    return result
+
+
+def _collect(response) -> list:
+    async def drain():
+        return [chunk async for chunk in response.body_iterator]
+
+    events = []
+    for chunk in asyncio.run(drain()):
+        event, data = chunk.strip().split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_stream_emits_results_as_they_complete_then_summary() -> None:
+    """Test the fastest match is streamed first and the summary is ranked."""
+    response = _match_event_stream(
+        [
+            _delayed(_result("slow", 90), 0.05),
+            _delayed(None, 0.0),
+            _delayed(_result("fast", 40), 0.0),
+        ],
+        lambda results: BulkMatchResponse(
+            job_id="job",
+            total=len(results),
+            results=_rank_results(results, min_score=0, top_k=10),
+        ),
+    )
+
+    assert response.media_type == "text/event-stream"
+    events = _collect(response)
+
+    assert [name for name, _ in events] == ["result", "result", "summary"]
+    assert [data["candidate_id"] for _, data in events[:2]] == ["fast", "slow"]
+    assert [r["candidate_id"] for r in events[-1][1]["results"]] == ["slow", "fast"]
+
+
+def test_rank_results_applies_min_score_and_top_k() -> None:
+    """Test ranking drops missing and low-scoring matches before truncating."""
+    results = [_result("a", 10), None, _result("b", 80), _result("c", 60)]
+
+    ranked = _rank_results(results, min_score=50, top_k=1)
+
+    assert [r.candidate_id for r in ranked] == ["b"]
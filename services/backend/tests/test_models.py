@@ -413,4 +413,31 @@ class TestVectorEmbedding:
             updated_at=now,
         )
 
-        assert candidate.embedding is None
\ No newline at end of file
+        assert candidate.embedding is None
+
+class TestCandidatePhoneNormalization:
+    """Tests for the persisted phone_normalized dedup key."""
+
+    def test_phone_normalized_set_on_create(self) -> None:
+        """Test phone_normalized is derived when the candidate is built."""
+        from src.db.models import Candidate
+
+        candidate = Candidate(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone="+1 (555) 123-4567",
+        )
+
+        assert candidate.phone_normalized == "15551234567"
+
+    def test_phone_normalized_follows_updates(self) -> None:
+        """Test phone_normalized tracks later phone changes."""
+        from src.db.models import Candidate
+
+        candidate = Candidate(first_name="John", last_name="Doe", email="john@example.com")
+        candidate.phone = "555-000-1111"
+        assert candidate.phone_normalized == "5550001111"
+
+        candidate.phone = None
+        assert candidate.phone_normalized is None
@@ -0,0 +1,59 @@
+from src.api.v1.search import (
+    _prefix_tsquery,
+    _query_terms,
+    _reciprocal_rank_fusion,
+    _skills_tsquery,
+)
+
+
+def test_query_terms_strip_tsquery_syntax() -> None:
+    """Test operators and punctuation never reach to_tsquery."""
+    assert _query_terms("Senior  Python-dev & (C++) | !ops") == [
+        "senior", "python", "dev", "c", "ops",
+    ]
+
+
+def test_prefix_tsquery_skips_prefix_for_short_terms() -> None:
+    """Test short terms match exactly while words prefix-match."""
+    assert _prefix_tsquery(["c", "python", "ml"]) == "c | python:* | ml"
+
+
+def test_skills_tsquery_is_phrase_per_skill_in_skills_section() -> None:
+    """Test each skill becomes an A-weighted phrase and skills are ANDed."""
+    assert _skills_tsquery(["Machine Learning", "Go", "++"]) == (
+        "(machine:*A <-> learning:*A) & (go:A)"
+    )
+    assert _skills_tsquery([]) is None
+
+
+def _result(result_id: str, resume_id=None, email=None, first="", last="") -> dict:
+    return {
+        "id": result_id,
+        "resume_id": resume_id,
+        "email": email,
+        "first_name": first,
+        "last_name": last,
+        "score": 0.0,
+    }
+
+
+def test_reciprocal_rank_fusion_rewards_agreement() -> None:
+    """Test results ranked by both arms beat results ranked by one."""
+    lexical = [_result("a"), _result("b"), _result("c")]
+    semantic = [_result("b"), _result("d"), _result("a")]
+
+    fused = _reciprocal_rank_fusion([lexical, semantic])
+
+    assert [r["id"] for r in fused][:2] == ["b", "a"]
+    assert {r["id"] for r in fused} == {"a", "b", "c", "d"}
+    assert all(0.0 < r["score"] <= 1.0 for r in fused)
+
+
+def test_fusion_drops_resume_duplicating_candidate_from_other_arm() -> None:
+    """Test a parsed resume is dropped when the other arm found its candidate."""
+    lexical = [_result("r1", resume_id="res-1", email="jane@example.com")]
+    semantic = [_result("c1", email="Jane@Example.com")]
+
+    fused = _reciprocal_rank_fusion([lexical, semantic])
+
+    assert [r["id"] for r in fused] == ["c1"]